@@ -0,0 +1,93 @@
+"""
+JSON出力のベンチマーク
+
+クラスごとのJSONを、エンコーダーのバックエンド（標準ライブラリのjson / orjson）と
+形式（インデント2 / コンパクト）の組み合わせでエンコードし、合計バイト数と
+1クラスあたりのエンコード時間を比較する。
+
+対象は出力済みのJSON（config.yamlのoutput.json_dir）全件。なければキャッシュ済みの
+クラスページ（なければテスト用のサンプルページ）をパースして変換したものを使う。
+
+実行方法:
+    python benchmarks/bench_json.py [--limit 0] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+
+from src.json_generator import JsonEncoder, JsonGenerator
+from src.parser import ClassInfo, create_parser
+
+from bench_parser import load_pages
+
+
+def load_records(config_path: Path, limit: int) -> list:
+    """ベンチマーク対象のクラスのJSON（generate_class_jsonの形式の辞書）を読み込む"""
+    records = []
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        json_dir = Path(config['output']['json_dir'])
+        for path in sorted(json_dir.glob('*.json')) if json_dir.exists() else []:
+            with open(path, 'r', encoding='utf-8') as f:
+                records.append(json.load(f))
+            if limit and len(records) >= limit:
+                break
+
+    if not records:
+        print("No JSON output found, converting cached class pages")
+        parser = create_parser('html.parser')
+        generator = JsonGenerator()
+        info = ClassInfo("Bench", "Bench.Bench", "class_bench.html", "class", "Bench")
+        for content, encoding in load_pages(config_path, limit or 500):
+            records.append(generator.generate_class_json(parser.parse_class_content(content, info, encoding)))
+    return records
+
+
+def bench(encoder: JsonEncoder, records: list, repeat: int) -> tuple:
+    """(合計バイト数, 1クラスあたりのエンコード時間（秒）)"""
+    total = sum(len(encoder.encode(data)) for data in records)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in records:
+            encoder.encode(data)
+        best = min(best, time.perf_counter() - start)
+    return total, best / len(records)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--config', type=Path, default=Path('config.yaml'))
+    arg_parser.add_argument('--limit', type=int, default=0, help='使用するクラス数（0の場合は全件）')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='繰り返し回数（最速値を採用）')
+    args = arg_parser.parse_args()
+
+    records = load_records(args.config, args.limit)
+    print(f"Classes: {len(records)}")
+
+    backends = ['json']
+    try:
+        JsonEncoder('orjson')
+        backends.append('orjson')
+    except ModuleNotFoundError:
+        print("orjson is not installed, skipping")
+
+    baseline = None
+    for backend in backends:
+        for compact in (False, True):
+            total, seconds = bench(JsonEncoder(backend, compact), records, args.repeat)
+            baseline = baseline or (total, seconds)
+            name = f"{backend}/{'compact' if compact else 'indent'}"
+            print(f"{name:>15}: {total / 1024:10.0f} KiB ({total / baseline[0] * 100:5.1f}%), "
+                  f"{seconds * 1e6:8.2f} us/class ({baseline[1] / seconds:5.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+パーサーバックエンドのベンチマーク
+
+html.parser（BeautifulSoup）とlxmlバックエンドで、クラスページ1件あたりのパース時間を比較する。
+キャッシュ済みページ（config.yamlのcache設定）があればそれを使い、なければテスト用のサンプルページを使う。
+
+実行方法:
+    python benchmarks/bench_parser.py [--limit 50] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+
+from src.page_cache import create_page_cache
+from src.parser import ClassInfo, create_parser
+
+SAMPLE_CLASS_HTML = Path(__file__).parent.parent / "tests" / "data" / "sample_class.html"
+BACKENDS = ['html.parser', 'lxml']
+
+
+def load_pages(config_path: Path, limit: int) -> list:
+    """ベンチマーク対象のページを (バイト列, エンコーディング) のリストで読み込む"""
+    pages = []
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        cache = create_page_cache(config)
+        for url in cache.iter_urls():
+            if not url.split('/')[-1].startswith(('class_', 'struct_', 'interface_')):
+                continue
+            page = cache.get(url)
+            pages.append((page.content, page.encoding))
+            if len(pages) >= limit:
+                break
+        cache.close()
+
+    if not pages:
+        print(f"No cached class pages found, using {SAMPLE_CLASS_HTML.name}")
+        pages = [(SAMPLE_CLASS_HTML.read_bytes(), None)]
+    return pages
+
+
+def bench(backend: str, pages: list, repeat: int) -> float:
+    """1ページあたりの平均パース時間（秒）"""
+    parser = create_parser(backend)
+    info = ClassInfo("Bench", "Bench.Bench", "class_bench.html", "class", "Bench")
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content, encoding in pages:
+            parser.parse_class_content(content, info, encoding)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--config', type=Path, default=Path('config.yaml'))
+    arg_parser.add_argument('--limit', type=int, default=50, help='使用するページ数')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='繰り返し回数（最速値を採用）')
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.config, args.limit)
+    total_kb = sum(len(content) for content, _ in pages) / 1024
+    print(f"Pages: {len(pages)} ({total_kb:.0f} KiB)")
+
+    results = {backend: bench(backend, pages, args.repeat) for backend in BACKENDS}
+    for backend, seconds in results.items():
+        print(f"{backend:>12}: {seconds * 1000:8.2f} ms/page")
+    print(f"{'speedup':>12}: {results['html.parser'] / results['lxml']:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
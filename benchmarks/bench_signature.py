@@ -0,0 +1,108 @@
+"""
+SignatureParserのベンチマーク
+
+キャッシュ済みのクラスページ（config.yamlのcache設定）をパースして整形前のシグネチャを収集し、
+キャッシュなし（毎回整形）・初回（キャッシュを空にして1巡）・2巡目以降の1件あたりの整形時間を比較する。
+キャッシュ済みページがなければテスト用のサンプルページを使う。
+
+実行方法:
+    python benchmarks/bench_signature.py [--limit 500] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import ClassInfo, create_parser
+from src.signature_parser import SignatureParser
+
+from bench_parser import load_pages
+
+
+def harvest_signatures(pages: list) -> list:
+    """ページをパースし、SignatureParserに渡される整形前のシグネチャを出現順に収集する"""
+    signatures = []
+    parser = create_parser('html.parser')
+    info = ClassInfo("Bench", "Bench.Bench", "class_bench.html", "class", "Bench")
+    for content, encoding in pages:
+        signatures.extend(parser.parse_class_content(content, info, encoding).raw_signatures)
+    return signatures
+
+
+def clear_caches():
+    SignatureParser.format_signature.cache_clear()
+    SignatureParser.format_parameter.cache_clear()
+
+
+def bench_uncached(signatures: list, repeat: int) -> float:
+    """毎回キャッシュを空にして整形した場合の1件あたりの時間（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for signature in signatures:
+            clear_caches()
+            SignatureParser.format_signature(signature)
+        best = min(best, time.perf_counter() - start)
+    return best / len(signatures)
+
+
+def bench_cold(signatures: list, repeat: int) -> float:
+    """キャッシュを空にしてコーパスを1巡した場合の1件あたりの時間（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        for signature in signatures:
+            SignatureParser.format_signature(signature)
+        best = min(best, time.perf_counter() - start)
+    return best / len(signatures)
+
+
+def bench_warm(signatures: list, repeat: int) -> float:
+    """キャッシュ済みの状態でコーパスを1巡した場合の1件あたりの時間（秒）"""
+    for signature in signatures:
+        SignatureParser.format_signature(signature)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for signature in signatures:
+            SignatureParser.format_signature(signature)
+        best = min(best, time.perf_counter() - start)
+    return best / len(signatures)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--config', type=Path, default=Path('config.yaml'))
+    arg_parser.add_argument('--limit', type=int, default=500, help='シグネチャを収集するページ数')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='繰り返し回数（最速値を採用）')
+    args = arg_parser.parse_args()
+
+    signatures = harvest_signatures(load_pages(args.config, args.limit))
+    if not signatures:
+        print("No signatures found")
+        return
+    print(f"Signatures: {len(signatures)} ({len(set(signatures))} unique)")
+
+    results = {
+        'uncached': bench_uncached(signatures, args.repeat),
+        'cold': bench_cold(signatures, args.repeat),
+        'warm': bench_warm(signatures, args.repeat),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>10}: {seconds * 1e6:8.2f} us/signature")
+
+    clear_caches()
+    for signature in signatures:
+        SignatureParser.format_signature(signature)
+    for name in ('format_signature', 'format_parameter'):
+        info = getattr(SignatureParser, name).cache_info()
+        total = info.hits + info.misses
+        print(f"{name:>18}: {info.hits}/{total} hits ({info.hits / total * 100 if total else 0:.1f}%), "
+              f"{info.currsize} cached")
+
+
+if __name__ == '__main__':
+    main()
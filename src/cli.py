@@ -3,30 +3,81 @@
 """
 import json
 import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional
 
 import click
 from tqdm import tqdm
 
-from src.scraper import BakinScraper
-from src.parser import BakinParser, ClassInfo, ClassDetail
+from src.scraper import BakinScraper, RawPage
+from src.parser import ClassInfo, ClassDetail, create_parser
+from src.signature_parser import TypeDictionary
 from src.markdown_generator import MarkdownGenerator
 from src.json_generator import JsonGenerator
-from src.progress_manager import ProgressManager
+from src.output_writer import create_output_writer
+from src.render_model import ClassRenderModel
+from src.namespace_index import NamespaceIndex
+from src.progress_manager import ProgressEntry, create_progress_manager, default_worker_id
+from src.page_cache import FilePageCache, PackPageCache, copy_page_cache
+from src.parse_cache import create_parse_cache
+from src.pipeline import Stage, StagedPipeline, log_stage_stats
 
 logger = logging.getLogger(__name__)
 
 
+DURATION_UNITS = {
+    's': 'seconds',
+    'm': 'minutes',
+    'h': 'hours',
+    'd': 'days',
+    'w': 'weeks',
+}
+
+
+def parse_duration(text: str) -> timedelta:
+    """
+    期間の文字列をtimedeltaに変換
+
+    Args:
+        text: 数値と単位（s, m, h, d, w）の組み合わせ（例: "30d", "1w2d", "12h"）
+
+    Returns:
+        timedelta
+    """
+    compact = re.sub(r'\s+', '', text.lower())
+    if not re.fullmatch(r'(?:\d+(?:\.\d+)?[smhdw])+', compact):
+        raise ValueError(f"Invalid duration: {text!r} (e.g. 30d, 12h, 1w2d)")
+    parts = re.findall(r'(\d+(?:\.\d+)?)([smhdw])', compact)
+    return sum((timedelta(**{DURATION_UNITS[unit]: float(value)}) for value, unit in parts), timedelta())
+
+
+@dataclass
+class RenderedClass:
+    """出力形式に変換済みのクラス情報"""
+    detail: ClassDetail
+    markdown: str
+    json_data: dict
+
+
 class BakinDocumentationScraper:
     """メインスクレイパークラス"""
 
     def __init__(self, config_path: str = "config.yaml"):
         self.scraper = BakinScraper(config_path)
-        self.parser = BakinParser()
-        self.generator = MarkdownGenerator()
-        self.json_generator = JsonGenerator()
         self.config = self.scraper.config
+        self.parse_cache = create_parse_cache(self.config)
+        self.parser = create_parser(self.config.get('parsing', {}).get('backend', 'html.parser'),
+                                    result_cache=self.parse_cache)
+        self.output_writer = create_output_writer(self.config)
+        self.generator = MarkdownGenerator(self.output_writer)
+        self.json_generator = JsonGenerator(self.output_writer,
+                                            compact=self.config['output'].get('json_compact', False),
+                                            backend=self.config['output'].get('json_backend', 'auto'))
 
         # 出力ディレクトリ
         self.output_dir = Path(self.config['output']['base_dir'])
@@ -35,9 +86,26 @@ class BakinDocumentationScraper:
         self.json_dir = Path(self.config['output']['json_dir'])
         self.cache_file = Path(self.config['output']['class_list_cache'])
 
+        # 索引（index.md）の元になる名前空間の木（クラスの保存ごとにメモリ上で更新して一定件数ごとに索引を書き直し、
+        # 木のファイルはセッションの終了時に保存する）
+        self.namespace_index = NamespaceIndex(self.config['output'].get('index_tree',
+                                                                        self.output_dir / 'index_tree.json'))
+        self.index_update_every = self.config['output'].get('index_update_every', 20)
+        self._index_pending = 0
+        self._index_reconciled = False
+        # 索引に表示する全クラス数（セッション中は1回だけ求め、クラス一覧の初期化・更新時に更新する）
+        self._index_total: Optional[int] = None
+        # パイプラインの書き込みスレッドとメインスレッドの両方から更新されるため、木と索引の書き込みを直列化する
+        self._index_lock = threading.RLock()
+
         # 進捗管理
-        self.progress_file = Path(self.config['output']['progress_file'])
-        self.progress_manager = ProgressManager(self.progress_file)
+        self.progress_manager = create_progress_manager(self.config)
+        self.progress_file = self.progress_manager.progress_file
+        # 直前のスクレイピングがユーザーにより中断されたか
+        self.interrupted = False
+        # 型名の辞書はパースする場合だけ、最初のパースの前に作る
+        self._known_types_loaded = False
+        self._known_types_lock = threading.Lock()
 
         # ディレクトリ作成
         self.output_dir.mkdir(exist_ok=True)
@@ -60,20 +128,80 @@ class BakinDocumentationScraper:
             logger.info(f"Loading class list from cache: {self.cache_file}")
             with open(self.cache_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                return [ClassInfo(**item) for item in data]
+            classes = [ClassInfo(**item) for item in data]
+            return classes
 
         # 新規取得
         logger.info("Fetching class list from annotated page...")
-        soup = self.scraper.fetch_annotated_page()
-        classes = self.parser.parse_annotated_page(soup)
+        page = self.scraper.fetch_raw_page(self.config['pages']['annotated'])
+        classes = self.parser.parse_annotated_content(page.content, page.encoding)
 
         # キャッシュに保存
         with open(self.cache_file, 'w', encoding='utf-8') as f:
             json.dump([vars(cls) for cls in classes], f, ensure_ascii=False, indent=2)
 
         logger.info(f"Saved class list to cache: {self.cache_file}")
+        # 型名の辞書は次のパースの前に新しいクラス一覧から作り直す
+        self._known_types_loaded = False
         return classes
 
+    def _ensure_known_types(self):
+        """
+        キャッシュ済みのクラス一覧から既知の型名の辞書を作り、パーサーに設定（パースの前に1回だけ）
+
+        parsing.known_typesがfalseの場合とクラス一覧がない場合は何もしない。
+        """
+        with self._known_types_lock:
+            if self._known_types_loaded:
+                return
+            self._known_types_loaded = True
+            if not self.config.get('parsing', {}).get('known_types', True) or not self.cache_file.exists():
+                return
+            self.parser.known_types = TypeDictionary.from_classes(self.fetch_class_list())
+            logger.debug(f"Known types for parameter splitting: {len(self.parser.known_types)}")
+
+    def initialize_progress(self, classes: List[ClassInfo]):
+        """
+        クラスリストから進捗を初期化し、索引の名前空間の木も空にする
+
+        Args:
+            classes: ClassInfoのリスト
+        """
+        self.progress_manager.initialize_from_class_list(classes)
+        with self._index_lock:
+            self.namespace_index.clear()
+            self._index_pending = 0
+            self._index_reconciled = True
+            self._index_total = len(classes)
+
+    def refresh_class_list(self) -> dict:
+        """
+        クラス一覧ページを再取得し、差分だけを進捗に反映（既存の完了状態は保持する）
+
+        一覧からなくなったクラスの出力ファイルは削除する。
+
+        Returns:
+            差分の辞書（src.progress_manager.diff_class_listを参照）
+        """
+        classes = self.fetch_class_list(force=True)
+
+        if not self.progress_manager.exists():
+            logger.info("Progress file not found. Initializing...")
+            self.initialize_progress(classes)
+            return {'added': [cls.full_name for cls in classes], 'removed': [], 'url_changed': [], 'unchanged': 0}
+
+        diff = self.progress_manager.refresh_from_class_list(classes)
+        for full_name in diff['removed']:
+            for path in (self.classes_dir / f"{full_name}.md", self.json_dir / f"{full_name}.json"):
+                self.output_writer.remove(path)
+            with self._index_lock:
+                self.namespace_index.remove(full_name)
+        with self._index_lock:
+            self._index_total = None
+        self._generate_index()
+        self.output_writer.flush()
+        return diff
+
     def scrape_class(self, class_info: ClassInfo) -> ClassDetail:
         """
         個別クラスの情報をスクレイピング
@@ -84,11 +212,25 @@ class BakinDocumentationScraper:
         Returns:
             ClassDetail
         """
-        soup = self.scraper.fetch_class_page(class_info.url)
-        if not soup:
+        page = self.scraper.fetch_raw_class_page(class_info.url)
+        return self._parse_fetched_page(page, class_info)
+
+    def _parse_fetched_page(self, page: Optional[RawPage], class_info: ClassInfo) -> ClassDetail:
+        """
+        取得済みのクラスページをパース
+
+        Args:
+            page: クラスページのバイト列（取得失敗時はNone）
+            class_info: 対象クラスの基本情報
+
+        Returns:
+            ClassDetail
+        """
+        if not page:
             raise Exception(f"Failed to fetch class page: {class_info.url}")
 
-        detail = self.parser.parse_class_page(soup, class_info)
+        self._ensure_known_types()
+        detail = self.parser.parse_class_content(page.content, class_info, page.encoding)
         return detail
 
     def save_class_markdown(self, detail: ClassDetail):
@@ -98,46 +240,236 @@ class BakinDocumentationScraper:
         Args:
             detail: ClassDetail
         """
+        self.write_rendered_class(self.render_class(detail))
+
+    def render_class(self, detail: ClassDetail) -> RenderedClass:
+        """
+        クラス情報をMarkdownとJSONに変換（ファイルには書き込まない）
+
+        描画モデルを1回だけ作り、両方の出力形式で共有する。
+
+        Args:
+            detail: ClassDetail
+
+        Returns:
+            RenderedClass
+        """
+        model = ClassRenderModel.from_detail(detail)
+        return RenderedClass(
+            detail=detail,
+            markdown=self.generator.render_class_markdown(model),
+            json_data=self.json_generator.render_class_json(model)
+        )
+
+    def write_rendered_class(self, rendered: RenderedClass):
+        """
+        変換済みのクラス情報をファイルに保存
+
+        Args:
+            rendered: RenderedClass
+        """
+        full_name = rendered.detail.info.full_name
+
         # Markdown保存
-        md_content = self.generator.generate_class_markdown(detail)
-        md_filename = f"{detail.info.full_name}.md"
-        md_filepath = self.classes_dir / md_filename
-        self.generator.save_markdown(md_content, md_filepath)
+        md_filepath = self.classes_dir / f"{full_name}.md"
+        self.generator.save_markdown(rendered.markdown, md_filepath)
 
         # JSON保存
-        json_filename = f"{detail.info.full_name}.json"
-        json_filepath = self.json_dir / json_filename
-        self.json_generator.save_class_json(detail, json_filepath)
-
-    def scrape_with_progress(self, limit: Optional[int] = None, force_init: bool = False):
+        json_filepath = self.json_dir / f"{full_name}.json"
+        self.json_generator.save_json(rendered.json_data, json_filepath)
+
+        # 索引の名前空間の木に追加し、一定件数ごとに索引を書き直す
+        with self._index_lock:
+            if self.namespace_index.add(rendered.detail.info):
+                self._index_pending += 1
+                if self.index_update_every and self._index_pending >= self.index_update_every:
+                    self._write_index()
+
+    def scrape_with_progress(self, limit: Optional[int] = None, force_init: bool = False,
+                             workers: Optional[int] = None, pipeline: Optional[bool] = None,
+                             shared: Optional[bool] = None, older_than: Optional[timedelta] = None):
         """
         進捗管理を使用してスクレイピング（継続モード）
 
         Args:
             limit: 処理する最大件数（Noneの場合は全未完了分）
             force_init: 進捗ファイルを強制的に再初期化
+            workers: ページ取得の並列数（Noneの場合は設定値）
+            pipeline: 取得・パース・描画・書き込みをステージ並行で実行するか（Noneの場合は設定値）
+            shared: 他のプロセスと分担して実行するか（未完了のエントリーをリースで借り受けながら処理する。
+                    Noneの場合は設定値）
+            older_than: 指定した場合、未完了分の処理後に最終更新がこれより古い完了済みクラスを再検証する
         """
+        workers = workers or self.scraper.workers
+        pipeline_config = self.config.get('pipeline', {})
+        if pipeline is None:
+            pipeline = pipeline_config.get('enabled', False)
+        progress_config = self.config.get('progress', {})
+        if shared is None:
+            shared = progress_config.get('shared', False)
+        if older_than is None and self.config.get('freshness', {}).get('older_than'):
+            older_than = parse_duration(self.config['freshness']['older_than'])
+        self.interrupted = False
+
         # 進捗ファイルの初期化チェック
-        if not self.progress_file.exists() or force_init:
+        if not self.progress_manager.exists() or force_init:
             logger.info("Progress file not found. Initializing...")
             classes = self.fetch_class_list()
-            self.progress_manager.initialize_from_class_list(classes)
+            self.initialize_progress(classes)
 
         # 統計表示
         stats = self.progress_manager.get_statistics()
+        with self._index_lock:
+            self._index_total = stats['total']
         logger.info(f"Progress: {stats['completed']}/{stats['total']} completed ({stats['progress_percentage']:.1f}%)")
         logger.info(f"Pending: {stats['pending']} classes")
 
-        # 未完了エントリーを取得
-        pending_entries = self.progress_manager.get_pending_entries(limit=limit)
-
-        if not pending_entries:
+        if shared:
+            processed_count, failed_count = self._scrape_shared(limit, workers, pipeline, pipeline_config,
+                                                                progress_config)
+        else:
+            # 未完了エントリーを取得
+            pending_entries = self.progress_manager.get_pending_entries(limit=limit)
+            processed_count = len(pending_entries)
+            failed_count = 0
+            if pending_entries:
+                logger.info(f"Starting to scrape {len(pending_entries)} classes...")
+                failed_count = self._scrape_batch(pending_entries, workers, pipeline, pipeline_config)
+                failed_count -= self._retry_deferred(pending_entries, workers, pipeline, pipeline_config)
+
+        # 未完了分の後、最終更新の古いクラスを古い順に再検証（残りの件数の範囲で）
+        if older_than is not None and not self.interrupted and (limit is None or processed_count < limit):
+            remaining = None if limit is None else limit - processed_count
+            refreshed_count, refresh_failed = self.refresh_stale_entries(older_than, limit=remaining, workers=workers)
+            processed_count += refreshed_count
+            failed_count += refresh_failed
+
+        if processed_count == 0 and stats['pending'] == 0:
             logger.info("All classes have been scraped!")
             # 索引ファイルを生成
             self._generate_index()
+            self.output_writer.flush()
             return
 
-        logger.info(f"Starting to scrape {len(pending_entries)} classes...")
+        # 索引を書き直し、書き込んだ出力ファイルをまとめて同期し、ジャーナルに追記した完了記録を進捗CSVに反映
+        self._generate_index()
+        self.output_writer.flush()
+        self.progress_manager.compact()
+
+        # 最終統計
+        final_stats = self.progress_manager.get_statistics()
+        logger.info("\n=== Scraping Session Summary ===")
+        logger.info(f"Processed: {processed_count - failed_count} classes")
+        logger.info(f"Failed: {failed_count} classes")
+        logger.info(f"Overall progress: {final_stats['completed']}/{final_stats['total']} ({final_stats['progress_percentage']:.1f}%)")
+
+        if final_stats['pending'] == 0:
+            logger.info("All classes completed!")
+
+    def _scrape_shared(self, limit: Optional[int], workers: int, pipeline: bool, pipeline_config: dict,
+                       progress_config: dict) -> tuple:
+        """
+        未完了のエントリーを少しずつリースで借り受けながら処理する（他のプロセスと分担する場合）
+
+        失敗したエントリーのリースはセッション終了まで保持し、同じセッションで再び借り受けないようにする。
+        終了時に返却するため、次のセッション（または他のワーカー）で再試行される。
+
+        Args:
+            limit: 処理する最大件数（Noneの場合は借り受けられなくなるまで）
+            workers: ページ取得の並列数
+            pipeline: ステージ並行で実行するか
+            pipeline_config: config.yamlのpipelineセクション
+            progress_config: config.yamlのprogressセクション
+
+        Returns:
+            (借り受けた件数, 失敗件数)
+        """
+        worker_id = progress_config.get('worker_id') or default_worker_id()
+        lease_seconds = progress_config.get('lease_seconds', 600)
+        claim_batch = max(1, progress_config.get('claim_batch', 16))
+        logger.info(f"Scraping as shared worker {worker_id}")
+
+        claimed = []
+        failed_count = 0
+        try:
+            while not self.interrupted and (limit is None or len(claimed) < limit):
+                batch_size = claim_batch if limit is None else min(claim_batch, limit - len(claimed))
+                entries = self.progress_manager.claim_entries(worker_id, batch_size, lease_seconds=lease_seconds)
+                if not entries:
+                    break
+                logger.info(f"Claimed {len(entries)} classes")
+                claimed.extend(entries)
+                failed_count += self._scrape_batch(entries, workers, pipeline, pipeline_config)
+            # 保留分はリースを保持したまま再試行する
+            failed_count -= self._retry_deferred(claimed, workers, pipeline, pipeline_config)
+        finally:
+            self.progress_manager.release_entries(worker_id)
+
+        return len(claimed), failed_count
+
+    def _retry_deferred(self, entries: List[ProgressEntry], workers: int, pipeline: bool,
+                        pipeline_config: dict) -> int:
+        """
+        一時的な失敗で保留されたエントリーを、揺らぎを加えた待ち時間の後にまとめて再試行
+
+        Args:
+            entries: このセッションで処理したエントリー
+            workers: ページ取得の並列数
+            pipeline: ステージ並行で実行するか
+            pipeline_config: config.yamlのpipelineセクション
+
+        Returns:
+            再試行で成功した件数
+        """
+        policy = self.scraper.retry_policy
+        recovered_count = 0
+        for round_number in range(1, policy.deferred_rounds + 1):
+            if self.interrupted:
+                break
+            deferred = self.scraper.take_deferred([e.url for e in entries])
+            if not deferred:
+                break
+
+            retry_entries = [e for e in entries if e.url in deferred]
+            retry_afters = [value for value in deferred.values() if value is not None]
+            delay = policy.deferred_wait(max(retry_afters) if retry_afters else None)
+            logger.info(f"Retrying {len(retry_entries)} deferred classes in {delay:.1f}s "
+                        f"(round {round_number}/{policy.deferred_rounds})")
+            try:
+                time.sleep(delay)
+            except KeyboardInterrupt:
+                logger.warning("\nInterrupted by user. Progress has been saved.")
+                self.interrupted = True
+                break
+
+            failed_count = self._scrape_batch(retry_entries, workers, pipeline, pipeline_config)
+            recovered_count += len(retry_entries) - failed_count
+
+        return recovered_count
+
+    def _scrape_batch(self, entries: List[ProgressEntry], workers: int, pipeline: bool,
+                      pipeline_config: dict) -> int:
+        """設定された実行方式でエントリーを処理し、失敗件数を返す"""
+        if pipeline:
+            return self._scrape_pipelined(entries, workers, pipeline_config)
+        return self._scrape_sequential(entries, workers)
+
+    def _scrape_sequential(self, pending_entries: List[ProgressEntry], workers: int) -> int:
+        """
+        1件ずつ取得・パース・保存を行う（workers > 1の場合は取得のみ先行並列化）
+
+        Args:
+            pending_entries: 処理対象のエントリー
+            workers: ページ取得の並列数
+
+        Returns:
+            失敗件数
+        """
+        # 並列モードではページ取得を先行させ、パースと保存は入力順に行う
+        prefetched = None
+        if workers > 1:
+            logger.info(f"Fetching pages with {workers} workers")
+            prefetched = self.scraper.fetch_pages([e.url for e in pending_entries], workers=workers)
 
         # スクレイピング実行
         failed_count = 0
@@ -145,36 +477,285 @@ class BakinDocumentationScraper:
             class_info = self.progress_manager.entry_to_class_info(entry)
 
             try:
-                detail = self.scrape_class(class_info)
+                if prefetched is not None:
+                    detail = self._parse_fetched_page(next(prefetched), class_info)
+                else:
+                    detail = self.scrape_class(class_info)
                 self.save_class_markdown(detail)
                 self.progress_manager.mark_completed(class_info.full_name)
             except KeyboardInterrupt:
                 logger.warning("\nInterrupted by user. Progress has been saved.")
+                self.interrupted = True
                 break
             except Exception as e:
                 logger.error(f"Failed to scrape {class_info.full_name}: {e}")
                 failed_count += 1
                 continue
 
-        # 最終統計
-        final_stats = self.progress_manager.get_statistics()
-        logger.info("\n=== Scraping Session Summary ===")
-        logger.info(f"Processed: {len(pending_entries) - failed_count} classes")
-        logger.info(f"Failed: {failed_count} classes")
-        logger.info(f"Overall progress: {final_stats['completed']}/{final_stats['total']} ({final_stats['progress_percentage']:.1f}%)")
+        if prefetched is not None:
+            # 中断時は未着手の取得をキャンセル
+            prefetched.close()
 
-        # 全て完了していれば索引生成
-        if final_stats['pending'] == 0:
-            logger.info("All classes completed! Generating index...")
-            self._generate_index()
+        return failed_count
+
+    def _scrape_pipelined(self, pending_entries: List[ProgressEntry], workers: int, pipeline_config: dict) -> int:
+        """
+        取得 → パース → 描画 → 書き込みを、ステージごとのワーカーと容量制限付きキューで並行実行
+
+        Args:
+            pending_entries: 処理対象のエントリー
+            workers: 取得ステージのワーカー数
+            pipeline_config: config.yamlのpipelineセクション
+
+        Returns:
+            失敗件数
+        """
+        progress_bar = tqdm(total=len(pending_entries), desc="Scraping")
+        failed = []
+
+        def fetch(entry: ProgressEntry):
+            class_info = self.progress_manager.entry_to_class_info(entry)
+            return class_info, self.scraper.fetch_raw_class_page(class_info.url)
+
+        def parse(fetched):
+            class_info, page = fetched
+            return self._parse_fetched_page(page, class_info)
+
+        def write(rendered: RenderedClass):
+            # 進捗ファイルへの書き込みを直列化するため、書き込みステージは常に1ワーカー
+            self.write_rendered_class(rendered)
+            self.progress_manager.mark_completed(rendered.detail.info.full_name)
+            progress_bar.update(1)
+
+        def on_error(entry: ProgressEntry, stage: str, error: Exception):
+            logger.error(f"Failed to scrape {entry.full_name} ({stage}): {error}")
+            failed.append(entry.full_name)
+            progress_bar.update(1)
+
+        stages = [
+            Stage('fetch', fetch, workers=workers),
+            Stage('parse', parse, workers=pipeline_config.get('parse_workers', 1)),
+            Stage('render', self.render_class, workers=pipeline_config.get('render_workers', 1)),
+            Stage('write', write, workers=1),
+        ]
+        runner = StagedPipeline(stages, queue_size=pipeline_config.get('queue_size', 16), on_error=on_error)
+
+        try:
+            stats = runner.run(pending_entries)
+            log_stage_stats(stats)
+        except KeyboardInterrupt:
+            logger.warning("\nInterrupted by user. Progress has been saved.")
+            self.interrupted = True
+        finally:
+            progress_bar.close()
+
+        return len(failed)
+
+    def rebuild_from_cache(self, processes: Optional[int] = None):
+        """
+        キャッシュ済みHTMLから全クラスの出力を再生成（Webへはアクセスしない）
+
+        パースは複数プロセスで行い、保存は進捗ファイルの順序通りに行うため、
+        出力は逐次処理の場合と同一になる。
+
+        Args:
+            processes: パースのワーカープロセス数（Noneの場合は設定値、未設定ならCPUコア数）
+        """
+        if processes is None:
+            processes = self.config.get('parsing', {}).get('processes')
+
+        entries = self.progress_manager.load_progress()
+        class_infos = [self.progress_manager.entry_to_class_info(e) for e in entries]
+        cached = [info for info in class_infos if self.scraper.is_cached(info.url)]
+        completed = {e.full_name for e in entries if e.completed}
+
+        logger.info(f"Rebuilding {len(cached)}/{len(class_infos)} classes from cache "
+                    f"({processes or 'all'} processes)...")
+
+        self._ensure_known_types()
+        results = self.parser.parse_class_contents(self._iter_cached_pages(cached), processes=processes)
+
+        failed_count = 0
+        for class_info, detail in tqdm(zip(cached, results), total=len(cached), desc="Rebuilding"):
+            if detail is None:
+                failed_count += 1
+                continue
+            self.save_class_markdown(detail)
+            if class_info.full_name not in completed:
+                self.progress_manager.mark_completed(class_info.full_name)
+
+        self._generate_index()
+        self.output_writer.flush()
+        self.progress_manager.compact()
+        logger.info(f"Rebuilt: {len(cached) - failed_count} classes, Failed: {failed_count} classes")
+        if self.parse_cache is not None:
+            logger.info(f"Parse cache: {self.parse_cache.hits} hits, {self.parse_cache.misses} misses")
+
+    def export_bundle(self, bundle_path: Optional[Path] = None) -> int:
+        """
+        完了済みクラスのJSONを1つのJSONLバンドルと索引にまとめる（進捗ファイルの順）
+
+        Args:
+            bundle_path: バンドルの保存先（Noneの場合はoutput.bundle_file）
+
+        Returns:
+            バンドルに含めたクラス数
+        """
+        if bundle_path is None:
+            bundle_path = Path(self.config['output'].get('bundle_file', self.output_dir / 'reference.jsonl'))
+        entries = [e for e in self.progress_manager.load_progress() if e.completed]
+        return self.json_generator.export_bundle(self._iter_class_json(entries), bundle_path)
+
+    def _iter_class_json(self, entries: List[ProgressEntry]):
+        """保存済みのクラスごとのJSONを順に読み込む（ファイルがないクラスは飛ばす）"""
+        for entry in entries:
+            json_filepath = self.json_dir / f"{entry.full_name}.json"
+            try:
+                with open(json_filepath, 'r', encoding='utf-8') as f:
+                    yield json.load(f)
+            except FileNotFoundError:
+                logger.warning(f"JSON not found, skipped: {json_filepath}")
+
+    def _iter_cached_pages(self, class_infos: List[ClassInfo]):
+        """キャッシュ済みページを (バイト列, ClassInfo, エンコーディング) として順に読み込む"""
+        for info in class_infos:
+            page = self.scraper.read_cached_page(info.url)
+            yield page.content, info, page.encoding
+
+    def revalidate_cache(self, limit: Optional[int] = None, workers: Optional[int] = None):
+        """
+        完了済みクラスのキャッシュを条件付きGETで再検証し、更新されたページのみ再パース・保存
+
+        Args:
+            limit: 再検証する最大件数（Noneの場合は全件）
+            workers: 再検証の並列数（Noneの場合は設定値）
+        """
+        entries = [
+            e for e in self.progress_manager.load_progress()
+            if e.completed and self.scraper.is_cached(e.url)
+        ]
+        if limit is not None:
+            entries = entries[:limit]
+
+        logger.info(f"Revalidating {len(entries)} cached classes...")
+        result = self._revalidate_entries(entries, workers)
+
+        logger.info("\n=== Revalidation Summary ===")
+        logger.info(f"Not modified: {result['unchanged']} classes")
+        logger.info(f"Updated: {result['updated']} classes")
+        logger.info(f"Failed: {result['failed']} classes")
+
+    def refresh_stale_entries(self, older_than: timedelta, limit: Optional[int] = None,
+                              workers: Optional[int] = None) -> tuple:
+        """
+        最終更新が指定期間より古い完了済みクラスを、古い順に条件付きGETで再検証・再生成
+
+        リクエスト頻度は共有レートリミッターで制限されるため、定期的に --limit 付きで実行すると
+        全件をリセットせずに一定のペースでリファレンス全体を順に更新できる。
+
+        Args:
+            older_than: この期間より前に更新されたクラスを対象とする
+            limit: 再検証する最大件数（Noneの場合は全件）
+            workers: 再検証の並列数（Noneの場合は設定値）
+
+        Returns:
+            (対象件数, 失敗件数)
+        """
+        entries = self.progress_manager.get_stale_entries(datetime.now() - older_than, limit=limit)
+        if not entries:
+            logger.info(f"No classes older than {older_than}")
+            return 0, 0
+
+        logger.info(f"Refreshing {len(entries)} classes older than {older_than} "
+                    f"(oldest: {entries[0].last_updated or 'unknown'})...")
+        result = self._revalidate_entries(entries, workers)
+        logger.info(f"Refreshed: {result['updated']} updated, {result['unchanged']} not modified, "
+                    f"{result['failed']} failed")
+        return len(entries), result['failed']
+
+    def _revalidate_entries(self, entries: List[ProgressEntry], workers: Optional[int]) -> dict:
+        """
+        エントリーのページを再検証し、更新されたページのみ再パース・保存する
+
+        更新の有無にかかわらず、確認できたエントリーは完了として最終更新日時を記録する。
+
+        Args:
+            entries: 再検証するエントリー
+            workers: 再検証の並列数（Noneの場合は設定値）
+
+        Returns:
+            {'unchanged': 変更なし, 'updated': 更新あり, 'failed': 失敗} の件数
+        """
+        results = self.scraper.revalidate_pages([e.url for e in entries], workers=workers)
+
+        counts = {'unchanged': 0, 'updated': 0, 'failed': 0}
+        for entry, changed in tqdm(zip(entries, results), total=len(entries), desc="Revalidating"):
+            if changed is None:
+                counts['failed'] += 1
+                continue
+            if not changed:
+                self.progress_manager.mark_completed(entry.full_name)
+                counts['unchanged'] += 1
+                continue
+
+            class_info = self.progress_manager.entry_to_class_info(entry)
+            try:
+                page = self.scraper.read_cached_page(class_info.url)
+                detail = self._parse_fetched_page(page, class_info)
+                self.save_class_markdown(detail)
+                self.progress_manager.mark_completed(class_info.full_name)
+                counts['updated'] += 1
+            except Exception as e:
+                logger.error(f"Failed to scrape {class_info.full_name}: {e}")
+                counts['failed'] += 1
+
+        self._generate_index()
+        self.output_writer.flush()
+        self.progress_manager.compact()
+        return counts
 
     def _generate_index(self):
-        """索引ファイルを生成"""
-        classes = self.fetch_class_list()
-        index_md = self.generator.generate_index_markdown(classes)
-        index_path = self.output_dir / "index.md"
-        self.generator.save_markdown(index_md, index_path)
-        logger.info(f"Index file generated: {index_path}")
+        """
+        名前空間の木を保存し、索引ファイルを書き直す（セッションの終了時などに呼ぶ）
+
+        木の保存では保存済みの木を読み直して変更を反映するため、クラスの保存ごとには行わない。
+        """
+        with self._index_lock:
+            self._reconcile_index()
+            self.namespace_index.save()
+            self._write_index()
+
+    def _write_index(self):
+        """
+        索引ファイルを書き直す（木は保存しない）
+
+        木はクラスの保存ごとにメモリ上で更新済みのため、クラス一覧の読み込みや全体の並べ替えはしない。
+        描画し直すのは変更のあった名前空間のセクションだけで、内容が変わらなければ書き込まない。
+        未完了のクラスがある間は、取得済みの件数を索引に表示する。
+        """
+        with self._index_lock:
+            self._reconcile_index()
+            self._index_pending = 0
+            if self._index_total is None and self.progress_manager.exists():
+                self._index_total = self.progress_manager.get_statistics()['total']
+            index_path = self.output_dir / "index.md"
+            self.generator.save_markdown(self.namespace_index.render(self._index_total), index_path)
+            logger.debug(f"Index file updated: {index_path} ({len(self.namespace_index)} classes)")
+
+    def _reconcile_index(self):
+        """
+        セッションで最初に索引を書くとき、完了済みのエントリーのうち木にないクラスを追加する
+
+        前回のセッションが木を保存する前に終了した場合や、木のない以前の版で取得した出力の移行用。
+        """
+        if self._index_reconciled:
+            return
+        self._index_reconciled = True
+        if not self.progress_manager.exists():
+            return
+        for entry in self.progress_manager.load_progress():
+            if entry.completed and entry.full_name not in self.namespace_index:
+                self.namespace_index.add(self.progress_manager.entry_to_class_info(entry))
 
     def scrape_by_name(self, class_name: str):
         """
@@ -199,6 +780,8 @@ class BakinDocumentationScraper:
         logger.info(f"Scraping {target.full_name}...")
         detail = self.scrape_class(target)
         self.save_class_markdown(detail)
+        self._generate_index()
+        self.output_writer.flush()
         logger.info(f"Saved to {self.classes_dir / (target.full_name + '.md')}")
 
 
@@ -208,12 +791,30 @@ def cli():
     pass
 
 
+def _duration_option(ctx, param, value):
+    """期間を指定するオプションの値をtimedeltaに変換"""
+    if value is None:
+        return None
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @cli.command()
 @click.option('--limit', type=int, default=None, help='処理する最大件数（未指定の場合は全て）')
-def scrape(limit):
+@click.option('--workers', type=int, default=None, help='ページ取得の並列数（未指定の場合はconfig.yamlの値）')
+@click.option('--pipeline/--no-pipeline', default=None,
+              help='取得・パース・描画・書き込みをステージ並行で実行（未指定の場合はconfig.yamlの値）')
+@click.option('--shared/--no-shared', default=None,
+              help='他のプロセスと同じ進捗ファイルを分担して実行（未指定の場合はconfig.yamlの値）')
+@click.option('--older-than', callback=_duration_option, default=None,
+              help='未完了分の後、最終更新がこの期間より古いクラスを古い順に再検証（例: 30d, 12h）')
+def scrape(limit, workers, pipeline, shared, older_than):
     """継続モードでスクレイピング（推奨）"""
     scraper = BakinDocumentationScraper()
-    scraper.scrape_with_progress(limit=limit, force_init=False)
+    scraper.scrape_with_progress(limit=limit, force_init=False, workers=workers, pipeline=pipeline,
+                                 shared=shared, older_than=older_than)
 
 
 @cli.command('reset-progress')
@@ -221,26 +822,40 @@ def reset_progress():
     """進捗状況をリセット"""
     scraper = BakinDocumentationScraper()
 
-    if not scraper.progress_file.exists():
+    if not scraper.progress_manager.exists():
         click.echo("進捗ファイルが存在しません。新規作成します...")
     else:
         click.echo(f"進捗ファイルをリセットします: {scraper.progress_file}")
 
     # クラスリストを取得して進捗ファイルを初期化
     classes = scraper.fetch_class_list()
-    scraper.progress_manager.initialize_from_class_list(classes)
+    scraper.initialize_progress(classes)
 
     stats = scraper.progress_manager.get_statistics()
     click.echo(f"\n進捗をリセットしました: {stats['total']} クラス")
     click.echo("スクレイピングを開始するには 'python main.py scrape' を実行してください")
 
 
+@cli.command()
+def refresh():
+    """クラス一覧を再取得し、追加・削除・URL変更のあったクラスのみ進捗に反映"""
+    scraper = BakinDocumentationScraper()
+    diff = scraper.refresh_class_list()
+
+    click.echo("\n=== Class List Refresh ===")
+    click.echo(f"Added: {len(diff['added'])}")
+    click.echo(f"Removed: {len(diff['removed'])}")
+    click.echo(f"URL changed: {len(diff['url_changed'])}")
+    click.echo(f"Unchanged: {diff['unchanged']}")
+    click.echo("追加・変更されたクラスを取得するには 'python main.py scrape' を実行してください")
+
+
 @cli.command()
 def status():
     """現在の進捗状況を表示"""
     scraper = BakinDocumentationScraper()
 
-    if not scraper.progress_file.exists():
+    if not scraper.progress_manager.exists():
         click.echo("Progress file not found. Run 'scrape' to initialize.")
         return
 
@@ -261,6 +876,68 @@ def status():
         click.echo(f"[{bar}] {stats['completed']}/{stats['total']}")
 
 
+@cli.command()
+@click.option('--processes', type=int, default=None,
+              help='パースのワーカープロセス数（未指定の場合はconfig.yamlの値、未設定ならCPUコア数）')
+def rebuild(processes):
+    """キャッシュ済みHTMLから出力を再生成"""
+    scraper = BakinDocumentationScraper()
+
+    if not scraper.progress_manager.exists():
+        click.echo("Progress file not found. Run 'scrape' to initialize.")
+        return
+
+    scraper.rebuild_from_cache(processes=processes)
+
+
+@cli.command()
+@click.option('--limit', type=int, default=None, help='再検証する最大件数（未指定の場合は全て）')
+@click.option('--workers', type=int, default=None, help='再検証の並列数（未指定の場合はconfig.yamlの値）')
+def revalidate(limit, workers):
+    """キャッシュ済みページの更新を確認し、変更されたクラスのみ再生成"""
+    scraper = BakinDocumentationScraper()
+
+    if not scraper.progress_manager.exists():
+        click.echo("Progress file not found. Run 'scrape' to initialize.")
+        return
+
+    scraper.revalidate_cache(limit=limit, workers=workers)
+
+
+@cli.command('export-bundle')
+@click.option('--output', type=click.Path(dir_okay=False), default=None,
+              help='出力するバンドル（未指定の場合はconfig.yamlのoutput.bundle_file）')
+def export_bundle(output):
+    """全クラスのJSONを1つのJSONLバンドルと索引にまとめる"""
+    scraper = BakinDocumentationScraper()
+
+    if not scraper.progress_manager.exists():
+        click.echo("Progress file not found. Run 'scrape' to initialize.")
+        return
+
+    count = scraper.export_bundle(Path(output) if output else None)
+    click.echo(f"{count} クラスをバンドルに保存しました")
+
+
+@cli.command('pack-cache')
+@click.option('--source', type=click.Path(file_okay=False), default='html', help='コピー元のキャッシュディレクトリ')
+@click.option('--output', type=click.Path(dir_okay=False), default=None,
+              help='出力するパックファイル（未指定の場合はconfig.yamlのcache.pack_file）')
+def pack_cache(source, output):
+    """html/ のキャッシュを1つのパックファイルにまとめる"""
+    scraper = BakinDocumentationScraper()
+    pack_path = Path(output or scraper.config.get('cache', {}).get('pack_file', 'html.pack'))
+
+    pack = PackPageCache(pack_path)
+    try:
+        count = copy_page_cache(FilePageCache(Path(source)), pack, scraper.scraper.base_url)
+    finally:
+        pack.close()
+
+    click.echo(f"{count} ページを {pack_path} に保存しました")
+    click.echo("使用するには config.yaml の cache.backend を 'pack' に設定してください")
+
+
 @cli.command()
 @click.argument('class_name')
 def scrape_class(class_name):
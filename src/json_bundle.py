@@ -0,0 +1,70 @@
+"""
+JSONLバンドル読み込みモジュール
+
+JsonGenerator.export_bundleで保存したバンドルをメモリマップし、索引で引いた
+クラスの行だけをデコードする。必要なクラスが一部だけの場合に、クラスごとの
+ファイルを開いて読み込むより速い。
+"""
+import json
+import mmap
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from src.json_generator import bundle_index_path
+except ModuleNotFoundError:
+    from json_generator import bundle_index_path
+
+
+class JsonBundle:
+    """JSONLバンドルのリーダー（with文で使うか、使い終わったらcloseを呼ぶこと）"""
+
+    def __init__(self, bundle_path: Path):
+        """
+        Args:
+            bundle_path: バンドルのパス（索引はbundle_index_pathのパスから読み込む）
+        """
+        self.bundle_path = Path(bundle_path)
+        with open(bundle_index_path(self.bundle_path), 'r', encoding='utf-8') as f:
+            self.index: Dict[str, List[int]] = json.load(f)
+
+        self._file = open(self.bundle_path, 'rb')
+        # 空のファイルはメモリマップできない
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.index else None
+
+    def get(self, full_name: str) -> Optional[dict]:
+        """
+        クラスのJSONを読み込む
+
+        Args:
+            full_name: クラスの完全修飾名
+
+        Returns:
+            JsonGenerator.generate_class_jsonの形式の辞書、バンドルにない場合はNone
+        """
+        position = self.index.get(full_name)
+        if position is None:
+            return None
+        offset, length = position
+        return json.loads(self._map[offset:offset + length])
+
+    def names(self) -> Iterator[str]:
+        """バンドル内のクラスの完全修飾名（バンドル内の順）"""
+        return iter(self.index)
+
+    def __contains__(self, full_name: str) -> bool:
+        return full_name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'JsonBundle':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -2,23 +2,90 @@
 JSON生成モジュール
 
 クラス詳細情報をJSON形式に変換し、ファイルに保存する責務を持つ。
+
+クラスごとのファイルのほかに、全クラスを1行1クラスのコンパクトなJSONLにまとめたバンドルと、
+完全修飾名からバンドル内のバイト位置を引く索引も出力できる（読み込みは src.json_bundle を参照）。
+
+エンコードにはorjsonがインストールされていればそれを使い、なければ標準ライブラリのjsonを使う。
+どちらも同じバイト列を出力する。
 """
 import json
 import logging
+import os
 from pathlib import Path
 from dataclasses import asdict
+from typing import Iterable, Optional
 
 try:
     from src.parser import ClassDetail
+    from src.output_writer import OutputWriter
+    from src.render_model import ClassRenderModel
 except ModuleNotFoundError:
     from parser import ClassDetail
+    from output_writer import OutputWriter
+    from render_model import ClassRenderModel
 
 logger = logging.getLogger(__name__)
 
+# エンコーダーのバックエンド（autoはorjsonがあればorjson、なければjson）
+JSON_BACKENDS = ('auto', 'orjson', 'json')
+
+
+class JsonEncoder:
+    """JSONをUTF-8のバイト列にエンコードするクラス（整形あり: インデント2、コンパクト: 空白なし）"""
+
+    def __init__(self, backend: str = 'auto', compact: bool = False):
+        """
+        Args:
+            backend: 'auto'、'orjson'、'json'（標準ライブラリ）のいずれか
+            compact: 既定でコンパクトな形式にするか
+        """
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        self.compact = compact
+        self._orjson = None
+        if backend != 'json':
+            try:
+                import orjson
+                self._orjson = orjson
+            except ModuleNotFoundError:
+                if backend == 'orjson':
+                    raise
+        self.backend = 'orjson' if self._orjson is not None else 'json'
+
+    def encode(self, data, compact: Optional[bool] = None) -> bytes:
+        """
+        JSONにエンコード
+
+        Args:
+            data: エンコードするオブジェクト
+            compact: コンパクトな形式にするか（Noneの場合は既定の形式）
+
+        Returns:
+            UTF-8のバイト列
+        """
+        if compact is None:
+            compact = self.compact
+        if self._orjson is not None:
+            return self._orjson.dumps(data) if compact else self._orjson.dumps(data, option=self._orjson.OPT_INDENT_2)
+        if compact:
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
 
 class JsonGenerator:
     """クラス情報をJSON形式で出力するクラス"""
 
+    def __init__(self, writer: Optional[OutputWriter] = None, compact: bool = False, backend: str = 'auto'):
+        """
+        Args:
+            writer: ファイルの書き込みに使う出力ライター（Noneの場合は常に上書きする）
+            compact: クラスごとのJSONを空白なしのコンパクトな形式で保存するか（Falseの場合はインデント2）
+            backend: JSONエンコーダーのバックエンド（JSON_BACKENDSを参照）
+        """
+        self.writer = writer
+        self.encoder = JsonEncoder(backend, compact)
+
     def generate_class_json(self, detail: ClassDetail) -> dict:
         """
         クラス詳細情報をJSON形式に変換
@@ -29,53 +96,40 @@ class JsonGenerator:
         Returns:
             JSON形式の辞書
         """
-        # ClassDetailをdictに変換
-        data = {
-            'class_info': {
-                'name': detail.info.name,
-                'full_name': detail.info.full_name,
-                'url': detail.info.url,
-                'type': detail.info.type,
-                'namespace': detail.info.namespace,
-                'description': detail.info.description,
-                'document_url': f"https://rpgbakin.com/csreference/doc/ja/{detail.info.url}"
-            },
-            'description_full': detail.description_full,
-            'inherits_from': detail.inherits_from,
-            'methods': self._format_methods(detail.methods),
-            'properties': detail.properties,
-            'fields': detail.fields
-        }
+        return self.render_class_json(ClassRenderModel.from_detail(detail))
 
-        return data
-
-    def _format_methods(self, methods: list) -> list:
+    def render_class_json(self, model: ClassRenderModel) -> dict:
         """
-        メソッドリストを整形（静的/インスタンスで分類）
+        描画モデルをJSON形式に変換（メンバーの辞書はモデルのものをそのまま使う）
 
         Args:
-            methods: メソッドのリスト
+            model: ClassRenderModel
 
         Returns:
-            分類されたメソッドリスト
+            JSON形式の辞書
         """
-        formatted = {
-            'instance_methods': [],
-            'static_methods': []
+        info = model.info
+        return {
+            'class_info': {
+                'name': info.name,
+                'full_name': info.full_name,
+                'url': info.url,
+                'type': info.type,
+                'namespace': info.namespace,
+                'description': info.description,
+                'document_url': model.document_url
+            },
+            'description_full': model.description_full,
+            'inherits_from': model.inherits_from,
+            # フラットなリストではなく、静的/インスタンスで分類された形で出力
+            'methods': {
+                'instance_methods': model.instance_methods,
+                'static_methods': model.static_methods
+            },
+            'properties': model.properties,
+            'fields': model.fields
         }
 
-        for method in methods:
-            # anchor_idは内部処理用なのでJSON出力からは除外
-            cleaned_method = {k: v for k, v in method.items() if k != 'anchor_id'}
-
-            if method.get('is_static', False):
-                formatted['static_methods'].append(cleaned_method)
-            else:
-                formatted['instance_methods'].append(cleaned_method)
-
-        # フラットなリストではなく、分類された形で返す
-        return formatted
-
     def save_json(self, data: dict, filepath: Path):
         """
         JSON形式でファイルに保存
@@ -84,12 +138,57 @@ class JsonGenerator:
             data: JSON形式の辞書
             filepath: 保存先パス
         """
+        content = self.encoder.encode(data)
+        if self.writer is not None:
+            self.writer.write_bytes(filepath, content)
+            return
+
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(content)
 
-        logger.info(f"Saved JSON: {filepath}")
+        logger.debug(f"Saved JSON: {filepath}")
+
+    def export_bundle(self, records: Iterable[dict], bundle_path: Path) -> int:
+        """
+        JSON形式の辞書を1行1クラスのJSONLバンドルと、そのバイト位置の索引として保存
+
+        索引（bundle_index_pathのパス）は 完全修飾名 → [バイト位置, バイト長（改行を含まない）] の辞書。
+        どちらも一時ファイルに書いてから置き換える。
+
+        Args:
+            records: generate_class_jsonで変換した辞書のイテラブル（この順にバンドルに並ぶ）
+            bundle_path: バンドルの保存先パス
+
+        Returns:
+            保存したクラス数
+        """
+        bundle_path = Path(bundle_path)
+        index_path = bundle_index_path(bundle_path)
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+
+        index = {}
+        offset = 0
+        tmp_bundle = bundle_path.with_name(bundle_path.name + '.tmp')
+        with open(tmp_bundle, 'wb') as f:
+            for data in records:
+                line = self.encoder.encode(data, compact=True)
+                f.write(line)
+                f.write(b'\n')
+                index[data['class_info']['full_name']] = [offset, len(line)]
+                offset += len(line) + 1
+
+        tmp_index = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_index, 'wb') as f:
+            f.write(self.encoder.encode(index, compact=True))
+
+        # 索引が指すバンドルを先に置き換える
+        os.replace(tmp_bundle, bundle_path)
+        os.replace(tmp_index, index_path)
+
+        logger.info(f"Saved JSON bundle: {bundle_path} ({len(index)} classes, {offset} bytes)")
+        return len(index)
 
     def save_class_json(self, detail: ClassDetail, filepath: Path):
         """
@@ -101,3 +200,17 @@ class JsonGenerator:
         """
         data = self.generate_class_json(detail)
         self.save_json(data, filepath)
+
+
+def bundle_index_path(bundle_path: Path) -> Path:
+    """
+    バンドルの索引ファイルのパス
+
+    Args:
+        bundle_path: バンドルのパス（例: output/reference.jsonl）
+
+    Returns:
+        索引のパス（例: output/reference.index.json）
+    """
+    bundle_path = Path(bundle_path)
+    return bundle_path.with_name(f"{bundle_path.stem}.index.json")
@@ -0,0 +1,329 @@
+"""
+lxmlバックエンドのHTMLパーサーモジュール
+
+BeautifulSoup（html.parser）を介さず、lxmlのツリーに対してコンパイル済みXPathで
+抽出を行う。抽出結果はBakinParserと同一になるよう、BeautifulSoupの検索・テキスト取得の
+挙動（class属性のトークン一致、get_text(strip=True)など）に合わせている。
+"""
+import logging
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree, html as lxml_html
+
+try:
+    from src.parser import BakinParser, ClassDetail, ClassInfo
+except ModuleNotFoundError:
+    from parser import BakinParser, ClassDetail, ClassInfo
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name: str) -> str:
+    """class属性にトークンとしてnameを含むかのXPath条件（BeautifulSoupのclass_=と同じ判定）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# annotated.html
+_DIRECTORY = etree.XPath(f"(//div[{_has_class('directory')}])[1]")
+_DIRECTORY_LINKS = etree.XPath(".//a[@href]")
+_NEXT_TD = etree.XPath("following-sibling::td[1]")
+
+# クラスページ
+_TEXTBLOCK = etree.XPath(f"(//div[{_has_class('textblock')}])[1]")
+_INHERIT_HEADER = etree.XPath(f"(//div[{_has_class('inherit_header')}])[1]")
+_LINKS = etree.XPath(".//a")
+_EL_LINKS = etree.XPath(f".//a[{_has_class('el')}]")
+_H2 = etree.XPath("//h2")
+_TITLE = etree.XPath("(//title)[1]")
+_ANCHOR_BY_ID = etree.XPath("(//a[@id=$anchor_id])[1]")
+_ANCHORS_AND_MEMDOCS = etree.XPath(f"//a[@id] | //div[{_has_class('memdoc')}]")
+_SECTION_TABLE = etree.XPath(f"ancestor::h2[1]/ancestor::table[{_has_class('memberdecls')}][1]")
+_SECTION_HEADING = etree.XPath("ancestor::h2[1]")
+_MEMBERDECLS = etree.XPath(f"//table[{_has_class('memberdecls')}]")
+_HEADING_ANCHOR = etree.XPath("(.//h2)[1]//a[@id]")
+_MEMBER_ROWS = etree.XPath(".//tr[contains(concat(' ', normalize-space(@class)), ' memitem:')]")
+_ITEM_LEFT = etree.XPath(f"(.//td[{_has_class('memItemLeft')}])[1]")
+_ITEM_RIGHT = etree.XPath(f"(.//td[{_has_class('memItemRight')}])[1]")
+_FIRST_EL_LINK = etree.XPath(f"(.//a[{_has_class('el')}])[1]")
+_PARAGRAPHS = etree.XPath(".//p")
+
+_INHERITANCE_PATTERN = re.compile('継承図|Inheritance')
+
+
+# BeautifulSoupのget_textがテキストに含めない要素（中身はスクリプトなどで本文ではない）
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+
+def _get_text(element, separator: str = '') -> str:
+    """BeautifulSoupのget_text(separator, strip=True)と同じ規則でテキストを取得"""
+    return separator.join(s for s in (t.strip() for t in _iter_text(element)) if s)
+
+
+def _iter_text(element):
+    """itertextと同様に子孫のテキストを文書順に返す（_NON_TEXT_TAGSの要素とコメントの中身は除く）"""
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+
+def _single_string(element) -> Optional[str]:
+    """BeautifulSoupのTag.stringと同じ規則で、子が1つだけの場合にその文字列を返す"""
+    children = list(element)
+    text = element.text
+    if not children:
+        return text
+    if len(children) == 1 and not text and not children[0].tail and isinstance(children[0].tag, str):
+        return _single_string(children[0])
+    return None
+
+
+def _next_sibling_element(element):
+    """コメント等を除いた次の兄弟要素"""
+    sibling = element.getnext()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext()
+    return sibling
+
+
+def _first(xpath, element, **variables):
+    """XPathの最初の結果（なければNone）"""
+    result = xpath(element, **variables)
+    return result[0] if result else None
+
+
+class LxmlBakinParser(BakinParser):
+    """lxmlで直接抽出するBakinドキュメント用HTMLパーサー"""
+
+    BACKEND = 'lxml'
+
+    def _parse_document(self, content: bytes, encoding: Optional[str]):
+        """
+        HTMLのバイト列をlxmlのツリーに変換
+
+        空のページ（要素を含まないページ）はhtml.parserと同じく空の文書として扱い、
+        空の抽出結果になるようにする（lxmlはParserErrorを送出する）。
+        """
+        parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+        try:
+            return lxml_html.document_fromstring(content, parser=parser)
+        except etree.ParserError:
+            return lxml_html.Element('html')
+
+    def parse_annotated_content(self, content: bytes, encoding: Optional[str] = None) -> List[ClassInfo]:
+        """
+        HTMLのバイト列からannotated.htmlの全クラスリストを抽出
+
+        Args:
+            content: annotated.htmlのHTML（バイト列）
+            encoding: HTMLのエンコーディング（Noneの場合は<meta>宣言などから判定）
+
+        Returns:
+            ClassInfoオブジェクトのリスト
+        """
+        root = self._parse_document(content, encoding)
+        classes = []
+
+        directory_div = _first(_DIRECTORY, root)
+        if directory_div is None:
+            logger.warning("Could not find directory div in annotated page")
+            return classes
+
+        for link in _DIRECTORY_LINKS(directory_div):
+            href = link.get('href')
+            if not self._is_class_href(href):
+                continue
+
+            description = ""
+            parent = link.getparent()
+            if parent is not None and parent.tag == 'td':
+                desc_td = _first(_NEXT_TD, parent)
+                if desc_td is not None:
+                    description = _get_text(desc_td)
+
+            class_info = self._build_class_info(href, _get_text(link), description)
+            classes.append(class_info)
+            logger.debug(f"Found {class_info.type}: {class_info.full_name}")
+
+        logger.info(f"Extracted {len(classes)} classes from annotated page")
+        return classes
+
+    def _parse_class_content(self, content: bytes, class_info: ClassInfo,
+                             encoding: Optional[str] = None) -> ClassDetail:
+        """
+        HTMLのバイト列から個別クラスページの詳細情報を抽出（キャッシュは使わない）
+
+        Args:
+            content: クラスページのHTML（バイト列）
+            class_info: 基本クラス情報
+            encoding: HTMLのエンコーディング（Noneの場合は<meta>宣言などから判定）
+
+        Returns:
+            ClassDetailオブジェクト
+        """
+        root = self._parse_document(content, encoding)
+        detail = ClassDetail(info=class_info)
+        memdocs = self._build_memdoc_index_lxml(root)
+
+        textblock = _first(_TEXTBLOCK, root)
+        detail.description_full = _get_text(textblock) if textblock is not None else ""
+        detail.inherits_from = self._extract_inheritance_lxml(root)
+
+        if self.single_pass:
+            rows_by_section = self._collect_section_rows(root)
+        else:
+            rows_by_section = {section_id: self._section_rows(root, section_id)
+                               for section_id, _, _ in self.MEMBER_SECTIONS}
+        detail.methods, detail.properties, detail.fields = self._dispatch_member_rows(rows_by_section, memdocs)
+        detail.raw_signatures = self._take_raw_signatures(detail.methods)
+
+        return detail
+
+    def _extract_inheritance_lxml(self, root) -> List[str]:
+        """継承関係を抽出"""
+        inherits = []
+
+        inherit_list = _first(_INHERIT_HEADER, root)
+        if inherit_list is not None:
+            for link in _LINKS(inherit_list):
+                inherits.append(_get_text(link))
+
+        for heading in _H2(root):
+            string = _single_string(heading)
+            if string is None or not _INHERITANCE_PATTERN.search(string):
+                continue
+            next_elem = _next_sibling_element(heading)
+            if next_elem is not None:
+                title = _first(_TITLE, root)
+                title_text = _get_text(title) if title is not None else ""
+                for link in _EL_LINKS(next_elem):
+                    parent = _get_text(link)
+                    if parent != title_text:  # 自分自身は除外
+                        inherits.append(parent)
+            break
+
+        return inherits
+
+    @staticmethod
+    def _build_memdoc_index_lxml(root) -> Dict[str, object]:
+        """アンカーID → 直後のmemdoc要素の索引を1回の走査で構築（BakinParser._build_memdoc_indexと同じ対応付け）"""
+        index = {}
+        seen = set()
+        pending = []
+        for element in _ANCHORS_AND_MEMDOCS(root):
+            if element.tag == 'div':
+                for anchor_id in pending:
+                    index[anchor_id] = element
+                pending = []
+            elif element.get('id') not in seen:
+                seen.add(element.get('id'))
+                pending.append(element.get('id'))
+        return index
+
+    @staticmethod
+    def _lookup_description_lxml(memdocs: Dict[str, object], link) -> Optional[str]:
+        """メンバー名リンクのアンカーから詳細説明のテキストを取得"""
+        href = link.get('href') if link is not None else None
+        if not href or '#' not in href:
+            return None
+        desc_div = memdocs.get(href.split('#')[1])
+        if desc_div is None:
+            return None
+        textblocks = _PARAGRAPHS(desc_div)
+        if not textblocks:
+            return None
+        return ' '.join(_get_text(p) for p in textblocks)
+
+    def _collect_section_rows(self, root) -> Dict[str, list]:
+        """memberdeclsテーブルを1回だけ走査し、見出しのセクションIDごとにメンバー行を振り分ける"""
+        known_sections = {section_id for section_id, _, _ in self.MEMBER_SECTIONS}
+        rows_by_section = {}
+
+        for table in _MEMBERDECLS(root):
+            section_anchor = _first(_HEADING_ANCHOR, table)
+            if section_anchor is None:
+                continue
+            section_id = section_anchor.get('id')
+            if section_id not in known_sections or section_id in rows_by_section:
+                continue
+            rows_by_section[section_id] = _MEMBER_ROWS(table)
+
+        return rows_by_section
+
+    def _section_rows(self, root, section_id: str) -> list:
+        """セクションアンカーを含むmemberdeclsテーブルのメンバー行"""
+        anchor = _first(_ANCHOR_BY_ID, root, anchor_id=section_id)
+        if anchor is None or _first(_SECTION_HEADING, anchor) is None:
+            return []
+        table = _first(_SECTION_TABLE, anchor)
+        if table is None:
+            return []
+        return _MEMBER_ROWS(table)
+
+    def _parse_method_row(self, row, memdocs: Dict[str, object], is_static: bool) -> Optional[Dict]:
+        """メソッド行をパース"""
+        return_type_cell = _first(_ITEM_LEFT, row)
+        name_cell = _first(_ITEM_RIGHT, row)
+        if name_cell is None:
+            return None
+
+        method_link = _first(_FIRST_EL_LINK, name_cell)
+        method = self._build_method(
+            _get_text(return_type_cell) if return_type_cell is not None else None,
+            _get_text(name_cell, ' '),
+            _get_text(method_link) if method_link is not None else None,
+            is_static
+        )
+
+        if method_link is not None:
+            description = self._lookup_description_lxml(memdocs, method_link)
+            if description is not None:
+                method['description'] = description
+
+        return method
+
+    def _parse_property_row(self, row, memdocs: Dict[str, object], is_static: bool) -> Optional[Dict]:
+        """プロパティ行をパース"""
+        type_cell = _first(_ITEM_LEFT, row)
+        name_cell = _first(_ITEM_RIGHT, row)
+        if name_cell is None:
+            return None
+
+        prop_link = _first(_FIRST_EL_LINK, name_cell)
+        prop = self._build_property(
+            _get_text(type_cell) if type_cell is not None else None,
+            _get_text(name_cell, ' '),
+            _get_text(prop_link) if prop_link is not None else None,
+            is_static
+        )
+
+        description = self._lookup_description_lxml(memdocs, prop_link)
+        if description is not None:
+            prop['description'] = description
+
+        return prop
+
+    def _parse_field_row(self, row, memdocs: Dict[str, object]) -> Optional[Dict]:
+        """フィールド行をパース"""
+        type_cell = _first(_ITEM_LEFT, row)
+        name_cell = _first(_ITEM_RIGHT, row)
+        if name_cell is None:
+            return None
+
+        field_link = _first(_FIRST_EL_LINK, name_cell)
+        field = self._build_field(
+            _get_text(type_cell) if type_cell is not None else None,
+            _get_text(name_cell, ' '),
+            _get_text(field_link) if field_link is not None else None,
+            _get_text(name_cell)
+        )
+
+        description = self._lookup_description_lxml(memdocs, field_link)
+        if description is not None:
+            field['description'] = description
+
+        return field
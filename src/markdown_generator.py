@@ -2,13 +2,19 @@
 Markdown生成モジュール
 """
 import logging
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 
 try:
     from src.parser import ClassInfo, ClassDetail
+    from src.output_writer import OutputWriter
+    from src.render_model import ClassRenderModel
+    from src.namespace_index import NamespaceIndex
 except ModuleNotFoundError:
     from parser import ClassInfo, ClassDetail
+    from output_writer import OutputWriter
+    from render_model import ClassRenderModel
+    from namespace_index import NamespaceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,13 @@ logger = logging.getLogger(__name__)
 class MarkdownGenerator:
     """クラス情報をMarkdownに変換"""
 
+    def __init__(self, writer: Optional[OutputWriter] = None):
+        """
+        Args:
+            writer: ファイルの書き込みに使う出力ライター（Noneの場合は常に上書きする）
+        """
+        self.writer = writer
+
     def generate_class_markdown(self, detail: ClassDetail) -> str:
         """
         クラス詳細情報からMarkdownを生成
@@ -23,51 +36,62 @@ class MarkdownGenerator:
         Args:
             detail: ClassDetailオブジェクト
 
+        Returns:
+            Markdownテキスト
+        """
+        return self.render_class_markdown(ClassRenderModel.from_detail(detail))
+
+    def render_class_markdown(self, model: ClassRenderModel) -> str:
+        """
+        描画モデルからMarkdownを生成
+
+        Args:
+            model: ClassRenderModel（メンバーは静的/インスタンスに振り分け済み）
+
         Returns:
             Markdownテキスト
         """
         lines = []
+        info = model.info
 
         # ヘッダー
-        lines.append(f"# {detail.info.full_name}")
+        lines.append(f"# {info.full_name}")
         lines.append("")
 
         # メタ情報
         lines.append("## メタ情報")
         lines.append("")
-        lines.append(f"- **型**: {detail.info.type}")
-        lines.append(f"- **名前空間**: {detail.info.namespace}")
-        lines.append(f"- **完全修飾名**: {detail.info.full_name}")
-        if detail.info.url:
-            lines.append(f"- **ドキュメントURL**: https://rpgbakin.com/csreference/doc/ja/{detail.info.url}")
+        lines.append(f"- **型**: {info.type}")
+        lines.append(f"- **名前空間**: {info.namespace}")
+        lines.append(f"- **完全修飾名**: {info.full_name}")
+        if info.url:
+            lines.append(f"- **ドキュメントURL**: {model.document_url}")
         lines.append("")
 
         # 説明
-        if detail.description_full:
+        if model.description_full:
             lines.append("## 説明")
             lines.append("")
-            lines.append(detail.description_full)
+            lines.append(model.description_full)
             lines.append("")
 
         # 継承関係
-        if detail.inherits_from:
+        if model.inherits_from:
             lines.append("## 継承関係")
             lines.append("")
             lines.append("このクラスは以下のクラスを継承しています：")
             lines.append("")
-            for parent in detail.inherits_from:
+            for parent in model.inherits_from:
                 lines.append(f"- `{parent}`")
             lines.append("")
 
         # プロパティ
-        if detail.properties:
+        static_props = model.static_properties
+        instance_props = model.instance_properties
+        if static_props or instance_props:
             lines.append("## プロパティ")
             lines.append("")
 
-            # 静的/非静的プロパティを分離
-            static_props = [p for p in detail.properties if p.get('is_static', False)]
-            instance_props = [p for p in detail.properties if not p.get('is_static', False)]
-
             if instance_props:
                 for prop in instance_props:
                     lines.append(f"### {prop['name']}")
@@ -103,17 +127,17 @@ class MarkdownGenerator:
                         lines.append("")
                     else:
                         lines.append(f"- **型**: `{prop.get('type', 'unknown')}`")
+                    if 'description' in prop:
+                        lines.append(f"- **説明**: {prop['description']}")
                     lines.append("")
 
         # メソッド
-        if detail.methods:
+        static_methods = model.static_methods
+        instance_methods = model.instance_methods
+        if static_methods or instance_methods:
             lines.append("## メソッド")
             lines.append("")
 
-            # 静的/非静的メソッドを分離
-            static_methods = [m for m in detail.methods if m.get('is_static', False)]
-            instance_methods = [m for m in detail.methods if not m.get('is_static', False)]
-
             if instance_methods:
                 for method in instance_methods:
                     lines.append(f"### {method.get('name', 'unknown')}")
@@ -133,6 +157,8 @@ class MarkdownGenerator:
                         lines.append(f"**戻り値**: `{method['return_type']}`")
                         lines.append("")
 
+                    self._append_parameters(lines, method)
+
                     if 'description' in method:
                         lines.append(method['description'])
                         lines.append("")
@@ -162,6 +188,8 @@ class MarkdownGenerator:
                         lines.append("```")
                         lines.append("")
 
+                    self._append_parameters(lines, method)
+
                     if 'description' in method:
                         lines.append(method['description'])
                         lines.append("")
@@ -170,92 +198,60 @@ class MarkdownGenerator:
                     lines.append("")
 
         # フィールド
-        if detail.fields:
+        if model.fields:
             lines.append("## 公開フィールド")
             lines.append("")
 
-            for field in detail.fields:
+            for field in model.fields:
                 if 'declaration' in field:
                     # フィールドの完全な宣言を表示
-                    lines.append(f"- `{field.get('type', '')} {field['declaration']}`")
+                    line = f"- `{field.get('type', '')} {field['declaration']}`"
                 else:
-                    lines.append(f"- `{field.get('type', 'unknown')} {field['name']}`")
+                    line = f"- `{field.get('type', 'unknown')} {field['name']}`"
+                if 'description' in field:
+                    line += f": {field['description']}"
+                lines.append(line)
 
             lines.append("")
 
         return "\n".join(lines)
 
-    def generate_index_markdown(self, classes: List[ClassInfo]) -> str:
+    def _append_parameters(self, lines: List[str], method: dict):
         """
-        全体の索引Markdownを生成
+        メソッドのパラメータ一覧（パース時に分解済みのparameters）を追加
 
         Args:
-            classes: ClassInfoオブジェクトのリスト
-
-        Returns:
-            索引Markdownテキスト
+            lines: 出力先の行リスト
+            method: メソッド情報の辞書
         """
-        lines = []
+        parameters = method.get('parameters')
+        if not parameters:
+            return
 
-        lines.append("# RPG Developer Bakin C# リファレンス索引")
+        lines.append("**パラメータ**:")
         lines.append("")
-        lines.append("このドキュメントは自動生成されたものです。")
+        for param in parameters:
+            param_type = ' '.join(param.get('modifiers', []) + [param['type']])
+            if param.get('name'):
+                line = f"- `{param['name']}`: `{param_type}`"
+            else:
+                line = f"- `{param_type}`"
+            if param.get('default') is not None:
+                line += f"（既定値: `{param['default']}`）"
+            lines.append(line)
         lines.append("")
 
-        # 名前空間ごとにグループ化
-        namespaces = {}
-        for cls in classes:
-            ns = cls.namespace or "グローバル"
-            if ns not in namespaces:
-                namespaces[ns] = []
-            namespaces[ns].append(cls)
-
-        # 名前空間ごとに出力
-        for ns in sorted(namespaces.keys()):
-            lines.append(f"## {ns}")
-            lines.append("")
-
-            # 型ごとにさらに分類
-            ns_classes = namespaces[ns]
-            classes_by_type = {
-                'class': [],
-                'interface': [],
-                'struct': [],
-                'enum': []
-            }
-
-            for cls in ns_classes:
-                if cls.type in classes_by_type:
-                    classes_by_type[cls.type].append(cls)
-
-            # クラス
-            if classes_by_type['class']:
-                lines.append("### クラス")
-                lines.append("")
-                for cls in sorted(classes_by_type['class'], key=lambda x: x.name):
-                    desc = f" - {cls.description}" if cls.description else ""
-                    lines.append(f"- [{cls.full_name}](classes/{cls.full_name}.md){desc}")
-                lines.append("")
-
-            # インターフェース
-            if classes_by_type['interface']:
-                lines.append("### インターフェース")
-                lines.append("")
-                for cls in sorted(classes_by_type['interface'], key=lambda x: x.name):
-                    desc = f" - {cls.description}" if cls.description else ""
-                    lines.append(f"- [{cls.full_name}](classes/{cls.full_name}.md){desc}")
-                lines.append("")
+    def generate_index_markdown(self, classes: List[ClassInfo]) -> str:
+        """
+        全体の索引Markdownを生成
 
-            # 構造体
-            if classes_by_type['struct']:
-                lines.append("### 構造体")
-                lines.append("")
-                for cls in sorted(classes_by_type['struct'], key=lambda x: x.name):
-                    desc = f" - {cls.description}" if cls.description else ""
-                    lines.append(f"- [{cls.full_name}](classes/{cls.full_name}.md){desc}")
-                lines.append("")
+        Args:
+            classes: ClassInfoオブジェクトのリスト
 
-        return "\n".join(lines)
+        Returns:
+            索引Markdownテキスト
+        """
+        return NamespaceIndex.from_classes(classes).render()
 
     def save_markdown(self, content: str, filepath: Path):
         """
@@ -265,9 +261,13 @@ class MarkdownGenerator:
             content: Markdownテキスト
             filepath: 保存先パス
         """
+        if self.writer is not None:
+            self.writer.write_text(filepath, content)
+            return
+
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
 
-        logger.info(f"Saved markdown: {filepath}")
+        logger.debug(f"Saved markdown: {filepath}")
@@ -0,0 +1,252 @@
+"""
+名前空間索引モジュール
+
+索引（index.md）の元になる、名前空間 → 型 → クラスの木をソート済みの状態で保持し、
+ファイルに保存する。クラスの追加・削除では該当する名前空間の一覧に挿入・削除するだけで、
+索引全体を並べ替え直さない。描画結果は名前空間ごとに保持し、変更のあった名前空間の
+セクションだけを描画し直す。
+
+木の保存時はファイルを読み直し、このインスタンスで変更したクラスだけを反映するため、
+複数のプロセスで分担してスクレイピングしても互いの追加を上書きしない。
+"""
+import bisect
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from src.parser import ClassInfo
+except ModuleNotFoundError:
+    from parser import ClassInfo
+
+logger = logging.getLogger(__name__)
+
+# 索引に載せる型と見出し（この順序で出力する）
+TYPE_SECTIONS = [
+    ('class', 'クラス'),
+    ('interface', 'インターフェース'),
+    ('struct', '構造体'),
+]
+
+# 名前空間がないクラスの見出し
+GLOBAL_NAMESPACE = "グローバル"
+
+# 木の1クラス分のレコード: [名前, 完全修飾名, 説明]（名前、完全修飾名の順にソートされる）
+Record = List[str]
+
+
+class NamespaceIndex:
+    """名前空間ごとにソート済みのクラス一覧を保持し、索引Markdownを描画するクラス"""
+
+    def __init__(self, tree_file: Optional[Path] = None):
+        """
+        Args:
+            tree_file: 木の保存先（Noneの場合は保存しない）
+        """
+        self.tree_file = Path(tree_file) if tree_file else None
+        self._set_tree(self._load_tree())
+        # 前回の保存以降に変更したクラス（完全修飾名 → 名前空間・型・レコード、削除はNone）
+        self._changes: Dict[str, Optional[Tuple[str, str, Record]]] = {}
+
+    @classmethod
+    def from_classes(cls, classes: Iterable[ClassInfo]) -> 'NamespaceIndex':
+        """
+        クラスのリストから索引を作成（保存しない）
+
+        Args:
+            classes: ClassInfoのイテラブル
+
+        Returns:
+            NamespaceIndex
+        """
+        index = cls()
+        for class_info in classes:
+            index.add(class_info)
+        return index
+
+    def exists(self) -> bool:
+        """木のファイルが存在するか"""
+        return self.tree_file is not None and self.tree_file.exists()
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, full_name: str) -> bool:
+        return full_name in self._locations
+
+    def add(self, class_info: ClassInfo) -> bool:
+        """
+        クラスを追加（既にある場合は名前空間・説明などを更新）
+
+        Args:
+            class_info: 追加するクラス
+
+        Returns:
+            変更があった場合はTrue
+        """
+        namespace = class_info.namespace or GLOBAL_NAMESPACE
+        record = [class_info.name, class_info.full_name, class_info.description or ""]
+        if not self._insert(namespace, class_info.type, record):
+            return False
+        self._changes[class_info.full_name] = (namespace, class_info.type, record)
+        return True
+
+    def remove(self, full_name: str) -> bool:
+        """
+        クラスを削除
+
+        Args:
+            full_name: 完全修飾名
+
+        Returns:
+            削除した場合はTrue、索引になかった場合はFalse
+        """
+        if not self._delete(full_name):
+            return False
+        self._changes[full_name] = None
+        return True
+
+    def clear(self):
+        """全てのクラスを削除し、保存済みの木も削除する"""
+        self._set_tree({})
+        self._changes = {}
+        if self.exists():
+            self.tree_file.unlink()
+
+    def save(self):
+        """
+        木をファイルに保存（保存済みの木を読み直し、前回の保存以降の変更だけを反映する）
+
+        他のプロセスが追加したクラスも取り込まれ、描画結果は変わった名前空間だけが破棄される。
+        """
+        if self.tree_file is None:
+            return
+
+        changes, self._changes = self._changes, {}
+        previous = self._tree
+        self._set_tree(self._load_tree(), sections=self._sections)
+        for full_name, change in changes.items():
+            if change is None:
+                self._delete(full_name)
+            else:
+                self._insert(*change)
+        for namespace in set(previous) | set(self._tree):
+            if previous.get(namespace) != self._tree.get(namespace):
+                self._sections.pop(namespace, None)
+
+        self.tree_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.tree_file.with_name(self.tree_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._tree, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.tree_file)
+
+    def render(self, total: Optional[int] = None) -> str:
+        """
+        索引Markdownを描画（変更のなかった名前空間は前回の描画結果を使う）
+
+        Args:
+            total: 全クラス数（指定した場合、索引のクラス数がこれより少なければ取得済みの件数を表示する）
+
+        Returns:
+            索引Markdownテキスト
+        """
+        lines = []
+
+        lines.append("# RPG Developer Bakin C# リファレンス索引")
+        lines.append("")
+        lines.append("このドキュメントは自動生成されたものです。")
+        lines.append("")
+        if total is not None and len(self) < total:
+            lines.append(f"取得済み: {len(self)} / {total} クラス（未取得のクラスは掲載されていません）")
+            lines.append("")
+
+        for namespace in self._order:
+            section = self._sections.get(namespace)
+            if section is None:
+                section = self._sections[namespace] = self._render_section(namespace)
+            lines.append(section)
+
+        return "\n".join(lines)
+
+    def _render_section(self, namespace: str) -> str:
+        """名前空間1つ分のセクションを描画"""
+        lines = [f"## {namespace}", ""]
+        types = self._tree[namespace]
+        for type_name, heading in TYPE_SECTIONS:
+            records = types.get(type_name)
+            if not records:
+                continue
+            lines.append(f"### {heading}")
+            lines.append("")
+            for name, full_name, description in records:
+                desc = f" - {description}" if description else ""
+                lines.append(f"- [{full_name}](classes/{full_name}.md){desc}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _insert(self, namespace: str, type_name: str, record: Record) -> bool:
+        """レコードをソート順の位置に挿入（同じ完全修飾名の古いレコードは削除する）"""
+        full_name = record[1]
+        location = self._locations.get(full_name)
+        if location is not None:
+            old_namespace, old_type = location
+            if (old_namespace, old_type) == (namespace, type_name) and \
+                    self._find(self._tree[namespace][type_name], full_name) == record:
+                return False
+            self._delete(full_name)
+
+        if namespace not in self._tree:
+            self._tree[namespace] = {}
+            bisect.insort(self._order, namespace)
+        bisect.insort(self._tree[namespace].setdefault(type_name, []), record)
+        self._locations[full_name] = (namespace, type_name)
+        self._sections.pop(namespace, None)
+        return True
+
+    def _delete(self, full_name: str) -> bool:
+        """レコードを削除（空になった型・名前空間も削除する）"""
+        location = self._locations.pop(full_name, None)
+        if location is None:
+            return False
+        namespace, type_name = location
+        types = self._tree[namespace]
+        records = types[type_name]
+        records.remove(self._find(records, full_name))
+        if not records:
+            del types[type_name]
+        if not types:
+            del self._tree[namespace]
+            self._order.remove(namespace)
+        self._sections.pop(namespace, None)
+        return True
+
+    @staticmethod
+    def _find(records: List[Record], full_name: str) -> Optional[Record]:
+        for record in records:
+            if record[1] == full_name:
+                return record
+        return None
+
+    def _set_tree(self, tree: Dict[str, Dict[str, List[Record]]], sections: Optional[Dict[str, str]] = None):
+        """木を置き換え、名前空間の順序と完全修飾名の位置を作り直す"""
+        self._tree = tree
+        self._order = sorted(tree)
+        self._locations = {
+            record[1]: (namespace, type_name)
+            for namespace, types in tree.items()
+            for type_name, records in types.items()
+            for record in records
+        }
+        self._sections = sections if sections is not None else {}
+
+    def _load_tree(self) -> Dict[str, Dict[str, List[Record]]]:
+        if not self.exists():
+            return {}
+        try:
+            with open(self.tree_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable index tree {self.tree_file}: {e}")
+            return {}
@@ -0,0 +1,233 @@
+"""
+出力ファイル書き込みモジュール
+
+Markdown/JSONの出力ファイルを、内容のハッシュを記録したマニフェストと比較して
+変更のあったものだけ書き込む。rebuildで内容が変わらないファイルに触れないため、
+同期ツールや更新日時を見るキャッシュを無駄に無効化しない。
+
+書き込みは同じディレクトリの一時ファイルに書いてから置き換えるため、途中で
+中断しても書きかけのファイルが残らない。ディスクへの同期（fsync）はファイルごとに
+待たず、flushでまとめて行う。マニフェストは同期の後に更新するので、同期前に
+クラッシュしたファイルはマニフェストと一致せず、次回に書き直される。
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class OutputWriter:
+    """内容が変わったファイルだけをアトミックに書き込むライター"""
+
+    def __init__(self, manifest_file: Optional[Path] = None, fsync: bool = True):
+        """
+        Args:
+            manifest_file: 書き込んだ内容のハッシュを記録するマニフェスト（Noneの場合は比較せず常に書き込む）
+            fsync: flush時に書き込んだファイルをディスクに同期するか
+        """
+        self.manifest_file = Path(manifest_file) if manifest_file else None
+        self.fsync = fsync
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+        self._manifest = self._load_manifest()
+        # このセッションで更新・削除したエントリー（flushでディスク上のマニフェストに反映する）
+        self._updated: Dict[str, dict] = {}
+        self._deleted: Set[str] = set()
+        # 同期待ちのファイル
+        self._unsynced: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def write_text(self, path: Path, content: str) -> bool:
+        """
+        テキストファイルを書き込む（前回書き込んだ内容と同じ場合は何もしない）
+
+        Args:
+            path: 書き込み先
+            content: ファイルの内容（UTF-8で書き込む）
+
+        Returns:
+            書き込んだ場合はTrue、内容が同じため省略した場合はFalse
+        """
+        return self.write_bytes(path, content.encode('utf-8'))
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """
+        バイナリファイルを書き込む（前回書き込んだ内容と同じ場合は何もしない）
+
+        Args:
+            path: 書き込み先
+            data: ファイルの内容
+
+        Returns:
+            書き込んだ場合はTrue、内容が同じため省略した場合はFalse
+        """
+        path = Path(path)
+        key = self._key(path)
+        entry = {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+
+        with self._lock:
+            if self._manifest.get(key) == entry and self._has_size(path, entry['size']):
+                self.unchanged += 1
+                logger.debug(f"Unchanged: {path}")
+                return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self.written += 1
+            if self.manifest_file is not None:
+                self._manifest[key] = entry
+                self._updated[key] = entry
+                self._deleted.discard(key)
+            self._unsynced.add(path)
+        logger.debug(f"Saved: {path}")
+        return True
+
+    def remove(self, path: Path) -> bool:
+        """
+        ファイルを削除し、マニフェストからも除く
+
+        Args:
+            path: 削除するファイル
+
+        Returns:
+            削除した場合はTrue、存在しなかった場合はFalse
+        """
+        path = Path(path)
+        key = self._key(path)
+        with self._lock:
+            if self.manifest_file is not None:
+                self._manifest.pop(key, None)
+                self._updated.pop(key, None)
+                self._deleted.add(key)
+            self._unsynced.discard(path)
+
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self.removed += 1
+        logger.info(f"Removed: {path}")
+        return True
+
+    def flush(self):
+        """
+        書き込んだファイルをまとめてディスクに同期し、マニフェストを保存する
+
+        マニフェストは保存直前にディスクから読み直し、このセッションで変更したエントリーだけを
+        反映する（同じ出力先に書き込む他のプロセスの記録を上書きしないため）。
+        """
+        with self._lock:
+            unsynced, self._unsynced = self._unsynced, set()
+            updated, self._updated = self._updated, {}
+            deleted, self._deleted = self._deleted, set()
+
+        if self.fsync and unsynced:
+            for path in unsynced:
+                self._fsync_file(path)
+            for directory in {path.parent for path in unsynced}:
+                self._fsync_directory(directory)
+
+        if self.manifest_file is not None and (updated or deleted):
+            manifest = self._load_manifest()
+            manifest.update(updated)
+            for key in deleted:
+                manifest.pop(key, None)
+            self._save_manifest(manifest)
+
+        if self.written or self.unchanged or self.removed:
+            logger.info(f"Output files: {self.written} written, {self.unchanged} unchanged, "
+                        f"{self.removed} removed")
+
+    def _key(self, path: Path) -> str:
+        """マニフェストのキー（マニフェストのディレクトリからの相対パス）"""
+        base = self.manifest_file.parent if self.manifest_file is not None else Path('.')
+        return Path(os.path.relpath(os.path.abspath(path), os.path.abspath(base))).as_posix()
+
+    @staticmethod
+    def _has_size(path: Path, size: int) -> bool:
+        """ファイルが存在し、サイズが一致するか（マニフェストの記録後に変更・削除されていないかの簡易確認）"""
+        try:
+            return path.stat().st_size == size
+        except OSError:
+            return False
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        if self.manifest_file is None or not self.manifest_file.exists():
+            return {}
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable output manifest {self.manifest_file}: {e}")
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, dict]):
+        """マニフェストを一時ファイルに書いてから置き換える"""
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.manifest_file)
+        if self.fsync:
+            self._fsync_directory(self.manifest_file.parent)
+
+    @staticmethod
+    def _fsync_file(path: Path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _fsync_directory(directory: Path):
+        """ディレクトリの同期（置き換えたファイル名を永続化する。対応していないOSでは何もしない）"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def create_output_writer(config: dict) -> OutputWriter:
+    """
+    設定に応じた出力ライターを生成
+
+    Args:
+        config: config.yaml全体の辞書（output.manifest, output.fsyncを参照）
+
+    Returns:
+        OutputWriter
+    """
+    output_config = config.get('output', {})
+    manifest = output_config.get('manifest')
+    return OutputWriter(Path(manifest) if manifest else None, fsync=output_config.get('fsync', True))
@@ -0,0 +1,498 @@
+"""
+ページキャッシュモジュール
+
+取得したHTMLページをバイト列のまま保存・読み込みする。以下の2つのバックエンドを持つ。
+
+- FilePageCache: html/ ディレクトリにページごとのファイルとサイドカー（*.meta.json）を保存
+- PackPageCache: 全ページを圧縮して1つのパックファイルに追記し、mmapしたハッシュ索引で引く
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RawPage:
+    """取得したページのバイト列とエンコーディング"""
+    content: bytes               # レスポンスのバイト列（上流のマークアップそのまま）
+    encoding: Optional[str] = None  # HTTPヘッダーで明示されたエンコーディング（不明な場合はNone）
+
+
+class FilePageCache:
+    """html/ ディレクトリにページごとのファイルとして保存するキャッシュ"""
+
+    def __init__(self, cache_dir: Path = Path("html")):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def get_path(self, url: str) -> Path:
+        """
+        URLに対応するキャッシュファイルのパスを取得（URLの最後のパス要素がファイル名になる）
+
+        Args:
+            url: ページのURL（相対パスまたは絶対パス）
+
+        Returns:
+            キャッシュファイルのパス
+        """
+        filename = url.split('/')[-1] if '/' in url else url
+        return self.cache_dir / filename
+
+    def exists(self, url: str) -> bool:
+        """キャッシュが存在するか"""
+        return self.get_path(url).exists()
+
+    def get(self, url: str) -> Optional[RawPage]:
+        """
+        キャッシュ済みページを読み込む
+
+        Args:
+            url: ページのURL
+
+        Returns:
+            RawPage、キャッシュがない場合はNone
+        """
+        cache_file = self.get_path(url)
+        if not cache_file.exists():
+            return None
+        # 旧形式のキャッシュ（サイドカーなし）はエンコーディングをパーサーに判定させる
+        encoding = self.get_validators(url).get('encoding')
+        return RawPage(content=cache_file.read_bytes(), encoding=encoding)
+
+    def put(self, url: str, page: RawPage, validators: dict):
+        """
+        ページとバリデータを保存
+
+        Args:
+            url: ページのURL
+            page: 保存するページ
+            validators: バリデータ（ETag, Last-Modified, 取得時刻など）
+        """
+        cache_file = self.get_path(url)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(page.content)
+        self.update_validators(url, dict(validators, encoding=page.encoding))
+
+    def get_validators(self, url: str) -> dict:
+        """
+        バリデータを読み込む
+
+        Args:
+            url: ページのURL
+
+        Returns:
+            バリデータの辞書（サイドカーがない場合は空の辞書）
+        """
+        meta_file = self._get_meta_path(self.get_path(url))
+        if not meta_file.exists():
+            return {}
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def update_validators(self, url: str, validators: dict):
+        """
+        バリデータのみを更新（304 Not Modified時など）
+
+        Args:
+            url: ページのURL
+            validators: バリデータ
+        """
+        with open(self._get_meta_path(self.get_path(url)), 'w', encoding='utf-8') as f:
+            json.dump(validators, f, ensure_ascii=False, indent=2)
+
+    def iter_urls(self) -> Iterator[str]:
+        """キャッシュ済みページのURL（ファイル名）を列挙"""
+        if not self.cache_dir.exists():
+            return
+        for path in sorted(self.cache_dir.iterdir()):
+            if path.is_file() and not path.name.endswith('.meta.json'):
+                yield self.get_validators(path.name).get('url') or path.name
+
+    def close(self):
+        """リソースを解放（ファイルキャッシュでは何もしない）"""
+
+    @staticmethod
+    def _get_meta_path(cache_file: Path) -> Path:
+        """キャッシュファイルに対応するサイドカーファイルのパス"""
+        return cache_file.with_name(cache_file.name + '.meta.json')
+
+
+class PackPageCache:
+    """
+    全ページを1つのパックファイルに圧縮して保存するキャッシュ
+
+    パックファイルは追記専用のレコード列で、本文はSHA-256で重複排除される（内容アドレス）。
+    索引ファイル（<pack>.idx）はオープンアドレス法のハッシュ表で、mmapしてO(1)で参照する。
+    索引はパックファイルから再構築できるため、配布物はパックファイル1つで完結する。
+    """
+
+    PACK_MAGIC = b'BKPK\x01\x00\x00\x00'
+    RECORD_MAGIC = b'BKRC'
+    RECORD_HEADER = struct.Struct('<4sII')  # magic, ヘッダー長, 本文長
+
+    INDEX_MAGIC = b'BKIX'
+    INDEX_VERSION = 1
+    INDEX_HEADER = struct.Struct('<4sIQQQ')  # magic, version, スロット数, 登録数, 索引済みパック長
+    SLOT = struct.Struct('<16sQI4x')         # キー, レコード位置, レコード長
+    EMPTY_KEY = b'\x00' * 16
+    INITIAL_CAPACITY = 1024
+    MAX_LOAD_FACTOR = 0.5
+
+    def __init__(self, pack_path: Path):
+        """
+        Args:
+            pack_path: パックファイルのパス（索引は同じ場所に .idx を付けて保存）
+        """
+        self.pack_path = Path(pack_path)
+        self.index_path = self.pack_path.with_name(self.pack_path.name + '.idx')
+        self._lock = threading.RLock()
+        self._index_file = None
+        self._index = None
+        self._open()
+
+    def exists(self, url: str) -> bool:
+        """キャッシュが存在するか"""
+        with self._lock:
+            return self._lookup(self._url_key(url)) is not None
+
+    def get(self, url: str) -> Optional[RawPage]:
+        """
+        キャッシュ済みページを読み込む
+
+        Args:
+            url: ページの完全なURL
+
+        Returns:
+            RawPage、キャッシュがない場合はNone
+        """
+        with self._lock:
+            meta = self._read_meta(url)
+            if meta is None:
+                return None
+            header, body = self._read_record(meta['blob_offset'], meta['blob_length'])
+        return RawPage(content=zlib.decompress(body), encoding=meta.get('encoding'))
+
+    def put(self, url: str, page: RawPage, validators: dict):
+        """
+        ページとバリデータを保存（同じ内容の本文は一度だけ保存される）
+
+        Args:
+            url: ページの完全なURL
+            page: 保存するページ
+            validators: バリデータ（ETag, Last-Modified, 取得時刻など）
+        """
+        digest = hashlib.sha256(page.content).hexdigest()
+        with self._lock:
+            blob = self._lookup(self._content_key(digest))
+            if blob is None:
+                body = zlib.compress(page.content, 6)
+                blob = self._append_record({'type': 'blob', 'sha256': digest}, body)
+                self._insert(self._content_key(digest), *blob)
+                self._set_indexed_size(blob[0] + blob[1])
+
+            meta = dict(validators, encoding=page.encoding)
+            self._write_meta(url, digest, blob, meta)
+
+    def get_validators(self, url: str) -> dict:
+        """
+        バリデータを読み込む
+
+        Args:
+            url: ページの完全なURL
+
+        Returns:
+            バリデータの辞書（キャッシュがない場合は空の辞書）
+        """
+        with self._lock:
+            meta = self._read_meta(url)
+        if meta is None:
+            return {}
+        return {k: v for k, v in meta.items() if k not in ('type', 'sha256', 'blob_offset', 'blob_length')}
+
+    def update_validators(self, url: str, validators: dict):
+        """
+        バリデータのみを更新（本文は既存のものを参照し続ける）
+
+        Args:
+            url: ページの完全なURL
+            validators: バリデータ
+        """
+        with self._lock:
+            meta = self._read_meta(url)
+            if meta is None:
+                raise KeyError(url)
+            blob = (meta['blob_offset'], meta['blob_length'])
+            merged = dict(validators)
+            merged.setdefault('encoding', meta.get('encoding'))
+            self._write_meta(url, meta['sha256'], blob, merged)
+
+    def iter_urls(self) -> Iterator[str]:
+        """キャッシュ済みページのURLを列挙"""
+        urls = {}
+        for offset, header, _ in self._scan_records():
+            if header.get('type') == 'meta':
+                urls[header['url']] = offset
+        yield from sorted(urls)
+
+    def close(self):
+        """索引のmmapを閉じる"""
+        with self._lock:
+            if self._index is not None:
+                self._index.flush()
+                self._index.close()
+                self._index_file.close()
+                self._index = None
+                self._index_file = None
+
+    # --- パックファイル ---
+
+    def _open(self):
+        """パックファイルと索引を開く（索引がない・古い場合は再構築する）"""
+        self.pack_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.pack_path.exists():
+            self.pack_path.write_bytes(self.PACK_MAGIC)
+        else:
+            with open(self.pack_path, 'rb') as f:
+                if f.read(len(self.PACK_MAGIC)) != self.PACK_MAGIC:
+                    raise ValueError(f"Not a page pack file: {self.pack_path}")
+
+        if not self._load_index():
+            self._rebuild_index()
+            return
+
+        # 索引の作成後にパックへ追記されたレコード（異常終了時など）を取り込む
+        indexed_size = self._read_index_header()[4]
+        pack_size = self.pack_path.stat().st_size
+        if indexed_size < pack_size:
+            self._replay(indexed_size)
+        elif indexed_size > pack_size:
+            logger.warning(f"Pack index is ahead of pack file, rebuilding: {self.index_path}")
+            self._rebuild_index()
+
+    def _append_record(self, header: dict, body: bytes) -> Tuple[int, int]:
+        """レコードをパックファイルの末尾に追記し、(位置, 長さ) を返す"""
+        header_bytes = json.dumps(header, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        record = self.RECORD_HEADER.pack(self.RECORD_MAGIC, len(header_bytes), len(body)) + header_bytes + body
+        with open(self.pack_path, 'ab') as f:
+            offset = f.tell()
+            f.write(record)
+        return offset, len(record)
+
+    def _read_record(self, offset: int, length: int) -> Tuple[dict, bytes]:
+        """指定位置のレコードを読み込み、(ヘッダー, 本文) を返す"""
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            record = f.read(length)
+        magic, header_len, body_len = self.RECORD_HEADER.unpack_from(record)
+        if magic != self.RECORD_MAGIC:
+            raise ValueError(f"Corrupted pack record at {offset}")
+        start = self.RECORD_HEADER.size
+        header = json.loads(record[start:start + header_len].decode('utf-8'))
+        return header, record[start + header_len:start + header_len + body_len]
+
+    def _scan_records(self, start: Optional[int] = None) -> Iterator[Tuple[int, dict, int]]:
+        """パックファイルのレコードを先頭から走査し、(位置, ヘッダー, レコード長) を返す"""
+        offset = start if start is not None else len(self.PACK_MAGIC)
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                prefix = f.read(self.RECORD_HEADER.size)
+                if len(prefix) < self.RECORD_HEADER.size:
+                    break
+                magic, header_len, body_len = self.RECORD_HEADER.unpack(prefix)
+                if magic != self.RECORD_MAGIC:
+                    logger.warning(f"Stopped scanning pack at corrupted record: {offset}")
+                    break
+                header_bytes = f.read(header_len)
+                if len(header_bytes) < header_len:
+                    break
+                f.seek(body_len, os.SEEK_CUR)
+                length = self.RECORD_HEADER.size + header_len + body_len
+                yield offset, json.loads(header_bytes.decode('utf-8')), length
+                offset += length
+
+    def _read_meta(self, url: str) -> Optional[dict]:
+        """URLのメタデータレコードを読み込む"""
+        slot = self._lookup(self._url_key(url))
+        if slot is None:
+            return None
+        header, _ = self._read_record(*slot)
+        if header.get('url') != url:
+            # キーの衝突（実質起こらない）
+            return None
+        return header
+
+    def _write_meta(self, url: str, digest: str, blob: Tuple[int, int], meta: dict):
+        """メタデータレコードを追記し、URLの索引を更新"""
+        header = dict(meta, type='meta', url=url, sha256=digest, blob_offset=blob[0], blob_length=blob[1])
+        offset, length = self._append_record(header, b'')
+        self._insert(self._url_key(url), offset, length)
+        # 索引への反映が済んだ位置まで記録（異常終了時はそれ以降を再走査する）
+        self._set_indexed_size(offset + length)
+
+    # --- 索引（mmapしたハッシュ表） ---
+
+    @staticmethod
+    def _url_key(url: str) -> bytes:
+        return hashlib.blake2b(b'U' + url.encode('utf-8'), digest_size=16).digest()
+
+    @staticmethod
+    def _content_key(digest: str) -> bytes:
+        return hashlib.blake2b(b'C' + digest.encode('ascii'), digest_size=16).digest()
+
+    def _load_index(self) -> bool:
+        """既存の索引をmmapする（存在しない・壊れている場合はFalse）"""
+        if not self.index_path.exists():
+            return False
+        if self.index_path.stat().st_size < self.INDEX_HEADER.size:
+            return False
+        self._map_index()
+        magic, version, capacity, _, _ = self._read_index_header()
+        expected_size = self.INDEX_HEADER.size + capacity * self.SLOT.size
+        if magic != self.INDEX_MAGIC or version != self.INDEX_VERSION or len(self._index) != expected_size:
+            self.close()
+            return False
+        return True
+
+    def _map_index(self):
+        self._index_file = open(self.index_path, 'r+b')
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+
+    def _create_index(self, capacity: int, indexed_size: int):
+        """空の索引ファイルを作成してmmapする"""
+        self.close()
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, self.INDEX_VERSION, capacity, 0, indexed_size))
+            f.truncate(self.INDEX_HEADER.size + capacity * self.SLOT.size)
+        os.replace(tmp_path, self.index_path)
+        self._map_index()
+
+    def _read_index_header(self) -> tuple:
+        return self.INDEX_HEADER.unpack_from(self._index, 0)
+
+    def _write_index_header(self, capacity: int, count: int, indexed_size: int):
+        self.INDEX_HEADER.pack_into(self._index, 0, self.INDEX_MAGIC, self.INDEX_VERSION,
+                                    capacity, count, indexed_size)
+
+    def _set_indexed_size(self, indexed_size: int):
+        _, _, capacity, count, _ = self._read_index_header()
+        self._write_index_header(capacity, count, indexed_size)
+
+    def _probe(self, key: bytes) -> Tuple[int, Optional[Tuple[int, int]]]:
+        """キーのスロット番号と、登録済みの場合は (位置, 長さ) を返す（線形探査）"""
+        capacity = self._read_index_header()[2]
+        slot = int.from_bytes(key[:8], 'little') % capacity
+        while True:
+            position = self.INDEX_HEADER.size + slot * self.SLOT.size
+            slot_key, offset, length = self.SLOT.unpack_from(self._index, position)
+            if slot_key == self.EMPTY_KEY:
+                return slot, None
+            if slot_key == key:
+                return slot, (offset, length)
+            slot = (slot + 1) % capacity
+
+    def _lookup(self, key: bytes) -> Optional[Tuple[int, int]]:
+        return self._probe(key)[1]
+
+    def _insert(self, key: bytes, offset: int, length: int):
+        """キーを登録（既存の場合は上書き）し、負荷率が上限を超えたら索引を拡張する"""
+        slot, existing = self._probe(key)
+        _, _, capacity, count, indexed_size = self._read_index_header()
+        self.SLOT.pack_into(self._index, self.INDEX_HEADER.size + slot * self.SLOT.size, key, offset, length)
+        if existing is None:
+            count += 1
+            self._write_index_header(capacity, count, indexed_size)
+            if count > capacity * self.MAX_LOAD_FACTOR:
+                self._resize(capacity * 2)
+
+    def _resize(self, capacity: int):
+        """スロット数を変更して全エントリーを再配置"""
+        _, _, old_capacity, _, indexed_size = self._read_index_header()
+        entries = []
+        for slot in range(old_capacity):
+            position = self.INDEX_HEADER.size + slot * self.SLOT.size
+            entry = self.SLOT.unpack_from(self._index, position)
+            if entry[0] != self.EMPTY_KEY:
+                entries.append(entry)
+
+        self._create_index(capacity, indexed_size)
+        for key, offset, length in entries:
+            self._insert(key, offset, length)
+
+    def _rebuild_index(self):
+        """パックファイル全体を走査して索引を再構築"""
+        logger.info(f"Building pack index: {self.index_path}")
+        self._create_index(self.INITIAL_CAPACITY, len(self.PACK_MAGIC))
+        self._replay(len(self.PACK_MAGIC))
+
+    def _replay(self, start: int):
+        """指定位置以降のレコードを索引に反映"""
+        end = start
+        for offset, header, length in self._scan_records(start):
+            if header.get('type') == 'blob':
+                self._insert(self._content_key(header['sha256']), offset, length)
+            elif header.get('type') == 'meta':
+                self._insert(self._url_key(header['url']), offset, length)
+            end = offset + length
+        self._set_indexed_size(end)
+        self._index.flush()
+
+
+def create_page_cache(config: dict):
+    """
+    設定に応じたページキャッシュを生成
+
+    Args:
+        config: config.yaml全体の辞書（cacheセクションを参照）
+
+    Returns:
+        FilePageCacheまたはPackPageCache
+    """
+    cache_config = config.get('cache', {})
+    backend = cache_config.get('backend', 'files')
+    if backend == 'pack':
+        return PackPageCache(Path(cache_config.get('pack_file', 'html.pack')))
+    if backend == 'files':
+        return FilePageCache(Path(cache_config.get('dir', 'html')))
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def copy_page_cache(source, destination, base_url: str) -> int:
+    """
+    キャッシュの内容を別のバックエンドにコピー（html/ からパックファイルへの移行用）
+
+    Args:
+        source: コピー元のキャッシュ
+        destination: コピー先のキャッシュ
+        base_url: 相対パスで記録されたページを完全なURLに変換するためのベースURL
+
+    Returns:
+        コピーしたページ数
+    """
+    count = 0
+    for url in source.iter_urls():
+        page = source.get(url)
+        if page is None:
+            continue
+        full_url = url if url.startswith('http') else f"{base_url}/{url}"
+        validators = source.get_validators(url)
+        validators['url'] = full_url
+        validators.setdefault('fetched_at', datetime.now().isoformat())
+        destination.put(full_url, page, validators)
+        count += 1
+    return count
@@ -0,0 +1,163 @@
+"""
+パース結果キャッシュモジュール
+
+クラスページのパース結果（ClassDetail）を、正規化したページのバイト列とパーサーの
+バージョンから求めたキーで保存する。ページもパーサーも変わっていなければ、
+再実行時（描画処理だけを変更した場合のrebuildなど）にHTMLのパースを省略できる。
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from src.parser import ClassDetail, ClassInfo
+except ModuleNotFoundError:
+    from parser import ClassDetail, ClassInfo
+
+logger = logging.getLogger(__name__)
+
+# パース結果に影響しない、Doxygenが生成のたびに書き換える部分（生成日時やバージョン表記）
+_VOLATILE_PATTERNS = [
+    re.compile(rb'<!--\s*Generated by Doxygen[^>]*-->', re.IGNORECASE),
+    re.compile(rb'<address class="footer">.*?</address>', re.DOTALL),
+    re.compile(rb'<li class="footer">.*?</li>', re.DOTALL),
+]
+
+
+def normalize_page(content: bytes) -> bytes:
+    """
+    キャッシュキーの計算用にページを正規化（生成日時などのフッターを除去）
+
+    Args:
+        content: ページのバイト列
+
+    Returns:
+        正規化したバイト列
+    """
+    for pattern in _VOLATILE_PATTERNS:
+        content = pattern.sub(b'', content)
+    return content
+
+
+class ParseResultCache:
+    """ClassDetailをJSONファイルとして保存するパース結果キャッシュ"""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（<キーの先頭2文字>/<キー>.json に保存）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content: bytes, encoding: Optional[str], parser_id: str) -> str:
+        """
+        キャッシュキーを計算
+
+        Args:
+            content: ページのバイト列
+            encoding: ページのエンコーディング（デコード結果が変わるためキーに含める）
+            parser_id: パーサーの識別子（バックエンド名とPARSER_VERSION）
+
+        Returns:
+            キー（SHA-256の16進文字列）
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{parser_id}\0{encoding or ''}\0".encode('utf-8'))
+        digest.update(normalize_page(content))
+        return digest.hexdigest()
+
+    def get(self, key: str, class_info: ClassInfo,
+            validate: Optional[Callable[[ClassDetail], bool]] = None) -> Optional[ClassDetail]:
+        """
+        パース結果を読み込む
+
+        Args:
+            key: make_keyで求めたキー
+            class_info: 結果に設定する基本クラス情報（キャッシュには含めない）
+            validate: 読み込んだ結果を使えるか判定する関数（Falseを返した場合はキャッシュがないものとする）
+
+        Returns:
+            ClassDetail、キャッシュがない場合はNone
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry {path}: {e}")
+            self._count(hit=False)
+            return None
+
+        detail = ClassDetail(info=class_info, **data)
+        if validate is not None and not validate(detail):
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+        return detail
+
+    def put(self, key: str, detail: ClassDetail):
+        """
+        パース結果を保存（一時ファイルに書いてから置き換えるため、並行して書き込んでも壊れない）
+
+        Args:
+            key: make_keyで求めたキー
+            detail: パース結果
+        """
+        data = {
+            'description_full': detail.description_full,
+            'inherits_from': detail.inherits_from,
+            'methods': detail.methods,
+            'properties': detail.properties,
+            'fields': detail.fields,
+            'raw_signatures': detail.raw_signatures,
+        }
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _get_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def create_parse_cache(config: dict) -> Optional[ParseResultCache]:
+    """
+    設定に応じたパース結果キャッシュを生成
+
+    Args:
+        config: config.yaml全体の辞書（parsing.result_cache_dirを参照）
+
+    Returns:
+        ParseResultCache、無効の場合はNone
+    """
+    cache_dir = config.get('parsing', {}).get('result_cache_dir')
+    if not cache_dir:
+        return None
+    return ParseResultCache(Path(cache_dir))
@@ -1,20 +1,27 @@
 """
 HTMLパースとデータ抽出モジュール
 """
+import os
 import re
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 from bs4 import BeautifulSoup, Tag
 
 try:
-    from src.signature_parser import SignatureParser
+    from src.signature_parser import SignatureParser, TypeDictionary
 except ModuleNotFoundError:
-    from signature_parser import SignatureParser
+    from signature_parser import SignatureParser, TypeDictionary
 
 logger = logging.getLogger(__name__)
 
+# 抽出結果が変わる変更（パラメータの分割規則の変更を含む）をしたら上げる（パース結果キャッシュのキーに含まれる）
+PARSER_VERSION = 5
+
 
 @dataclass
 class ClassInfo:
@@ -36,6 +43,8 @@ class ClassDetail:
     methods: List[Dict] = None
     properties: List[Dict] = None
     fields: List[Dict] = None
+    # methodsと同じ順序の整形前のシグネチャ（型名の辞書が変わったときの確認用で、出力には含めない）
+    raw_signatures: List[str] = None
 
     def __post_init__(self):
         if self.inherits_from is None:
@@ -46,11 +55,70 @@ class ClassDetail:
             self.properties = []
         if self.fields is None:
             self.fields = []
+        if self.raw_signatures is None:
+            self.raw_signatures = []
 
 
 class BakinParser:
     """Bakinドキュメント用HTMLパーサー"""
 
+    # パーサーバックエンド名（create_parserで指定する名前）
+    BACKEND = 'html.parser'
+
+    # メンバー宣言セクション: (セクションID, 種類, 静的か)。この順序が出力順になる
+    MEMBER_SECTIONS = [
+        ('pub-methods', 'method', False),
+        ('pub-static-methods', 'method', True),
+        ('properties', 'property', False),
+        ('pub-properties', 'property', False),
+        ('pub-static-properties', 'property', True),
+        ('pub-attribs', 'field', False),
+    ]
+
+    def __init__(self, single_pass: bool = True, result_cache=None,
+                 known_types: Optional[TypeDictionary] = None):
+        """
+        Args:
+            single_pass: memberdeclsテーブルを1回だけ走査してメンバーを抽出するか
+                         （Falseの場合はセクションごとにページを検索する従来の方式）
+            result_cache: パース結果キャッシュ（ParseResultCache、Noneの場合は使用しない）
+            known_types: パラメータの型と変数名の分割に使う既知の型名の辞書
+                         （Noneの場合はヒューリスティクスのみで分割）
+        """
+        self.single_pass = single_pass
+        self.result_cache = result_cache
+        self.known_types = known_types
+
+    @property
+    def parser_id(self) -> str:
+        """
+        パース結果キャッシュのキーに使うパーサーの識別子
+
+        型名の辞書はキーに含めない。辞書の変更で結果が変わるかは、キャッシュから読み込んだ
+        結果ごとに is_current_result で確かめる。
+        """
+        return f"{self.BACKEND}/{PARSER_VERSION}"
+
+    def is_current_result(self, detail: ClassDetail) -> bool:
+        """
+        キャッシュから読み込んだパース結果が、現在の型名の辞書で整形した結果と一致するか
+
+        元のシグネチャを整形し直して比べるため、再パースが必要になるのは、追加・削除された
+        型名で始まるパラメータを含むページだけになる。
+
+        Args:
+            detail: キャッシュから読み込んだClassDetail
+
+        Returns:
+            一致する場合はTrue
+        """
+        if len(detail.raw_signatures) != len(detail.methods):
+            return False
+        for raw_signature, method in zip(detail.raw_signatures, detail.methods):
+            if SignatureParser.format_signature(raw_signature, self.known_types) != method['signature']:
+                return False
+        return True
+
     def parse_annotated_page(self, soup: BeautifulSoup) -> List[ClassInfo]:
         """
         annotated.htmlから全クラスリストを抽出
@@ -74,58 +142,9 @@ class BakinParser:
             href = link['href']
 
             # クラス/インターフェース/構造体のページのみ対象
-            # Doxygenは class_, interface_, struct_ などで始まる
-            if not any(href.startswith(prefix) for prefix in ['class_', 'struct_', 'interface_']):
+            if not self._is_class_href(href):
                 continue
 
-            # テキストからクラス名を取得
-            class_name = link.get_text(strip=True)
-
-            # URLから完全修飾名を復元
-            # Doxygenのエンコーディング: class_sharp_kmy_audio_1_1_sound.html
-            # → SharpKmyAudio.Sound
-            url_without_ext = href.replace('.html', '')
-
-            # プレフィックスを除去（class_, struct_, interface_）
-            for prefix in ['class_', 'struct_', 'interface_']:
-                if url_without_ext.startswith(prefix):
-                    url_without_ext = url_without_ext[len(prefix):]
-                    break
-
-            # _1_1 を . に変換
-            full_name_from_url = url_without_ext.replace('_1_1', '.')
-
-            # アンダースコアで始まる部分を大文字に変換（キャメルケースに戻す）
-            # 例: sharp_kmy_audio → SharpKmyAudio
-            parts = full_name_from_url.split('.')
-            converted_parts = []
-            for part in parts:
-                # 各パートのアンダースコアを処理
-                words = part.split('_')
-                # 各単語の最初を大文字に
-                camel_case = ''.join(word.capitalize() for word in words if word)
-                converted_parts.append(camel_case)
-
-            full_name = '.'.join(converted_parts)
-
-            # 名前空間とクラス名を分離
-            if '.' in full_name:
-                namespace_parts = full_name.split('.')
-                class_name = namespace_parts[-1]
-                namespace = '.'.join(namespace_parts[:-1])
-            else:
-                namespace = ""
-
-            # 型を推定（URLから）
-            if href.startswith('class_'):
-                class_type = 'class'
-            elif href.startswith('struct_'):
-                class_type = 'struct'
-            elif href.startswith('interface_'):
-                class_type = 'interface'
-            else:
-                class_type = 'unknown'
-
             # 説明を取得（あれば）
             description = ""
             # Doxygenは通常、リンクの後に説明が続く
@@ -135,20 +154,197 @@ class BakinParser:
                 if desc_td:
                     description = desc_td.get_text(strip=True)
 
-            class_info = ClassInfo(
-                name=class_name,
-                full_name=full_name,
-                url=href,
-                type=class_type,
-                namespace=namespace,
-                description=description
-            )
+            class_info = self._build_class_info(href, link.get_text(strip=True), description)
             classes.append(class_info)
-            logger.debug(f"Found {class_type}: {full_name}")
+            logger.debug(f"Found {class_info.type}: {class_info.full_name}")
 
         logger.info(f"Extracted {len(classes)} classes from annotated page")
         return classes
 
+    @staticmethod
+    def _is_class_href(href: str) -> bool:
+        """クラス/インターフェース/構造体のページへのリンクか"""
+        # Doxygenは class_, interface_, struct_ などで始まる
+        return any(href.startswith(prefix) for prefix in ['class_', 'struct_', 'interface_'])
+
+    @staticmethod
+    def _build_class_info(href: str, class_name: str, description: str) -> ClassInfo:
+        """
+        annotated.htmlのリンクからClassInfoを組み立てる
+
+        Args:
+            href: クラスページへのリンク
+            class_name: リンクのテキスト（クラス名）
+            description: クラスの簡単な説明
+
+        Returns:
+            ClassInfo
+        """
+        # URLから完全修飾名を復元
+        # Doxygenのエンコーディング: class_sharp_kmy_audio_1_1_sound.html
+        # → SharpKmyAudio.Sound
+        url_without_ext = href.replace('.html', '')
+
+        # プレフィックスを除去（class_, struct_, interface_）
+        for prefix in ['class_', 'struct_', 'interface_']:
+            if url_without_ext.startswith(prefix):
+                url_without_ext = url_without_ext[len(prefix):]
+                break
+
+        # _1_1 を . に変換
+        full_name_from_url = url_without_ext.replace('_1_1', '.')
+
+        # アンダースコアで始まる部分を大文字に変換（キャメルケースに戻す）
+        # 例: sharp_kmy_audio → SharpKmyAudio
+        parts = full_name_from_url.split('.')
+        converted_parts = []
+        for part in parts:
+            # 各パートのアンダースコアを処理
+            words = part.split('_')
+            # 各単語の最初を大文字に
+            camel_case = ''.join(word.capitalize() for word in words if word)
+            converted_parts.append(camel_case)
+
+        full_name = '.'.join(converted_parts)
+
+        # 名前空間とクラス名を分離
+        if '.' in full_name:
+            namespace_parts = full_name.split('.')
+            class_name = namespace_parts[-1]
+            namespace = '.'.join(namespace_parts[:-1])
+        else:
+            namespace = ""
+
+        # 型を推定（URLから）
+        if href.startswith('class_'):
+            class_type = 'class'
+        elif href.startswith('struct_'):
+            class_type = 'struct'
+        elif href.startswith('interface_'):
+            class_type = 'interface'
+        else:
+            class_type = 'unknown'
+
+        return ClassInfo(
+            name=class_name,
+            full_name=full_name,
+            url=href,
+            type=class_type,
+            namespace=namespace,
+            description=description
+        )
+
+    def parse_annotated_content(self, content: bytes, encoding: Optional[str] = None) -> List[ClassInfo]:
+        """
+        HTMLのバイト列からannotated.htmlの全クラスリストを抽出
+
+        Args:
+            content: annotated.htmlのHTML（バイト列）
+            encoding: HTMLのエンコーディング（Noneの場合は<meta>宣言などから判定）
+
+        Returns:
+            ClassInfoオブジェクトのリスト
+        """
+        soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+        return self.parse_annotated_page(soup)
+
+    def parse_class_content(self, content: bytes, class_info: ClassInfo,
+                            encoding: Optional[str] = None) -> ClassDetail:
+        """
+        HTMLのバイト列から個別クラスページの詳細情報を抽出
+
+        Args:
+            content: クラスページのHTML（バイト列）
+            class_info: 基本クラス情報
+            encoding: HTMLのエンコーディング（Noneの場合は<meta>宣言などから判定）
+
+        Returns:
+            ClassDetailオブジェクト
+        """
+        if self.result_cache is None:
+            return self._parse_class_content(content, class_info, encoding)
+
+        key = self.result_cache.make_key(content, encoding, self.parser_id)
+        detail = self.result_cache.get(key, class_info, validate=self.is_current_result)
+        if detail is None:
+            detail = self._parse_class_content(content, class_info, encoding)
+            self.result_cache.put(key, detail)
+        return detail
+
+    def _parse_class_content(self, content: bytes, class_info: ClassInfo,
+                             encoding: Optional[str] = None) -> ClassDetail:
+        """HTMLのバイト列をパースしてClassDetailを抽出（キャッシュは使わない）"""
+        soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+        return self.parse_class_page(soup, class_info)
+
+    def parse_class_contents(self, pages: Iterable[Tuple[bytes, ClassInfo, Optional[str]]],
+                             processes: Optional[int] = None,
+                             batch_size: int = 64) -> Iterator[Optional[ClassDetail]]:
+        """
+        複数のクラスページを複数プロセスでパース
+
+        結果は入力と同じ順序で返され、各ページのパース結果は逐次パースと同一になる。
+        メモリ使用量を抑えるため、入力はbatch_size件ずつワーカーに送られる。
+        パース結果キャッシュがある場合、キャッシュ済みのページはワーカーに送らない。
+
+        Args:
+            pages: (HTMLのバイト列, ClassInfo, エンコーディング) のイテラブル
+            processes: ワーカープロセス数（Noneの場合はCPUコア数、1の場合は逐次処理）
+            batch_size: 一度にワーカーへ送る件数
+
+        Returns:
+            ClassDetail（パース失敗時はNone）のイテレータ
+        """
+        worker = partial(_parse_class_content_worker, self.BACKEND)
+
+        if processes == 1:
+            parser = create_parser(self.BACKEND, known_types=self.known_types)
+            yield from self._parse_batches(
+                pages, batch_size, lambda batch: map(partial(_parse_page, parser), batch)
+            )
+            return
+
+        processes = processes or os.cpu_count() or 1
+        chunksize = max(1, batch_size // (processes * 2))
+        # 型名の辞書はページごとに送らず、ワーカープロセスの起動時に1回だけ渡す
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_parse_worker,
+                                 initargs=(self.known_types,)) as executor:
+            yield from self._parse_batches(
+                pages, batch_size, lambda batch: executor.map(worker, batch, chunksize=chunksize)
+            )
+
+    def _parse_batches(self, pages: Iterable[Tuple[bytes, ClassInfo, Optional[str]]], batch_size: int,
+                       run) -> Iterator[Optional[ClassDetail]]:
+        """
+        入力をbatch_size件ずつ、キャッシュにないページだけrunでパースして入力順に返す
+
+        Args:
+            pages: (HTMLのバイト列, ClassInfo, エンコーディング) のイテラブル
+            batch_size: 一度に処理する件数
+            run: ページのリストを受け取り (ClassDetail, エラーメッセージ) を順に返す関数
+        """
+        pages = iter(pages)
+        while True:
+            batch = list(islice(pages, batch_size))
+            if not batch:
+                break
+
+            keys = [None] * len(batch)
+            cached = [None] * len(batch)
+            if self.result_cache is not None:
+                for i, (content, class_info, encoding) in enumerate(batch):
+                    keys[i] = self.result_cache.make_key(content, encoding, self.parser_id)
+                    cached[i] = self.result_cache.get(keys[i], class_info, validate=self.is_current_result)
+
+            results = iter(run([page for page, detail in zip(batch, cached) if detail is None]))
+            for (_, class_info, _), key, detail in zip(batch, keys, cached):
+                if detail is None:
+                    detail, error = next(results)
+                    if error is None and key is not None:
+                        self.result_cache.put(key, detail)
+                    detail = _report_parse_result(class_info, detail, error)
+                yield detail
+
     def parse_class_page(self, soup: BeautifulSoup, class_info: ClassInfo) -> ClassDetail:
         """
         個別クラスページから詳細情報を抽出
@@ -162,23 +358,157 @@ class BakinParser:
         """
         detail = ClassDetail(info=class_info)
 
+        # メンバーの詳細説明はページ内で一度だけ索引化して引く
+        memdocs = self._build_memdoc_index(soup)
+
         # クラスの詳細説明を取得
         detail.description_full = self._extract_description(soup)
 
         # 継承関係を取得
         detail.inherits_from = self._extract_inheritance(soup)
 
-        # メソッドを取得
-        detail.methods = self._extract_methods(soup)
+        if self.single_pass:
+            # メソッド・プロパティ・フィールドを1回の走査で取得
+            detail.methods, detail.properties, detail.fields = self._extract_members(soup, memdocs)
+        else:
+            # メソッドを取得
+            detail.methods = self._extract_methods(soup, memdocs)
 
-        # プロパティを取得
-        detail.properties = self._extract_properties(soup)
+            # プロパティを取得
+            detail.properties = self._extract_properties(soup, memdocs)
 
-        # フィールドを取得
-        detail.fields = self._extract_fields(soup)
+            # フィールドを取得
+            detail.fields = self._extract_fields(soup, memdocs)
 
+        detail.raw_signatures = self._take_raw_signatures(detail.methods)
         return detail
 
+    def _extract_members(self, soup: BeautifulSoup,
+                         memdocs: Dict[str, Tag]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        memberdeclsテーブルを1回だけ走査し、各行をセクションに応じてパース
+
+        Args:
+            soup: クラスページのBeautifulSoup
+            memdocs: _build_memdoc_indexで構築した索引
+
+        Returns:
+            (メソッド, プロパティ, フィールド) のタプル
+        """
+        return self._dispatch_member_rows(self._collect_section_rows(soup), memdocs)
+
+    def _collect_section_rows(self, soup: BeautifulSoup) -> Dict[str, List[Tag]]:
+        """
+        memberdeclsテーブルごとに見出しのセクションIDを読み、メンバー行を振り分ける
+
+        Args:
+            soup: クラスページのBeautifulSoup
+
+        Returns:
+            セクションID → メンバー行のリスト
+        """
+        known_sections = {section_id for section_id, _, _ in self.MEMBER_SECTIONS}
+        rows_by_section = {}
+
+        for table in soup.find_all('table', class_='memberdecls'):
+            heading = table.find('h2')
+            section_anchor = heading.find('a', id=True) if heading else None
+            if not section_anchor:
+                continue
+
+            section_id = section_anchor['id']
+            # 同じIDのセクションが複数ある場合は最初のものを使う
+            if section_id not in known_sections or section_id in rows_by_section:
+                continue
+            rows_by_section[section_id] = table.find_all('tr', class_=re.compile(r'^memitem:'))
+
+        return rows_by_section
+
+    def _dispatch_member_rows(self, rows_by_section: Dict[str, list],
+                              memdocs: dict) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        セクションごとのメンバー行を、種類に応じた行パーサーに渡す
+
+        Args:
+            rows_by_section: セクションID → メンバー行のリスト
+            memdocs: アンカーID → memdoc要素の索引
+
+        Returns:
+            (メソッド, プロパティ, フィールド) のタプル
+        """
+        methods, properties, fields = [], [], []
+
+        for section_id, kind, is_static in self.MEMBER_SECTIONS:
+            for row in rows_by_section.get(section_id, []):
+                if kind == 'method':
+                    member, members = self._parse_method_row(row, memdocs, is_static), methods
+                elif kind == 'property':
+                    member, members = self._parse_property_row(row, memdocs, is_static), properties
+                else:
+                    member, members = self._parse_field_row(row, memdocs), fields
+                if member:
+                    members.append(member)
+
+        return methods, properties, fields
+
+    @staticmethod
+    def _build_memdoc_index(soup: BeautifulSoup) -> Dict[str, Tag]:
+        """
+        アンカーIDから、その直後にある詳細説明（<div class="memdoc">）への索引を構築
+
+        ページを先頭から1回だけ走査し、各アンカーを文書順で次に現れるmemdocに対応付ける
+        （soup.find('a', {'id': ...}).find_next('div', class_='memdoc') と同じ結果になる）。
+
+        Args:
+            soup: クラスページのBeautifulSoup
+
+        Returns:
+            アンカーID → memdoc要素の辞書
+        """
+        index = {}
+        seen = set()
+        pending = []
+
+        def is_anchor_or_memdoc(tag: Tag) -> bool:
+            if tag.name == 'a':
+                return tag.has_attr('id')
+            return tag.name == 'div' and 'memdoc' in tag.get('class', [])
+
+        for element in soup.find_all(is_anchor_or_memdoc):
+            if element.name == 'div':
+                for anchor_id in pending:
+                    index[anchor_id] = element
+                pending = []
+            elif element['id'] not in seen:
+                # 同じIDが複数ある場合は最初のアンカーを使う
+                seen.add(element['id'])
+                pending.append(element['id'])
+
+        return index
+
+    @staticmethod
+    def _lookup_description(memdocs: Dict[str, Tag], href: Optional[str]) -> Optional[str]:
+        """
+        メンバーへのリンクのアンカーから詳細説明のテキストを取得
+
+        Args:
+            memdocs: _build_memdoc_indexで構築した索引
+            href: メンバー名リンクのhref（リンクがない場合はNone）
+
+        Returns:
+            詳細説明（段落をスペースで連結）、見つからない場合はNone
+        """
+        if not href or '#' not in href:
+            return None
+        desc_div = memdocs.get(href.split('#')[1])
+        if desc_div is None:
+            return None
+        # テキストブロックを抽出
+        textblocks = desc_div.find_all('p')
+        if not textblocks:
+            return None
+        return ' '.join(p.get_text(strip=True) for p in textblocks)
+
     def _extract_description(self, soup: BeautifulSoup) -> str:
         """クラスの説明を抽出"""
         # Doxygenの詳細説明は通常 <div class="textblock"> にある
@@ -212,7 +542,7 @@ class BakinParser:
 
         return inherits
 
-    def _extract_methods(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_methods(self, soup: BeautifulSoup, memdocs: Dict[str, Tag]) -> List[Dict]:
         """メソッドを抽出"""
         methods = []
 
@@ -237,64 +567,97 @@ class BakinParser:
             is_static = (section_id == 'pub-static-methods')
 
             for row in table.find_all('tr', class_=re.compile(r'^memitem:')):
-                method = self._parse_method_row(row, soup, is_static)
+                method = self._parse_method_row(row, memdocs, is_static)
                 if method:
                     methods.append(method)
 
         return methods
 
-    def _parse_method_row(self, row: Tag, soup: BeautifulSoup, is_static: bool = False) -> Optional[Dict]:
+    def _parse_method_row(self, row: Tag, memdocs: Dict[str, Tag], is_static: bool = False) -> Optional[Dict]:
         """メソッド行をパース"""
-        method = {}
-
         # 戻り値の型
         return_type_cell = row.find('td', class_='memItemLeft')
-        if return_type_cell:
-            return_type = return_type_cell.get_text(strip=True)
-            # 静的メソッドの場合、HTMLには既に'static'が含まれているので削除
-            if is_static and return_type.startswith('static'):
-                # 'static'とその後のスペースを削除（スペースが無い場合もあるので両方対応）
-                return_type = return_type[6:].strip()  # 'static' は6文字
-            method['return_type'] = return_type
+        return_type = return_type_cell.get_text(strip=True) if return_type_cell else None
 
         # メソッドシグネチャ
         name_cell = row.find('td', class_='memItemRight')
         if not name_cell:
             return None
 
-        # メソッド全体のシグネチャを取得（タグ間にスペースを入れる）
-        raw_signature = name_cell.get_text(separator=' ', strip=True)
+        # メソッド名（リンク部分）
+        method_link = name_cell.find('a', class_='el')
+
+        method = self._build_method(
+            return_type,
+            # メソッド全体のシグネチャを取得（タグ間にスペースを入れる）
+            name_cell.get_text(separator=' ', strip=True),
+            method_link.get_text(strip=True) if method_link else None,
+            is_static
+        )
+
+        # 詳細説明（アンカーの索引から引く）
+        if method_link:
+            description = self._lookup_description(memdocs, method_link.get('href', ''))
+            if description is not None:
+                method['description'] = description
+
+        return method
+
+    @staticmethod
+    def _take_raw_signatures(methods: List[Dict]) -> List[str]:
+        """
+        _build_methodがメソッド情報に入れた整形前のシグネチャを取り出す（メソッド情報からは削除する）
+
+        Args:
+            methods: メソッド情報のリスト
+
+        Returns:
+            methodsと同じ順序の整形前のシグネチャのリスト
+        """
+        return [method.pop('raw_signature') for method in methods]
+
+    def _build_method(self, return_type: Optional[str], raw_signature: str, link_text: Optional[str],
+                      is_static: bool) -> Dict:
+        """
+        メソッド行から抽出したテキストをメソッド情報に整形（説明は含まない）
+
+        Args:
+            return_type: 戻り値の型のテキスト（セルがない場合はNone）
+            raw_signature: シグネチャのテキスト（タグ間はスペース区切り）
+            link_text: メソッド名リンクのテキスト（リンクがない場合はNone）
+            is_static: 静的メソッドか
+
+        Returns:
+            メソッド情報の辞書
+        """
+        method = {}
+
+        if return_type is not None:
+            # 静的メソッドの場合、HTMLには既に'static'が含まれているので削除
+            if is_static and return_type.startswith('static'):
+                # 'static'とその後のスペースを削除（スペースが無い場合もあるので両方対応）
+                return_type = return_type[6:].strip()  # 'static' は6文字
+            method['return_type'] = return_type
+
         # 余分なスペースを削除
         raw_signature = ' '.join(raw_signature.split())
-        method['signature'] = SignatureParser.format_signature(raw_signature)
+        method['signature'] = SignatureParser.format_signature(raw_signature, self.known_types)
+        # 整形前のシグネチャは_take_raw_signaturesでClassDetail.raw_signaturesに移す
+        method['raw_signature'] = raw_signature
+        method['parameters'] = [
+            parameter.to_dict() for parameter in SignatureParser.parse_parameters(raw_signature, self.known_types)
+        ]
 
         # メソッド名を抽出（リンク部分）
-        method_link = name_cell.find('a', class_='el')
-        if method_link:
-            method['name'] = method_link.get_text(strip=True)
-            # アンカーIDを取得（詳細説明へのリンク用）
-            href = method_link.get('href', '')
-            if href and '#' in href:
-                method['anchor_id'] = href.split('#')[1]
+        if link_text is not None:
+            method['name'] = link_text
 
         # 静的メソッドかどうか
         method['is_static'] = is_static
 
-        # 詳細説明（アンカーから辿る）
-        if 'anchor_id' in method:
-            detail_section = soup.find('a', {'id': method['anchor_id']})
-            if detail_section:
-                # 詳細説明を探す
-                desc_div = detail_section.find_next('div', class_='memdoc')
-                if desc_div:
-                    # テキストブロックを抽出
-                    textblocks = desc_div.find_all('p')
-                    if textblocks:
-                        method['description'] = ' '.join(p.get_text(strip=True) for p in textblocks)
-
         return method
 
-    def _extract_properties(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_properties(self, soup: BeautifulSoup, memdocs: Dict[str, Tag]) -> List[Dict]:
         """プロパティを抽出"""
         properties = []
 
@@ -318,40 +681,69 @@ class BakinParser:
             is_static = ('static' in section_id)
 
             for row in table.find_all('tr', class_=re.compile(r'^memitem:')):
-                prop = self._parse_property_row(row, is_static)
+                prop = self._parse_property_row(row, memdocs, is_static)
                 if prop:
                     properties.append(prop)
 
         return properties
 
-    def _parse_property_row(self, row: Tag, is_static: bool = False) -> Optional[Dict]:
+    def _parse_property_row(self, row: Tag, memdocs: Dict[str, Tag], is_static: bool = False) -> Optional[Dict]:
         """プロパティ行をパース"""
-        prop = {}
-
         # 型
         type_cell = row.find('td', class_='memItemLeft')
-        if type_cell:
-            prop_type = type_cell.get_text(strip=True)
-            # 静的プロパティの場合、HTMLには既に'static'が含まれているので削除
-            if is_static and prop_type.startswith('static'):
-                prop_type = prop_type[6:].strip()  # 'static' は6文字
-            prop['type'] = prop_type
 
         # プロパティ名
         name_cell = row.find('td', class_='memItemRight')
         if not name_cell:
             return None
 
-        # プロパティ宣言を取得（タグ間にスペースを入れる）
-        prop_text = name_cell.get_text(separator=' ', strip=True)
+        prop_link = name_cell.find('a', class_='el')
+
+        prop = self._build_property(
+            type_cell.get_text(strip=True) if type_cell else None,
+            # プロパティ宣言を取得（タグ間にスペースを入れる）
+            name_cell.get_text(separator=' ', strip=True),
+            prop_link.get_text(strip=True) if prop_link else None,
+            is_static
+        )
+
+        # 詳細説明（アンカーの索引から引く）
+        description = self._lookup_description(memdocs, prop_link.get('href') if prop_link else None)
+        if description is not None:
+            prop['description'] = description
+
+        return prop
+
+    @staticmethod
+    def _build_property(prop_type: Optional[str], prop_text: str, link_text: Optional[str],
+                        is_static: bool) -> Dict:
+        """
+        プロパティ行から抽出したテキストをプロパティ情報に整形
+
+        Args:
+            prop_type: 型のテキスト（セルがない場合はNone）
+            prop_text: 宣言のテキスト（タグ間はスペース区切り）
+            link_text: プロパティ名リンクのテキスト（リンクがない場合はNone）
+            is_static: 静的プロパティか
+
+        Returns:
+            プロパティ情報の辞書
+        """
+        prop = {}
+
+        if prop_type is not None:
+            # 静的プロパティの場合、HTMLには既に'static'が含まれているので削除
+            if is_static and prop_type.startswith('static'):
+                prop_type = prop_type[6:].strip()  # 'static' は6文字
+            prop['type'] = prop_type
+
         # 余分なスペースを削除
         prop_text = ' '.join(prop_text.split())
         prop['declaration'] = prop_text
 
         # プロパティ名を抽出（リンク部分）
-        prop_link = name_cell.find('a', class_='el')
-        if prop_link:
-            prop['name'] = prop_link.get_text(strip=True)
+        if link_text is not None:
+            prop['name'] = link_text
         else:
             # リンクがない場合は全体のテキストから抽出
             # [get, set]などのアクセサが含まれる場合はそれを除外
@@ -372,7 +764,7 @@ class BakinParser:
 
         return prop
 
-    def _extract_fields(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_fields(self, soup: BeautifulSoup, memdocs: Dict[str, Tag]) -> List[Dict]:
         """フィールド（公開変数）を抽出"""
         fields = []
 
@@ -392,42 +784,136 @@ class BakinParser:
             return fields
 
         for row in table.find_all('tr', class_=re.compile(r'^memitem:')):
-            field = self._parse_field_row(row)
+            field = self._parse_field_row(row, memdocs)
             if field:
                 fields.append(field)
 
         return fields
 
-    def _parse_field_row(self, row: Tag) -> Optional[Dict]:
+    def _parse_field_row(self, row: Tag, memdocs: Dict[str, Tag]) -> Optional[Dict]:
         """フィールド行をパース"""
-        field = {}
-
         # 型
         type_cell = row.find('td', class_='memItemLeft')
-        if type_cell:
-            field['type'] = type_cell.get_text(strip=True)
 
         # フィールド名と初期値
         name_cell = row.find('td', class_='memItemRight')
         if not name_cell:
             return None
 
-        # フィールド全体の宣言を保存（タグ間にスペースを入れる）
-        declaration = name_cell.get_text(separator=' ', strip=True)
+        field_link = name_cell.find('a', class_='el')
+
+        field = self._build_field(
+            type_cell.get_text(strip=True) if type_cell else None,
+            # フィールド全体の宣言を保存（タグ間にスペースを入れる）
+            name_cell.get_text(separator=' ', strip=True),
+            field_link.get_text(strip=True) if field_link else None,
+            name_cell.get_text(strip=True)
+        )
+
+        # 詳細説明（アンカーの索引から引く）
+        description = self._lookup_description(memdocs, field_link.get('href') if field_link else None)
+        if description is not None:
+            field['description'] = description
+
+        return field
+
+    @staticmethod
+    def _build_field(field_type: Optional[str], declaration: str, link_text: Optional[str],
+                     full_text: str) -> Dict:
+        """
+        フィールド行から抽出したテキストをフィールド情報に整形
+
+        Args:
+            field_type: 型のテキスト（セルがない場合はNone）
+            declaration: 宣言のテキスト（タグ間はスペース区切り）
+            link_text: フィールド名リンクのテキスト（リンクがない場合はNone）
+            full_text: 宣言のテキスト（区切りなし）
+
+        Returns:
+            フィールド情報の辞書
+        """
+        field = {}
+
+        if field_type is not None:
+            field['type'] = field_type
+
         # 余分なスペースを削除
         field['declaration'] = ' '.join(declaration.split())
 
         # フィールド名を抽出（リンク部分）
-        field_link = name_cell.find('a', class_='el')
-        if field_link:
-            field['name'] = field_link.get_text(strip=True)
+        if link_text is not None:
+            field['name'] = link_text
         else:
             # リンクがない場合は全体のテキストから抽出
             # 初期値がある場合は = の前まで
-            full_text = name_cell.get_text(strip=True)
             if '=' in full_text:
                 field['name'] = full_text.split('=')[0].strip()
             else:
                 field['name'] = full_text
 
         return field
+
+
+def create_parser(backend: str = 'html.parser', result_cache=None,
+                  known_types: Optional[TypeDictionary] = None) -> BakinParser:
+    """
+    指定されたバックエンドのパーサーを生成
+
+    Args:
+        backend: 'html.parser'（BeautifulSoup）または 'lxml'（lxmlで直接抽出）
+        result_cache: パース結果キャッシュ（ParseResultCache、Noneの場合は使用しない）
+        known_types: パラメータの分割に使う既知の型名の辞書（Noneの場合はヒューリスティクスのみ）
+
+    Returns:
+        BakinParser
+    """
+    if backend == 'lxml':
+        try:
+            from src.lxml_parser import LxmlBakinParser
+        except ModuleNotFoundError:
+            from lxml_parser import LxmlBakinParser
+        return LxmlBakinParser(result_cache=result_cache, known_types=known_types)
+    if backend == 'html.parser':
+        return BakinParser(result_cache=result_cache, known_types=known_types)
+    raise ValueError(f"Unknown parser backend: {backend}")
+
+
+# ワーカープロセスで使う型名の辞書（_init_parse_workerで設定）
+_worker_known_types: Optional[TypeDictionary] = None
+
+
+def _init_parse_worker(known_types: Optional[TypeDictionary]):
+    """ワーカープロセスの初期化（型名の辞書を設定）"""
+    global _worker_known_types
+    _worker_known_types = known_types
+
+
+def _parse_class_content_worker(backend: str, page: Tuple[bytes, ClassInfo, Optional[str]]) -> Tuple[Optional[ClassDetail], Optional[str]]:
+    """
+    ワーカープロセスで1ページをパース（例外は文字列にして返す）
+
+    Args:
+        backend: パーサーバックエンド名
+        page: (HTMLのバイト列, ClassInfo, エンコーディング)
+
+    Returns:
+        (ClassDetail, エラーメッセージ) のタプル
+    """
+    return _parse_page(create_parser(backend, known_types=_worker_known_types), page)
+
+
+def _parse_page(parser: BakinParser, page: Tuple[bytes, ClassInfo, Optional[str]]) -> Tuple[Optional[ClassDetail], Optional[str]]:
+    """1ページをパースし、(ClassDetail, エラーメッセージ) を返す（例外は文字列にする）"""
+    content, class_info, encoding = page
+    try:
+        return parser.parse_class_content(content, class_info, encoding), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _report_parse_result(class_info: ClassInfo, detail: Optional[ClassDetail],
+                         error: Optional[str]) -> Optional[ClassDetail]:
+    """ワーカーのパース結果を受け取り、失敗時はログに記録する"""
+    if error is not None:
+        logger.error(f"Failed to parse {class_info.full_name}: {error}")
+    return detail
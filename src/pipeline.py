@@ -0,0 +1,221 @@
+"""
+ステージ型パイプライン実行モジュール
+
+取得 → パース → 描画 → 書き込みのような処理を、ステージごとのワーカープールと
+容量制限付きキューで連結して並行実行する。下流のキューが満杯になると上流の
+ワーカーはブロックされる（バックプレッシャー）ため、メモリ使用量は一定に保たれる。
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ステージ終了を下流に伝える番兵
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """パイプラインの1ステージ"""
+    name: str
+    func: Callable[[Any], Any]  # 前段の結果を受け取り、次段への入力を返す
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    """ステージごとの処理統計"""
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_time: float = 0.0  # 全ワーカーの処理時間の合計（秒）
+    first_start: Optional[float] = None  # 最初のアイテムの処理開始時刻（time.perf_counter）
+    last_end: Optional[float] = None     # 最後のアイテムの処理終了時刻（time.perf_counter）
+
+    @property
+    def wall_time(self) -> float:
+        """最初のアイテムの処理開始から最後のアイテムの処理終了までの経過時間（秒）"""
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    @property
+    def throughput(self) -> float:
+        """実際に達成した件数/秒（入力待ちで空いていた時間を含む）"""
+        if self.wall_time <= 0:
+            return 0.0
+        return self.processed / self.wall_time
+
+    @property
+    def capacity(self) -> float:
+        """ステージ単体で処理できる件数/秒（処理時間のみから求めた理論値、ワーカー数を考慮）"""
+        if self.busy_time <= 0:
+            return 0.0
+        return self.processed * self.workers / self.busy_time
+
+    @property
+    def utilization(self) -> float:
+        """経過時間のうちワーカーが処理していた割合（1に近いステージがボトルネック）"""
+        if self.wall_time <= 0:
+            return 0.0
+        return self.busy_time / (self.workers * self.wall_time)
+
+    def record(self, start: float, end: float, ok: bool):
+        """アイテム1件の処理結果を記録（呼び出し側でロックを取る）"""
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.busy_time += end - start
+        if self.first_start is None or start < self.first_start:
+            self.first_start = start
+        if self.last_end is None or end > self.last_end:
+            self.last_end = end
+
+
+class StagedPipeline:
+    """容量制限付きキューでステージを連結するパイプライン"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 16,
+                 on_error: Optional[Callable[[Any, str, Exception], None]] = None):
+        """
+        Args:
+            stages: 実行順に並べたステージのリスト
+            queue_size: ステージ間キューの最大長
+            on_error: 失敗時のコールバック（元の入力、ステージ名、例外）
+        """
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.on_error = on_error
+        self.stats = [StageStats(name=s.name, workers=max(1, s.workers)) for s in stages]
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Any]) -> List[StageStats]:
+        """
+        全入力をパイプラインに流し、全ステージの完了を待つ
+
+        Args:
+            items: 入力のイテラブル（各要素は最初のステージに渡される）
+
+        Returns:
+            ステージごとの統計
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [stat.workers for stat in self.stats]
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            for n in range(self.stats[index].workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, stage, queues, remaining),
+                    name=f"{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            try:
+                for item in items:
+                    if self._stop.is_set():
+                        break
+                    # 元の入力を引き回してエラー時に特定できるようにする
+                    queues[0].put((item, item))
+            except KeyboardInterrupt:
+                self._stop.set()
+                raise
+            finally:
+                for _ in range(self.stats[0].workers):
+                    queues[0].put(_SENTINEL)
+
+            self._join(threads)
+        except KeyboardInterrupt:
+            # 以降のアイテムは破棄する。呼び出し元が中断後に出力や進捗を書き込む前に、
+            # 処理中のアイテムを終えた各ワーカーがキューを空にして終了するのを待つ
+            self._stop.set()
+            self._join(threads)
+            raise
+
+        return self.stats
+
+    def stop(self):
+        """パイプラインの停止を要求（以降のアイテムは処理されずに破棄される）"""
+        self._stop.set()
+
+    @staticmethod
+    def _join(threads: List[threading.Thread]):
+        """全ワーカーの終了を待つ（待機中もCtrl-Cを受け付けるよう短い間隔で待つ）"""
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+    def _worker(self, index: int, stage: Stage, queues: List[queue.Queue], remaining: List[int]):
+        """ステージのワーカースレッド"""
+        stat = self.stats[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            message = inbox.get()
+            if message is _SENTINEL:
+                break
+            if self._stop.is_set():
+                continue
+
+            origin, value = message
+            start = time.perf_counter()
+            try:
+                result = stage.func(value)
+            except Exception as e:
+                with self._lock:
+                    stat.record(start, time.perf_counter(), ok=False)
+                if self.on_error:
+                    self.on_error(origin, stage.name, e)
+                continue
+
+            with self._lock:
+                stat.record(start, time.perf_counter(), ok=True)
+
+            if outbox is not None:
+                outbox.put((origin, result))
+
+        # 最後に終了したワーカーが下流に終了を伝える
+        with self._lock:
+            remaining[index] -= 1
+            is_last = remaining[index] == 0
+        if is_last and outbox is not None:
+            for _ in range(self.stats[index + 1].workers):
+                outbox.put(_SENTINEL)
+
+
+def log_stage_stats(stats: List[StageStats]):
+    """
+    ステージごとのスループットをログに出力
+
+    実際のスループット（経過時間あたり）と、処理時間から求めた処理能力を並べて出力する。
+    ボトルネックは、入力待ちで空いていた時間が最も短い（稼働率が最も高い）ステージとする。
+
+    Args:
+        stats: StagedPipeline.runの戻り値
+    """
+    logger.info("=== Pipeline Stage Throughput ===")
+    for stat in stats:
+        logger.info(
+            f"{stat.name:>8}: {stat.processed} ok / {stat.failed} failed, "
+            f"{stat.throughput:.2f} items/s over {stat.wall_time:.2f}s, "
+            f"capacity {stat.capacity:.2f} items/s (busy {stat.busy_time:.2f}s x{stat.workers} workers, "
+            f"{stat.utilization:.0%} utilized)"
+        )
+
+    measured = [s for s in stats if s.processed > 0]
+    if measured:
+        bottleneck = max(measured, key=lambda s: s.utilization)
+        logger.info(f"Bottleneck stage: {bottleneck.name} ({bottleneck.utilization:.0%} utilized, "
+                    f"capacity {bottleneck.capacity:.2f} items/s)")
@@ -1,10 +1,26 @@
 """
-進捗管理モジュール - CSV形式で進捗を追跡
+進捗管理モジュール - CSV形式（またはSQLite）で進捗を追跡
+
+完了の記録はCSVを書き直さず、ジャーナルファイル（<progress_file>.journal）に1行追記する。
+読み込み時はCSV（スナップショット）にジャーナルを再生し、ジャーナルが一定量たまったら
+CSVに反映して空にする（コンパクション）。
+
+複数のプロセス（ディレクトリを共有する複数のホストを含む）で1つのクロールを分担する場合は、
+claim_entriesで未完了のエントリーを期限付きで借り受ける（リース）。期限の切れたリースは
+他のワーカーが再び借り受けられるため、停止したワーカーの担当分は自動的にプールへ戻る。
 """
 import csv
+import json
 import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
@@ -34,12 +50,34 @@ class ProgressManager:
         'namespace', 'description', 'completed', 'last_updated'
     ]
 
-    def __init__(self, progress_file: Path):
+    def __init__(self, progress_file: Path, compact_every: int = 500, fsync: bool = True):
         """
         Args:
             progress_file: 進捗CSVファイルのパス
+            compact_every: ジャーナルをCSVに反映するまでの最小記録数
+                           （実際にはエントリー数と大きい方を使うため、反映のコストは記録1件あたりO(1)）
+            fsync: ジャーナルへの追記ごとにディスクへの書き込みを待つか
         """
-        self.progress_file = progress_file
+        self.progress_file = Path(progress_file)
+        self.journal_file = self.progress_file.with_name(self.progress_file.name + '.journal')
+        self.lease_file = self.progress_file.with_name(self.progress_file.name + '.leases')
+        self.lock_file = self.progress_file.with_name(self.progress_file.name + '.lock')
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        # _file_lockの入れ子の深さ（_lockを保持しているスレッドのみが参照する）
+        self._file_lock_depth = 0
+        # mark_completedで存在確認に使うクラス名（CSVが外部で書き換えられたら読み直す）
+        self._names = None
+        self._names_signature = None
+        # ジャーナルの記録数（他のプロセスの追記も含む。Noneは未確認）と、数え終えたファイルの識別子・バイト位置
+        self._journal_records = None
+        self._journal_id = None
+        self._journal_offset = 0
+
+    def exists(self) -> bool:
+        """進捗CSVが存在するか"""
+        return self.progress_file.exists()
 
     def initialize_from_class_list(self, classes: List[ClassInfo]):
         """
@@ -50,44 +88,75 @@ class ProgressManager:
         """
         logger.info(f"Initializing progress file: {self.progress_file}")
 
-        with open(self.progress_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
-            writer.writeheader()
+        entries = [
+            ProgressEntry(
+                full_name=cls.full_name,
+                name=cls.name,
+                url=cls.url,
+                type=cls.type,
+                namespace=cls.namespace,
+                description=cls.description,
+                completed=False,
+                last_updated=""
+            )
+            for cls in classes
+        ]
+        with self._lock, self._file_lock():
+            self._write_snapshot(entries)
+            self._write_leases({})
+
+        logger.info(f"Progress file initialized with {len(classes)} entries")
+
+    def refresh_from_class_list(self, classes: List[ClassInfo]) -> dict:
+        """
+        新しいクラスリストとの差分だけを進捗に反映（既存の完了状態は保持する）
 
+        新しいクラスは未完了として追加し、なくなったクラスは削除し、URLが変わったクラスは
+        再取得が必要なため未完了に戻す。それ以外のエントリーは説明などの情報のみ更新する。
+
+        Args:
+            classes: 最新のClassInfoのリスト
+
+        Returns:
+            差分の辞書（diff_class_listを参照）
+        """
+        with self._lock, self._file_lock():
+            entries_by_name = {entry.full_name: entry for entry in self.load_progress()}
+            diff = diff_class_list({name: e.url for name, e in entries_by_name.items()}, classes)
+            url_changed = set(diff['url_changed'])
+
+            entries = []
             for cls in classes:
-                entry = ProgressEntry(
+                previous = entries_by_name.get(cls.full_name)
+                keep = previous is not None and cls.full_name not in url_changed
+                entries.append(ProgressEntry(
                     full_name=cls.full_name,
                     name=cls.name,
                     url=cls.url,
                     type=cls.type,
                     namespace=cls.namespace,
                     description=cls.description,
-                    completed=False,
-                    last_updated=""
-                )
-                writer.writerow(asdict(entry))
+                    completed=previous.completed if keep else False,
+                    last_updated=previous.last_updated if keep else ""
+                ))
+            self._write_snapshot(entries)
 
-        logger.info(f"Progress file initialized with {len(classes)} entries")
+        log_class_list_diff(diff)
+        return diff
 
     def load_progress(self) -> List[ProgressEntry]:
         """
-        進捗CSVを読み込み
+        進捗CSVを読み込み（ジャーナルの記録を反映した状態を返す）
 
         Returns:
             ProgressEntryのリスト
         """
-        if not self.progress_file.exists():
-            return []
-
-        entries = []
-        with open(self.progress_file, 'r', encoding='utf-8', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # completedをboolに変換
-                row['completed'] = row['completed'].lower() in ('true', '1', 'yes')
-                entries.append(ProgressEntry(**row))
-
-        return entries
+        # 他のプロセスのコンパクションでCSVとジャーナルが読み込みの間に入れ替わらないよう、ファイルロックを取る
+        with self._lock, self._file_lock():
+            entries = self._read_snapshot()
+            if entries:
+                self._replay_journal({entry.full_name: entry for entry in entries})
+            return entries
 
     def get_pending_entries(self, limit: Optional[int] = None) -> List[ProgressEntry]:
         """
@@ -106,37 +175,106 @@ class ProgressManager:
             return pending[:limit]
         return pending
 
+    def get_stale_entries(self, updated_before: datetime, limit: Optional[int] = None) -> List[ProgressEntry]:
+        """
+        最終更新が指定日時より前の完了済みエントリーを古い順に取得
+
+        Args:
+            updated_before: この日時より前に更新されたエントリーを対象とする
+            limit: 取得する最大件数（Noneの場合は全件）
+
+        Returns:
+            ProgressEntryのリスト（最終更新の古い順、更新日時のないものが先頭）
+        """
+        cutoff = updated_before.isoformat()
+        stale = [e for e in self.load_progress() if e.completed and e.last_updated < cutoff]
+        stale.sort(key=lambda e: e.last_updated)
+
+        if limit is not None:
+            return stale[:limit]
+        return stale
+
+    def claim_entries(self, worker_id: str, limit: int, lease_seconds: float = 600.0) -> List[ProgressEntry]:
+        """
+        未完了かつ他のワーカーが借り受けていないエントリーを期限付きで借り受ける
+
+        期限内に完了とならなかったエントリーは、期限切れ後に他のワーカーが借り受けられる。
+        ホストをまたぐ場合、期限の判定は各ホストの時計で行うため時刻を同期しておくこと。
+
+        Args:
+            worker_id: 借り受けるワーカーの識別子
+            limit: 借り受ける最大件数
+            lease_seconds: リースの有効期間（秒）
+
+        Returns:
+            借り受けたProgressEntryのリスト
+        """
+        with self._lock, self._file_lock():
+            now = time.time()
+            entries = self.load_progress()
+            completed = {e.full_name for e in entries if e.completed}
+            leases = {
+                name: lease for name, lease in self._read_leases().items()
+                if lease['expires'] > now and name not in completed
+            }
+
+            claimed = [e for e in entries if not e.completed and e.full_name not in leases][:limit]
+            for entry in claimed:
+                leases[entry.full_name] = {'worker': worker_id, 'expires': now + lease_seconds}
+            self._write_leases(leases)
+
+        logger.debug(f"{worker_id} claimed {len(claimed)} entries")
+        return claimed
+
+    def release_entries(self, worker_id: str, full_names: Optional[List[str]] = None):
+        """
+        借り受けたエントリーを返却（未完了のものは他のワーカーが再び借り受けられる）
+
+        Args:
+            worker_id: 借り受けたワーカーの識別子
+            full_names: 返却するクラスの完全修飾名（Noneの場合はこのワーカーの全リース）
+        """
+        with self._lock, self._file_lock():
+            targets = set(full_names) if full_names is not None else None
+            leases = {
+                name: lease for name, lease in self._read_leases().items()
+                if lease['worker'] != worker_id or (targets is not None and name not in targets)
+            }
+            self._write_leases(leases)
+
     def mark_completed(self, full_name: str):
         """
-        指定されたクラスを完了とマーク
+        指定されたクラスを完了とマーク（ジャーナルに1行追記するだけで、CSVは書き直さない）
 
         Args:
             full_name: クラスの完全修飾名
         """
-        entries = self.load_progress()
+        with self._lock, self._file_lock():
+            if full_name not in self._get_names():
+                logger.warning(f"Entry not found in progress file: {full_name}")
+                return
 
-        # 該当エントリーを更新
-        updated = False
-        for entry in entries:
-            if entry.full_name == full_name:
-                entry.completed = True
-                entry.last_updated = datetime.now().isoformat()
-                updated = True
-                break
+            self._append_journal({
+                'op': 'completed',
+                'full_name': full_name,
+                'last_updated': datetime.now().isoformat()
+            })
 
-        if not updated:
-            logger.warning(f"Entry not found in progress file: {full_name}")
-            return
-
-        # CSVを書き直し
-        with open(self.progress_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
-            writer.writeheader()
-            for entry in entries:
-                writer.writerow(asdict(entry))
+            if self._journal_records >= max(self.compact_every, len(self._names)):
+                self.compact()
 
         logger.debug(f"Marked as completed: {full_name}")
 
+    def compact(self):
+        """ジャーナルの記録をCSVに反映し、ジャーナルを空にする"""
+        with self._lock, self._file_lock():
+            if not self.journal_file.exists():
+                return
+            entries = self.load_progress()
+            # CSVの置き換え後にジャーナルを消す（間で中断しても再生結果は変わらない）
+            self._write_snapshot(entries)
+            logger.debug(f"Compacted progress journal into {self.progress_file}")
+
     def get_statistics(self) -> dict:
         """
         進捗統計を取得
@@ -158,17 +296,485 @@ class ProgressManager:
 
     def reset_progress(self):
         """全てのエントリーを未完了にリセット"""
-        entries = self.load_progress()
+        with self._lock, self._file_lock():
+            entries = self.load_progress()
+
+            for entry in entries:
+                entry.completed = False
+                entry.last_updated = ""
+
+            self._write_snapshot(entries)
+            self._write_leases({})
+
+        logger.info("Progress reset: all entries marked as pending")
+
+    def _read_snapshot(self) -> List[ProgressEntry]:
+        """進捗CSVのみを読み込む（ジャーナルは反映しない）"""
+        if not self.progress_file.exists():
+            return []
+
+        entries = []
+        with open(self.progress_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                # completedをboolに変換
+                row['completed'] = row['completed'].lower() in ('true', '1', 'yes')
+                entries.append(ProgressEntry(**row))
+
+        return entries
 
-        for entry in entries:
-            entry.completed = False
-            entry.last_updated = ""
+    def _write_snapshot(self, entries: List[ProgressEntry]):
+        """
+        進捗CSVを一時ファイル経由で置き換え、ジャーナルを削除する
 
-        with open(self.progress_file, 'w', encoding='utf-8', newline='') as f:
+        Args:
+            entries: 書き込むエントリー
+        """
+        tmp_file = self.progress_file.with_name(self.progress_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
             writer.writeheader()
             for entry in entries:
                 writer.writerow(asdict(entry))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.progress_file)
+
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._journal_records = 0
+        self._journal_id = None
+        self._journal_offset = 0
+        self._names = None
+
+    def _replay_journal(self, entries_by_name: Dict[str, ProgressEntry]):
+        """
+        ジャーナルの記録を順にエントリーへ反映
+
+        Args:
+            entries_by_name: 完全修飾名 → ProgressEntry（その場で更新される）
+        """
+        if not self.journal_file.exists():
+            return
+
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 追記中に中断した末尾の行は無視する
+                    logger.warning(f"Skipping incomplete progress journal record: {line.strip()!r}")
+                    continue
+
+                entry = entries_by_name.get(record.get('full_name'))
+                if entry is not None and record.get('op') == 'completed':
+                    entry.completed = True
+                    entry.last_updated = record.get('last_updated', '')
+
+    def _append_journal(self, record: dict):
+        """
+        ジャーナルに1件追記
+
+        Args:
+            record: 記録する内容
+        """
+        self._count_journal_records()
+
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.journal_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            stat = os.fstat(f.fileno())
+        self._journal_records += 1
+        self._journal_id = (stat.st_dev, stat.st_ino)
+        self._journal_offset = stat.st_size
+
+    def _count_journal_records(self):
+        """
+        他のプロセスの追記・コンパクションを含めてジャーナルの記録数を数え直す（_file_lockを取得した状態で使う）
+
+        同じファイルに追記されただけなら前回数えた位置より後だけを読む。ファイルが置き換わった
+        （コンパクションで削除された）場合は先頭から数え直し、末尾が途中で切れていれば改行で区切る。
+        """
+        try:
+            stat = self.journal_file.stat()
+        except FileNotFoundError:
+            self._journal_records, self._journal_id, self._journal_offset = 0, None, 0
+            return
+
+        journal_id = (stat.st_dev, stat.st_ino)
+        if self._journal_records is None or journal_id != self._journal_id or stat.st_size < self._journal_offset:
+            self._journal_records, self._journal_offset = 0, 0
+
+        with open(self.journal_file, 'rb+') as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.write(b'\n')
+                data += b'\n'
+        self._journal_records += data.count(b'\n')
+        self._journal_id = journal_id
+        self._journal_offset += len(data)
+
+    def _read_leases(self) -> Dict[str, dict]:
+        """リースファイルを読み込む（完全修飾名 → {'worker', 'expires'}）"""
+        if not self.lease_file.exists():
+            return {}
+        try:
+            with open(self.lease_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            logger.warning(f"Ignoring corrupt lease file: {self.lease_file}")
+            return {}
+
+    def _write_leases(self, leases: Dict[str, dict]):
+        """リースファイルを一時ファイル経由で置き換える（リースがなければ削除する）"""
+        if not leases:
+            if self.lease_file.exists():
+                self.lease_file.unlink()
+            return
+
+        tmp_file = self.lease_file.with_name(self.lease_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(leases, f, ensure_ascii=False)
+        os.replace(tmp_file, self.lease_file)
+
+    @contextmanager
+    def _file_lock(self, stale_after: float = 30.0):
+        """
+        プロセス・ホスト間で共有する排他ロック（ロックファイルの排他的作成で取得する）
+
+        self._lockを取得した状態で使う。同じインスタンス内での入れ子の取得はそのまま通す。
+
+        Args:
+            stale_after: 保持者が異常終了したとみなしてロックを破棄するまでの秒数
+        """
+        if self._file_lock_depth:
+            self._file_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._file_lock_depth -= 1
+            return
+
+        self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                self._break_stale_lock(stale_after)
+                time.sleep(0.01)
+        os.close(fd)
+        self._file_lock_depth = 1
+        try:
+            yield
+        finally:
+            self._file_lock_depth = 0
+            self.lock_file.unlink(missing_ok=True)
+
+    def _break_stale_lock(self, stale_after: float):
+        """一定時間以上保持されたままのロックファイルを削除"""
+        try:
+            if time.time() - self.lock_file.stat().st_mtime < stale_after:
+                return
+            # 名前を変えてから消すことで、同時に破棄しようとした他のワーカーと競合しない
+            stale = self.lock_file.with_name(f"{self.lock_file.name}.{uuid.uuid4().hex}")
+            os.rename(self.lock_file, stale)
+        except FileNotFoundError:
+            return
+        stale.unlink(missing_ok=True)
+        logger.warning(f"Removed stale progress lock: {self.lock_file}")
+
+    def _get_names(self) -> set:
+        """進捗CSVに含まれる完全修飾名の集合（CSVが変わった場合のみ読み直す）"""
+        try:
+            stat = self.progress_file.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        if self._names is None or signature != self._names_signature:
+            self._names = {entry.full_name for entry in self._read_snapshot()}
+            self._names_signature = signature
+        return self._names
+
+    def entry_to_class_info(self, entry: ProgressEntry) -> ClassInfo:
+        """
+        ProgressEntryをClassInfoに変換
+
+        Args:
+            entry: ProgressEntry
+
+        Returns:
+            ClassInfo
+        """
+        return ClassInfo(
+            name=entry.name,
+            full_name=entry.full_name,
+            url=entry.url,
+            type=entry.type,
+            namespace=entry.namespace,
+            description=entry.description
+        )
+
+
+class SqliteProgressManager:
+    """
+    SQLiteで進捗を管理するクラス（ProgressManagerと同じインターフェース）
+
+    完了状態・名前空間・更新日時に索引を張り、未完了の取得や統計をCSV全体の読み込みなしで行う。
+    書き込みはトランザクションで行うため、複数のスクレイパープロセスから同時に更新しても
+    互いの記録を上書きしない。
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS progress (
+            position INTEGER PRIMARY KEY,
+            full_name TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL DEFAULT '',
+            url TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            namespace TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            completed INTEGER NOT NULL DEFAULT 0,
+            last_updated TEXT NOT NULL DEFAULT '',
+            lease_owner TEXT NOT NULL DEFAULT '',
+            lease_expires REAL NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_progress_completed ON progress (completed, position)",
+        "CREATE INDEX IF NOT EXISTS idx_progress_namespace ON progress (namespace)",
+        "CREATE INDEX IF NOT EXISTS idx_progress_last_updated ON progress (last_updated)",
+    ]
+
+    ENTRY_COLUMNS = ', '.join(ProgressManager.CSV_HEADERS)
+
+    # リース管理用に後から追加した列（既存のデータベースにはALTER TABLEで追加する）
+    LEASE_COLUMNS = [
+        "lease_owner TEXT NOT NULL DEFAULT ''",
+        "lease_expires REAL NOT NULL DEFAULT 0",
+    ]
+
+    def __init__(self, db_file: Path, csv_file: Optional[Path] = None, timeout: float = 30.0):
+        """
+        Args:
+            db_file: 進捗データベースのパス
+            csv_file: 移行元の進捗CSV（データベースが空の場合に自動で取り込む）
+            timeout: 他のプロセスが書き込み中の場合に待つ最大秒数
+        """
+        self.progress_file = Path(db_file)
+        self.csv_file = Path(csv_file) if csv_file else None
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def exists(self) -> bool:
+        """進捗データベース（または移行元のCSV）が存在するか"""
+        return self.progress_file.exists() or bool(self.csv_file and self.csv_file.exists())
+
+    def initialize_from_class_list(self, classes: List[ClassInfo]):
+        """
+        クラスリストから進捗を初期化
+
+        Args:
+            classes: ClassInfoのリスト
+        """
+        logger.info(f"Initializing progress database: {self.progress_file}")
+
+        rows = [
+            (cls.full_name, cls.name, cls.url, cls.type, cls.namespace, cls.description, 0, "")
+            for cls in classes
+        ]
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM progress")
+            self._insert_rows(conn, rows)
+
+        logger.info(f"Progress database initialized with {len(classes)} entries")
+
+    def refresh_from_class_list(self, classes: List[ClassInfo]) -> dict:
+        """
+        新しいクラスリストとの差分だけを進捗に反映（既存の完了状態は保持する）
+
+        追加・削除・URLが変わった行のみを更新し、それ以外の行は説明などの情報のみ更新する。
+
+        Args:
+            classes: 最新のClassInfoのリスト
+
+        Returns:
+            差分の辞書（diff_class_listを参照）
+        """
+        with self._transaction() as conn:
+            urls = dict(conn.execute("SELECT full_name, url FROM progress").fetchall())
+            diff = diff_class_list(urls, classes)
+            added = set(diff['added'])
+            url_changed = set(diff['url_changed'])
+
+            conn.executemany("DELETE FROM progress WHERE full_name = ?", [(name,) for name in diff['removed']])
+            self._insert_rows(conn, [
+                (cls.full_name, cls.name, cls.url, cls.type, cls.namespace, cls.description, 0, "")
+                for cls in classes if cls.full_name in added
+            ])
+            conn.executemany(
+                "UPDATE progress SET url = ?, completed = 0, last_updated = '', lease_owner = '', lease_expires = 0 "
+                "WHERE full_name = ?",
+                [(cls.url, cls.full_name) for cls in classes if cls.full_name in url_changed]
+            )
+            conn.executemany(
+                "UPDATE progress SET name = ?, type = ?, namespace = ?, description = ? "
+                "WHERE full_name = ? AND NOT (name = ? AND type = ? AND namespace = ? AND description = ?)",
+                [
+                    (cls.name, cls.type, cls.namespace, cls.description,
+                     cls.full_name, cls.name, cls.type, cls.namespace, cls.description)
+                    for cls in classes if cls.full_name not in added
+                ]
+            )
+
+        log_class_list_diff(diff)
+        return diff
+
+    def load_progress(self) -> List[ProgressEntry]:
+        """
+        全エントリーを読み込み
+
+        Returns:
+            ProgressEntryのリスト
+        """
+        return self._query_entries(f"SELECT {self.ENTRY_COLUMNS} FROM progress ORDER BY position")
+
+    def get_pending_entries(self, limit: Optional[int] = None) -> List[ProgressEntry]:
+        """
+        未完了のエントリーを取得
+
+        Args:
+            limit: 取得する最大件数（Noneの場合は全件）
+
+        Returns:
+            未完了のProgressEntryのリスト
+        """
+        return self._query_entries(
+            f"SELECT {self.ENTRY_COLUMNS} FROM progress WHERE completed = 0 ORDER BY position LIMIT ?",
+            (limit if limit is not None else -1,)
+        )
+
+    def get_stale_entries(self, updated_before: datetime, limit: Optional[int] = None) -> List[ProgressEntry]:
+        """
+        最終更新が指定日時より前の完了済みエントリーを古い順に取得
+
+        Args:
+            updated_before: この日時より前に更新されたエントリーを対象とする
+            limit: 取得する最大件数（Noneの場合は全件）
+
+        Returns:
+            ProgressEntryのリスト（最終更新の古い順、更新日時のないものが先頭）
+        """
+        return self._query_entries(
+            f"SELECT {self.ENTRY_COLUMNS} FROM progress "
+            "WHERE last_updated < ? AND completed = 1 ORDER BY last_updated, position LIMIT ?",
+            (updated_before.isoformat(), limit if limit is not None else -1)
+        )
+
+    def claim_entries(self, worker_id: str, limit: int, lease_seconds: float = 600.0) -> List[ProgressEntry]:
+        """
+        未完了かつ他のワーカーが借り受けていないエントリーを期限付きで借り受ける
+
+        Args:
+            worker_id: 借り受けるワーカーの識別子
+            limit: 借り受ける最大件数
+            lease_seconds: リースの有効期間（秒）
+
+        Returns:
+            借り受けたProgressEntryのリスト
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {self.ENTRY_COLUMNS} FROM progress "
+                "WHERE completed = 0 AND lease_expires <= ? ORDER BY position LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE progress SET lease_owner = ?, lease_expires = ? WHERE full_name = ?",
+                [(worker_id, now + lease_seconds, row[0]) for row in rows]
+            )
+
+        logger.debug(f"{worker_id} claimed {len(rows)} entries")
+        return [self._row_to_entry(row) for row in rows]
+
+    def release_entries(self, worker_id: str, full_names: Optional[List[str]] = None):
+        """
+        借り受けたエントリーを返却（未完了のものは他のワーカーが再び借り受けられる）
+
+        Args:
+            worker_id: 借り受けたワーカーの識別子
+            full_names: 返却するクラスの完全修飾名（Noneの場合はこのワーカーの全リース）
+        """
+        with self._transaction() as conn:
+            if full_names is None:
+                conn.execute(
+                    "UPDATE progress SET lease_owner = '', lease_expires = 0 WHERE lease_owner = ?",
+                    (worker_id,)
+                )
+            else:
+                conn.executemany(
+                    "UPDATE progress SET lease_owner = '', lease_expires = 0 "
+                    "WHERE lease_owner = ? AND full_name = ?",
+                    [(worker_id, name) for name in full_names]
+                )
+
+    def mark_completed(self, full_name: str):
+        """
+        指定されたクラスを完了とマーク（リースも返却する）
+
+        Args:
+            full_name: クラスの完全修飾名
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE progress SET completed = 1, last_updated = ?, lease_owner = '', lease_expires = 0 "
+                "WHERE full_name = ?",
+                (datetime.now().isoformat(), full_name)
+            )
+
+        if cursor.rowcount == 0:
+            logger.warning(f"Entry not found in progress database: {full_name}")
+            return
+
+        logger.debug(f"Marked as completed: {full_name}")
+
+    def compact(self):
+        """WALの内容をデータベース本体に反映"""
+        with self._lock:
+            self._connect().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def get_statistics(self) -> dict:
+        """
+        進捗統計を取得
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            total_count, completed_count = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM progress"
+            ).fetchone()
+        pending_count = total_count - completed_count
+
+        return {
+            'total': total_count,
+            'completed': completed_count,
+            'pending': pending_count,
+            'progress_percentage': (completed_count / total_count * 100) if total_count > 0 else 0
+        }
+
+    def reset_progress(self):
+        """全てのエントリーを未完了にリセット"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE progress SET completed = 0, last_updated = '', lease_owner = '', lease_expires = 0")
 
         logger.info("Progress reset: all entries marked as pending")
 
@@ -190,3 +796,147 @@ class ProgressManager:
             namespace=entry.namespace,
             description=entry.description
         )
+
+    def close(self):
+        """データベース接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を開き、スキーマの作成とCSVからの移行を行う（ロック取得済みで呼ぶこと）"""
+        if self._conn is not None:
+            return self._conn
+
+        self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=Noneでトランザクションを明示的に管理する
+        conn = sqlite3.connect(str(self.progress_file), timeout=self.timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(progress)")}
+        for column in self.LEASE_COLUMNS:
+            if column.split()[0] not in existing:
+                conn.execute(f"ALTER TABLE progress ADD COLUMN {column}")
+        self._conn = conn
+
+        self._migrate_from_csv()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """書き込みトランザクション（開始時に書き込みロックを取り、他プロセスの書き込みと直列化する）"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _migrate_from_csv(self):
+        """データベースが空で移行元のCSVがある場合、その内容を取り込む"""
+        if not self.csv_file or not self.csv_file.exists():
+            return
+
+        with self._transaction() as conn:
+            # 他のプロセスが先に移行・初期化していれば何もしない
+            if conn.execute("SELECT 1 FROM progress LIMIT 1").fetchone():
+                return
+            entries = ProgressManager(self.csv_file).load_progress()
+            self._insert_rows(conn, [
+                (e.full_name, e.name, e.url, e.type, e.namespace, e.description, int(e.completed), e.last_updated)
+                for e in entries
+            ])
+
+        logger.info(f"Migrated {len(entries)} entries from {self.csv_file} to {self.progress_file}")
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: list):
+        conn.executemany(
+            f"INSERT OR REPLACE INTO progress ({self.ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _query_entries(self, sql: str, params: tuple = ()) -> List[ProgressEntry]:
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> ProgressEntry:
+        return ProgressEntry(
+            full_name=row[0],
+            name=row[1],
+            url=row[2],
+            type=row[3],
+            namespace=row[4],
+            description=row[5],
+            completed=bool(row[6]),
+            last_updated=row[7]
+        )
+
+
+def diff_class_list(urls: Dict[str, str], classes: List[ClassInfo]) -> dict:
+    """
+    進捗に記録されたクラスと新しいクラスリストの差分を求める
+
+    Args:
+        urls: 進捗に記録された完全修飾名 → URL
+        classes: 最新のClassInfoのリスト
+
+    Returns:
+        {'added': 追加されたクラス名, 'removed': なくなったクラス名,
+         'url_changed': URLが変わったクラス名, 'unchanged': 変化のないクラス数}
+    """
+    new_names = {cls.full_name for cls in classes}
+    added = [cls.full_name for cls in classes if cls.full_name not in urls]
+    url_changed = [cls.full_name for cls in classes if cls.full_name in urls and urls[cls.full_name] != cls.url]
+    removed = [name for name in urls if name not in new_names]
+
+    return {
+        'added': added,
+        'removed': removed,
+        'url_changed': url_changed,
+        'unchanged': len(classes) - len(added) - len(url_changed),
+    }
+
+
+def log_class_list_diff(diff: dict):
+    """クラスリストの差分をログに出力"""
+    logger.info(f"Class list refreshed: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                f"{len(diff['url_changed'])} URL changed, {diff['unchanged']} unchanged")
+    for name in diff['removed']:
+        logger.debug(f"Removed from class list: {name}")
+    for name in diff['url_changed']:
+        logger.debug(f"URL changed: {name}")
+
+
+def default_worker_id() -> str:
+    """このプロセスを識別するワーカーID（ホスト名:プロセスID）"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def create_progress_manager(config: dict):
+    """
+    設定に応じた進捗管理クラスを生成
+
+    Args:
+        config: config.yaml全体の辞書（output.progress_fileとprogressセクションを参照）
+
+    Returns:
+        ProgressManagerまたはSqliteProgressManager
+    """
+    progress_file = Path(config['output']['progress_file'])
+    progress_config = config.get('progress', {})
+    backend = progress_config.get('backend', 'csv')
+    if backend == 'sqlite':
+        db_file = progress_config.get('db_file') or progress_file.with_suffix('.db')
+        return SqliteProgressManager(Path(db_file), csv_file=progress_file)
+    if backend == 'csv':
+        return ProgressManager(progress_file)
+    raise ValueError(f"Unknown progress backend: {backend}")
@@ -0,0 +1,256 @@
+"""
+レート制限モジュール
+
+複数スレッドから共有されるトークンバケット方式のレートリミッターを提供する。
+リクエストごとに固定時間スリープする代わりに、全ワーカーで「秒あたりのリクエスト数」を
+共有することで、サーバーへの負荷を変えずにネットワーク待ち時間を重ね合わせる。
+
+AdaptiveRateLimiterは、応答時間と429/503応答に応じてレートと同時リクエスト数を
+AIMD（加算的増加・乗算的減少）で調整する。
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """スレッドセーフなトークンバケット"""
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        """
+        Args:
+            rate: 1秒あたりに補充されるトークン数（Noneまたは0以下の場合は無制限）
+            capacity: バケットの最大トークン数（バースト許容量）
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float, capacity: float = 1.0) -> 'TokenBucket':
+        """
+        リクエスト間ディレイ（秒）からリミッターを生成
+
+        Args:
+            delay: リクエスト間のディレイ（秒）
+            capacity: バケットの最大トークン数
+
+        Returns:
+            TokenBucket
+        """
+        rate = 1.0 / delay if delay and delay > 0 else None
+        return cls(rate, capacity)
+
+    def _refill(self, now: float):
+        """経過時間に応じてトークンを補充（ロック取得済みで呼ぶこと）"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        トークンを取得する（不足している場合は補充されるまでブロック）
+
+        Args:
+            tokens: 消費するトークン数
+        """
+        if self.rate is None:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def release(self, latency: Optional[float] = None, status_code: Optional[int] = None):
+        """
+        リクエストの完了を通知（固定レートのため何もしない）
+
+        Args:
+            latency: 応答時間（秒）
+            status_code: HTTPステータスコード（応答がなかった場合はNone）
+        """
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    サーバーの応答に応じてレートと同時リクエスト数を調整するリミッター
+
+    応答が速い間は window 件ごとにレートを rate_step ずつ、同時リクエスト数を1ずつ増やし、
+    429/503応答または応答時間の悪化（指数移動平均が最小値の latency_threshold 倍を超える）で
+    両方を backoff_factor 倍に減らす。減少は cooldown 秒に1回までとし、同時に失敗した
+    リクエストで過剰に減らさないようにする。
+    """
+
+    BACKOFF_STATUS_CODES = frozenset({429, 503})
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, max_concurrency: int = 1,
+                 capacity: float = 1.0, rate_step: float = 0.1, backoff_factor: float = 0.5,
+                 latency_threshold: float = 2.0, window: int = 10, cooldown: float = 5.0,
+                 latency_smoothing: float = 0.2):
+        """
+        Args:
+            rate: 初期の秒間リクエスト数
+            min_rate: 秒間リクエスト数の下限
+            max_rate: 秒間リクエスト数の上限
+            max_concurrency: 同時リクエスト数の上限（開始時は1）
+            capacity: バケットの最大トークン数
+            rate_step: 増加時に加える秒間リクエスト数
+            backoff_factor: 減少時に掛ける係数
+            latency_threshold: 応答時間の悪化とみなす、最小の応答時間に対する倍率
+            window: 増加までに必要な連続した良好な応答数
+            cooldown: 減少の最小間隔（秒）
+            latency_smoothing: 応答時間の指数移動平均の重み
+        """
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        super().__init__(min(max(rate, self.min_rate), self.max_rate), capacity)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.concurrency = 1
+        self.rate_step = rate_step
+        self.backoff_factor = backoff_factor
+        self.latency_threshold = latency_threshold
+        self.window = max(1, int(window))
+        self.cooldown = cooldown
+        self.latency_smoothing = latency_smoothing
+
+        self.latency = None
+        self.baseline_latency = None
+        self._good_responses = 0
+        self._last_decrease = float('-inf')
+        self._in_flight = 0
+        self._slots = threading.Condition(self._lock)
+
+    @classmethod
+    def from_config(cls, delay: float, max_concurrency: int, config: dict,
+                    capacity: float = 1.0) -> 'AdaptiveRateLimiter':
+        """
+        config.yamlのscraping.adaptiveセクションからリミッターを生成
+
+        Args:
+            delay: 初期のリクエスト間ディレイ（秒）
+            max_concurrency: 同時リクエスト数の上限（ワーカー数）
+            config: adaptiveセクションの辞書
+            capacity: バケットの最大トークン数
+
+        Returns:
+            AdaptiveRateLimiter
+        """
+        min_rate = config.get('min_rate', 0.2)
+        max_rate = config.get('max_rate', 5.0)
+        return cls(
+            rate=1.0 / delay if delay and delay > 0 else max_rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            max_concurrency=max_concurrency,
+            capacity=capacity,
+            rate_step=config.get('rate_step', 0.1),
+            backoff_factor=config.get('backoff_factor', 0.5),
+            latency_threshold=config.get('latency_threshold', 2.0),
+            window=config.get('window', 10),
+            cooldown=config.get('cooldown', 5.0),
+        )
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        同時リクエスト数の枠とトークンを取得する（不足している場合はブロック）
+
+        取得後は必ずreleaseを呼ぶこと。
+
+        Args:
+            tokens: 消費するトークン数
+        """
+        with self._slots:
+            while self._in_flight >= self.concurrency:
+                self._slots.wait()
+            self._in_flight += 1
+        try:
+            super().acquire(tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def release(self, latency: Optional[float] = None, status_code: Optional[int] = None):
+        """
+        リクエストの完了を通知し、応答に応じてレートと同時リクエスト数を調整する
+
+        Args:
+            latency: 応答時間（秒）
+            status_code: HTTPステータスコード（応答がなかった場合はNone）
+        """
+        with self._lock:
+            if latency is not None:
+                self._observe_latency(latency)
+
+            if status_code in self.BACKOFF_STATUS_CODES:
+                self._decrease(f"HTTP {status_code}")
+            elif self._is_slow():
+                self._decrease(f"latency {self.latency:.2f}s > {self.latency_threshold:g}x "
+                               f"baseline {self.baseline_latency:.2f}s")
+            elif status_code is not None and status_code < 400:
+                self._good_responses += 1
+                if self._good_responses >= self.window:
+                    self._increase()
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _observe_latency(self, latency: float):
+        """応答時間の指数移動平均と、その最小値（基準）を更新（ロック取得済みで呼ぶこと）"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.latency_smoothing * (latency - self.latency)
+        if self.baseline_latency is None or self.latency < self.baseline_latency:
+            self.baseline_latency = self.latency
+
+    def _is_slow(self) -> bool:
+        return (self.latency is not None and self.baseline_latency
+                and self.latency > self.baseline_latency * self.latency_threshold)
+
+    def _increase(self):
+        """レートと同時リクエスト数を加算的に増やす（ロック取得済みで呼ぶこと）"""
+        self._good_responses = 0
+        rate = min(self.max_rate, self.rate + self.rate_step)
+        concurrency = min(self.max_concurrency, self.concurrency + 1)
+        if rate == self.rate and concurrency == self.concurrency:
+            return
+        self._set_rate(rate)
+        self.concurrency = concurrency
+        self._slots.notify_all()
+        logger.info(f"Adaptive rate limiter: increased to {self.rate:.2f} req/s, "
+                    f"concurrency {self.concurrency} (latency {self.latency or 0:.2f}s)")
+
+    def _decrease(self, reason: str):
+        """レートと同時リクエスト数を乗算的に減らす（ロック取得済みで呼ぶこと）"""
+        self._good_responses = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._set_rate(max(self.min_rate, self.rate * self.backoff_factor))
+        self.concurrency = max(1, int(self.concurrency * self.backoff_factor))
+        # 悪化した応答時間を新しい基準とし、回復するまで減少を繰り返さない
+        self.baseline_latency = self.latency
+        logger.info(f"Adaptive rate limiter: backed off to {self.rate:.2f} req/s, "
+                    f"concurrency {self.concurrency} ({reason})")
+
+    def _set_rate(self, rate: float):
+        """変更前のレートでトークンを補充してからレートを変える（ロック取得済みで呼ぶこと）"""
+        self._refill(time.monotonic())
+        self.rate = rate
@@ -0,0 +1,67 @@
+"""
+描画モデルモジュール
+
+ClassDetailをMarkdown/JSONの両方で使う形に1回だけ正規化する。メンバーは
+静的/インスタンスに振り分け済みで、各出力形式はこのモデルを読むだけでよい。
+パーサーが出力用のキーだけを持つメンバー情報を作るため、メンバーの辞書はコピーせずに共有する。
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+try:
+    from src.parser import ClassDetail, ClassInfo
+except ModuleNotFoundError:
+    from parser import ClassDetail, ClassInfo
+
+# リファレンスのページのURL（ClassInfo.urlはこれからの相対パス）
+DOCUMENT_URL_BASE = "https://rpgbakin.com/csreference/doc/ja/"
+
+
+@dataclass
+class ClassRenderModel:
+    """出力形式に依存しないクラスの描画モデル"""
+    info: ClassInfo
+    document_url: str
+    description_full: str = ""
+    inherits_from: List[str] = field(default_factory=list)
+    instance_methods: List[dict] = field(default_factory=list)
+    static_methods: List[dict] = field(default_factory=list)
+    # プロパティはJSONでは元の順序のまま、Markdownでは静的/インスタンスに分けて出力する
+    properties: List[dict] = field(default_factory=list)
+    instance_properties: List[dict] = field(default_factory=list)
+    static_properties: List[dict] = field(default_factory=list)
+    fields: List[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_detail(cls, detail: ClassDetail) -> 'ClassRenderModel':
+        """
+        ClassDetailから描画モデルを作成（メンバーを1回ずつ走査して振り分ける）
+
+        Args:
+            detail: ClassDetailオブジェクト
+
+        Returns:
+            ClassRenderModel
+        """
+        model = cls(
+            info=detail.info,
+            document_url=f"{DOCUMENT_URL_BASE}{detail.info.url}",
+            description_full=detail.description_full,
+            inherits_from=detail.inherits_from,
+            properties=detail.properties,
+            fields=detail.fields,
+        )
+
+        for method in detail.methods:
+            if method.get('is_static', False):
+                model.static_methods.append(method)
+            else:
+                model.instance_methods.append(method)
+
+        for prop in detail.properties:
+            if prop.get('is_static', False):
+                model.static_properties.append(prop)
+            else:
+                model.instance_properties.append(prop)
+
+        return model
@@ -0,0 +1,186 @@
+"""
+リトライポリシーモジュール
+
+取得の失敗を恒久的なもの（404など）と一時的なもの（429、5xx、接続エラーなど）に分類し、
+一時的なものだけを指数バックオフ（Retry-Afterがあればその秒数）で再試行する。
+再試行しても失敗したページは DeferredRetryQueue に積み、セッションの最後にまとめて再試行する。
+"""
+import logging
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+
+import requests
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# 時間をおけば成功する可能性があるステータスコード（それ以外の4xxは恒久的な失敗とみなす）
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """ステータスに応じて再試行するかを判断するリトライポリシー"""
+
+    def __init__(self, max_retries: int = 3, backoff_min: float = 2.0, backoff_max: float = 10.0,
+                 retry_after_max: float = 120.0, deferred_rounds: int = 1, deferred_delay: float = 30.0,
+                 deferred_jitter: float = 0.5):
+        """
+        Args:
+            max_retries: 一時的な失敗を再試行する回数（最初の取得を含まない）
+            backoff_min: 再試行までの最小待ち時間（秒）
+            backoff_max: 再試行までの最大待ち時間（秒）
+            retry_after_max: Retry-Afterに従って待つ最大秒数
+            deferred_rounds: セッションの最後に保留分を再試行する回数
+            deferred_delay: 保留分を再試行するまでの待ち時間（秒）
+            deferred_jitter: 保留分の待ち時間に加える揺らぎの割合（複数プロセスの再試行を分散させる）
+        """
+        self.max_retries = max(0, int(max_retries))
+        self.retry_after_max = retry_after_max
+        self.deferred_rounds = max(0, int(deferred_rounds))
+        self.deferred_delay = deferred_delay
+        self.deferred_jitter = deferred_jitter
+        self._backoff = wait_exponential(multiplier=1, min=backoff_min, max=backoff_max)
+
+    @classmethod
+    def from_config(cls, scraping_config: dict) -> 'RetryPolicy':
+        """
+        config.yamlのscrapingセクションからポリシーを生成
+
+        Args:
+            scraping_config: scrapingセクションの辞書
+
+        Returns:
+            RetryPolicy
+        """
+        retry_config = scraping_config.get('retry', {})
+        return cls(
+            max_retries=scraping_config.get('max_retries', 3),
+            backoff_min=retry_config.get('backoff_min', 2.0),
+            backoff_max=retry_config.get('backoff_max', 10.0),
+            retry_after_max=retry_config.get('retry_after_max', 120.0),
+            deferred_rounds=retry_config.get('deferred_rounds', 1),
+            deferred_delay=retry_config.get('deferred_delay', 30.0),
+            deferred_jitter=retry_config.get('deferred_jitter', 0.5),
+        )
+
+    @staticmethod
+    def is_transient(error: BaseException) -> bool:
+        """
+        時間をおけば成功する可能性のある失敗か
+
+        Args:
+            error: 取得時の例外
+
+        Returns:
+            一時的な失敗ならTrue
+        """
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return status in TRANSIENT_STATUS_CODES or status >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                                  requests.exceptions.ChunkedEncodingError, ConnectionError))
+
+    @staticmethod
+    def retry_after(error: BaseException) -> Optional[float]:
+        """
+        レスポンスのRetry-Afterヘッダー（秒数またはHTTP日付）を秒数で取得
+
+        Args:
+            error: 取得時の例外
+
+        Returns:
+            待つべき秒数（指定がない場合はNone）
+        """
+        response = getattr(error, 'response', None)
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def wait(self, retry_state) -> float:
+        """次の再試行までの待ち時間（Retry-Afterがあれば優先する。tenacityのwaitとして使う）"""
+        retry_after = self.retry_after(retry_state.outcome.exception())
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_max)
+        return self._backoff(retry_state)
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        一時的な失敗のみ再試行しながら関数を呼び出す（恒久的な失敗は即座に送出する）
+
+        Returns:
+            関数の戻り値
+        """
+        retrying = Retrying(
+            stop=stop_after_attempt(self.max_retries + 1),
+            wait=self.wait,
+            retry=retry_if_exception(self.is_transient),
+            reraise=True,
+        )
+        return retrying(func, *args, **kwargs)
+
+    def deferred_wait(self, retry_after: Optional[float] = None) -> float:
+        """
+        保留分を再試行するまでの待ち時間（揺らぎを加え、Retry-Afterより短くはしない）
+
+        Args:
+            retry_after: 保留したページで指定されたRetry-Afterの最大値
+
+        Returns:
+            待ち時間（秒）
+        """
+        delay = self.deferred_delay * random.uniform(1.0, 1.0 + self.deferred_jitter)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_after_max))
+        return delay
+
+
+class DeferredRetryQueue:
+    """再試行しても一時的な失敗が続いたURLを、セッションの最後まで保留するスレッドセーフなキュー"""
+
+    def __init__(self):
+        self._items: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, url: str, retry_after: Optional[float] = None):
+        """
+        URLを保留する
+
+        Args:
+            url: 取得に失敗したURL
+            retry_after: レスポンスで指定されたRetry-After（秒）
+        """
+        with self._lock:
+            self._items[url] = retry_after
+
+    def take(self, urls: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        指定したURLのうち保留中のものを取り出す
+
+        Args:
+            urls: 対象のURL
+
+        Returns:
+            URL → Retry-After（秒、指定がない場合はNone）
+        """
+        with self._lock:
+            return {url: self._items.pop(url) for url in urls if url in self._items}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -1,23 +1,35 @@
 """
 HTMLスクレイピング基盤モジュール
 """
-import time
 import logging
-from typing import Optional
-from pathlib import Path
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
 
 import requests
 from bs4 import BeautifulSoup
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type
-)
 import yaml
 
+try:
+    from src.rate_limiter import AdaptiveRateLimiter, TokenBucket
+    from src.page_cache import RawPage, create_page_cache
+    from src.retry_policy import DeferredRetryQueue, RetryPolicy
+except ModuleNotFoundError:
+    from rate_limiter import AdaptiveRateLimiter, TokenBucket
+    from page_cache import RawPage, create_page_cache
+    from retry_policy import DeferredRetryQueue, RetryPolicy
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# 並列取得で先行させる件数（ワーカー数の倍数）。消費が遅くても取得済みの結果をこれ以上ためない
+PREFETCH_PER_WORKER = 2
+
 
 class BakinScraper:
     """RPG Developer Bakinドキュメントスクレイパー"""
@@ -34,8 +46,38 @@ class BakinScraper:
         self.headers = {
             'User-Agent': self.config['scraping']['user_agent']
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # 並列取得のワーカー数（1の場合は従来通りの逐次取得）
+        self.workers = max(1, int(self.config['scraping'].get('workers', 1)))
+        # 全ワーカーで共有するレートリミッター（delayと同じ秒間リクエスト数を維持、
+        # 適応モードではサーバーの応答に応じてレートと同時リクエスト数を調整）
+        adaptive_config = self.config['scraping'].get('adaptive', {})
+        if adaptive_config.get('enabled', False):
+            self.rate_limiter = AdaptiveRateLimiter.from_config(
+                self.delay, self.workers, adaptive_config, capacity=self.config['scraping'].get('burst', 1)
+            )
+        else:
+            self.rate_limiter = TokenBucket.from_delay(
+                self.delay, capacity=self.config['scraping'].get('burst', 1)
+            )
+        # 一時的な失敗のみ再試行するリトライポリシーと、再試行しても失敗したURLの保留キュー
+        self.retry_policy = RetryPolicy.from_config(self.config['scraping'])
+        self.deferred = DeferredRetryQueue()
+        # 再検証モード（キャッシュ済みページも条件付きGETで更新を確認する）
+        self.revalidate = self.config['scraping'].get('revalidate', False)
+        # ページキャッシュ（html/ ディレクトリまたはパックファイル）
+        self.cache = create_page_cache(self.config)
+        # requests.Sessionはスレッドセーフではないため、スレッドごとに保持する
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """現在のスレッド用のHTTPセッション"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
 
     def _load_config(self, config_path: str) -> dict:
         """設定ファイルを読み込む"""
@@ -46,6 +88,7 @@ class BakinScraper:
         """
         指定されたURLからHTMLを取得してBeautifulSoupオブジェクトを返す
         ローカルキャッシュがあればそこから読み込む
+        （再検証モードでは条件付きGETでキャッシュが最新か確認してから読み込む）
 
         Args:
             url: 取得するURL（相対パスまたは絶対パス）
@@ -53,64 +96,276 @@ class BakinScraper:
         Returns:
             BeautifulSoupオブジェクト、失敗時はNone
         """
-        # 相対パスの場合はベースURLと結合
-        full_url = url if url.startswith('http') else f"{self.base_url}/{url}"
+        page = self.fetch_raw_page(url)
+        return BeautifulSoup(page.content, 'html.parser', from_encoding=page.encoding)
 
-        # URLからファイル名を抽出
-        filename = url.split('/')[-1] if '/' in url else url
-        cache_dir = Path("html")
-        cache_file = cache_dir / filename
+    def fetch_raw_page(self, url: str) -> RawPage:
+        """
+        指定されたURLのHTMLをレスポンスのバイト列のまま取得する
+        ローカルキャッシュがあればそこから読み込む
+
+        Args:
+            url: 取得するURL（相対パスまたは絶対パス）
 
-        # キャッシュファイルが存在する場合はそこから読み込む
-        if cache_file.exists():
-            logger.info(f"Loading from cache: {cache_file}")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return BeautifulSoup(content, 'html.parser')
+        Returns:
+            RawPage
+        """
+        full_url = self._to_full_url(url)
+
+        # キャッシュが存在する場合はそこから読み込む
+        if self.cache.exists(full_url):
+            if self.revalidate:
+                try:
+                    self.revalidate_page(url)
+                except requests.RequestException as e:
+                    # 再検証できなくても、使えるキャッシュがあればそれを返す（保留もしない）
+                    logger.warning(f"Revalidation failed, using cached copy of {url}: {e}")
+                    self.deferred.take([full_url])
+            logger.info(f"Loading from cache: {url}")
+            return self.cache.get(full_url)
 
         # キャッシュがない場合はWebから取得
         logger.info(f"Fetching from web: {full_url}")
-        soup = self._fetch_from_web(full_url)
-
-        # キャッシュディレクトリを作成
-        cache_dir.mkdir(exist_ok=True)
+        response = self._fetch_from_web(full_url)
 
         # キャッシュに保存
-        if soup:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
-            logger.info(f"Saved to cache: {cache_file}")
+        return self._save_to_cache(full_url, response)
+
+    def revalidate_page(self, url: str) -> bool:
+        """
+        キャッシュ済みページを条件付きGETで再検証し、変更があればキャッシュを更新する
+
+        保存済みのETag/Last-Modifiedを送信し、304 Not Modifiedであれば本文は取得しない。
 
-        return soup
+        Args:
+            url: ページのURL（相対パスまたは絶対パス）
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((requests.RequestException, ConnectionError))
-    )
-    def _fetch_from_web(self, url: str) -> Optional[BeautifulSoup]:
+        Returns:
+            ページが更新された（またはキャッシュがなく新規取得した）場合はTrue
         """
-        Webから直接HTMLを取得（リトライ機構付き）
+        full_url = self._to_full_url(url)
+        cached = self.cache.exists(full_url)
+        validators = self.cache.get_validators(full_url) if cached else {}
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        logger.info(f"Revalidating: {full_url}")
+        response = self._fetch_from_web(full_url, headers=headers)
+
+        if response.status_code == 304:
+            # 本文は変わっていないので検証時刻のみ更新
+            validators['fetched_at'] = datetime.now().isoformat()
+            self.cache.update_validators(full_url, validators)
+            logger.debug(f"Not modified: {full_url}")
+            return False
+
+        changed = True
+        if cached:
+            # バリデータを返さないサーバーでも、内容が同一なら変更なしとみなす
+            changed = self.cache.get(full_url).content != response.content
+
+        self._save_to_cache(full_url, response)
+        return changed
+
+    def load_validators(self, url: str) -> dict:
+        """
+        キャッシュ済みページのバリデータ（ETag, Last-Modified, 取得時刻）を読み込む
+
+        Args:
+            url: ページのURL
+
+        Returns:
+            バリデータの辞書（キャッシュがない場合は空の辞書）
+        """
+        return self.cache.get_validators(self._to_full_url(url))
+
+    def _save_to_cache(self, full_url: str, response: requests.Response) -> RawPage:
+        """取得したページ（レスポンスのバイト列そのまま）とバリデータをキャッシュに保存"""
+        page = RawPage(content=response.content, encoding=self._get_declared_encoding(response))
+        self.cache.put(full_url, page, {
+            'url': full_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': datetime.now().isoformat()
+        })
+        logger.info(f"Saved to cache: {full_url}")
+        return page
+
+    @staticmethod
+    def _get_declared_encoding(response: requests.Response) -> Optional[str]:
+        """
+        Content-Typeヘッダーで明示されたエンコーディングを取得
+
+        charsetが明示されていない場合、requestsはtext/*をISO-8859-1とみなすため使用せず、
+        HTML内の<meta>宣言からの判定をパーサーに任せる。
+        """
+        content_type = response.headers.get('Content-Type', '')
+        if 'charset' not in content_type.lower():
+            return None
+        return requests.utils.get_encoding_from_headers(response.headers)
+
+    def _to_full_url(self, url: str) -> str:
+        """相対パスの場合はベースURLと結合"""
+        return url if url.startswith('http') else f"{self.base_url}/{url}"
+
+    def _fetch_from_web(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """
+        Webから直接HTMLを取得（リトライポリシーに従って再試行）
+
+        404などの恒久的な失敗は再試行せずに送出する。一時的な失敗が再試行後も続いた場合は
+        URLを保留キューに積んでから送出する（セッションの最後に再試行される）。
 
         Args:
             url: 取得するURL（完全なURL）
+            headers: 追加のリクエストヘッダー（条件付きGET用）
 
         Returns:
-            BeautifulSoupオブジェクト、失敗時はNone
+            レスポンス（条件付きGETの場合は304を含む）
         """
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            return self.retry_policy.call(self._request, url, headers)
+        except Exception as e:
+            # 各試行の失敗はDEBUGに留め、諦めた（または保留した）ときだけERRORを1回記録する
+            if self.retry_policy.is_transient(e):
+                self.deferred.add(url, self.retry_policy.retry_after(e))
+                logger.error(f"Failed to fetch {url} (deferred to the end of the session): {e}")
+            else:
+                logger.error(f"Failed to fetch {url}: {e}")
+            raise
+
+    def _request(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """1回分のリクエスト（エラーステータスは例外として送出）"""
+        # 共有レートリミッターでリクエスト間隔を制御（サーバーに負荷をかけないため）
+        self.rate_limiter.acquire()
+        start = time.monotonic()
+        status_code = None
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+            status_code = response.status_code
             response.raise_for_status()
+            return response
 
-            # ディレイを入れる（サーバーに負荷をかけないため）
-            time.sleep(self.delay)
+        except requests.RequestException as e:
+            logger.debug(f"Request failed: {url}: {e}")
+            raise
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup
+        finally:
+            # 応答時間とステータスをリミッターに通知（適応モードではレートの調整に使われる）
+            self.rate_limiter.release(time.monotonic() - start, status_code)
 
-        except requests.RequestException as e:
+    def take_deferred(self, urls: List[str]) -> Dict[str, Optional[float]]:
+        """
+        指定したURLのうち、一時的な失敗で保留されているものを取り出す
+
+        Args:
+            urls: 対象のURL（相対パスまたは絶対パス）
+
+        Returns:
+            入力のURL → Retry-After（秒、指定がない場合はNone）
+        """
+        full_urls = {self._to_full_url(url): url for url in urls}
+        return {full_urls[url]: retry_after for url, retry_after in self.deferred.take(full_urls).items()}
+
+    def is_cached(self, url: str) -> bool:
+        """
+        ページがキャッシュ済みか
+
+        Args:
+            url: ページのURL（相対パスまたは絶対パス）
+        """
+        return self.cache.exists(self._to_full_url(url))
+
+    def read_cached_page(self, url: str) -> Optional[RawPage]:
+        """
+        キャッシュ済みページのHTMLをバイト列で読み込む（Webへはアクセスしない）
+
+        Args:
+            url: ページのURL
+
+        Returns:
+            RawPage、キャッシュがない場合はNone
+        """
+        return self.cache.get(self._to_full_url(url))
+
+    def fetch_pages(self, urls: List[str], workers: Optional[int] = None) -> Iterator[Optional[RawPage]]:
+        """
+        複数ページを並列に取得する
+
+        結果は入力URLと同じ順序で返される。リクエスト頻度は共有レートリミッターで
+        制限されるため、ワーカー数を増やしてもサーバーへの秒間リクエスト数は変わらない。
+
+        Args:
+            urls: 取得するURLのリスト
+            workers: ワーカー数（Noneの場合は設定値）
+
+        Returns:
+            RawPage（失敗時はNone）のイテレータ
+        """
+        return self._map_concurrent(self._fetch_page_safe, urls, workers)
+
+    def revalidate_pages(self, urls: List[str], workers: Optional[int] = None) -> Iterator[Optional[bool]]:
+        """
+        複数ページを並列に再検証する（結果は入力URLと同じ順序）
+
+        Args:
+            urls: 再検証するURLのリスト
+            workers: ワーカー数（Noneの場合は設定値）
+
+        Returns:
+            更新有無（失敗時はNone）のイテレータ
+        """
+        return self._map_concurrent(self._revalidate_page_safe, urls, workers)
+
+    def _map_concurrent(self, func: Callable[[str], T], urls: List[str], workers: Optional[int]) -> Iterator[T]:
+        """
+        URLごとの処理をスレッドプールで実行し、入力順に結果を返す
+
+        未消費の結果はワーカー数 × PREFETCH_PER_WORKER件までとし、結果を1件返すごとに
+        次のURLを投入する。呼び出し側のパース・保存が取得より遅くても、メモリに
+        ためる取得済みページは一定件数を超えない。
+        """
+        workers = workers or self.workers
+
+        if workers <= 1:
+            for url in urls:
+                yield func(url)
+            return
+
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as executor:
+            futures = deque(executor.submit(func, url) for url in islice(urls, workers * PREFETCH_PER_WORKER))
+            try:
+                while futures:
+                    result = futures.popleft().result()
+                    for url in islice(urls, 1):
+                        futures.append(executor.submit(func, url))
+                    yield result
+            finally:
+                # 中断時は未着手の処理をキャンセル
+                for future in futures:
+                    future.cancel()
+
+    def _fetch_page_safe(self, url: str) -> Optional[RawPage]:
+        """例外をログに記録してNoneを返すfetch_raw_page（リクエストの失敗は_fetch_from_webで記録済み）"""
+        try:
+            return self.fetch_raw_page(url)
+        except requests.RequestException:
+            return None
+        except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
-            raise
+            return None
+
+    def _revalidate_page_safe(self, url: str) -> Optional[bool]:
+        """例外をログに記録してNoneを返すrevalidate_page"""
+        try:
+            return self.revalidate_page(url)
+        except Exception as e:
+            logger.error(f"Failed to revalidate {url}: {e}")
+            return None
 
     def fetch_annotated_page(self) -> Optional[BeautifulSoup]:
         """クラス一覧ページ（annotated.html）を取得"""
@@ -124,3 +379,12 @@ class BakinScraper:
             class_url: クラスページのURL（例: "class_yukar_1_1_common_1_1_rom_1_1_cast.html"）
         """
         return self.fetch_page(class_url)
+
+    def fetch_raw_class_page(self, class_url: str) -> RawPage:
+        """
+        個別クラスページをバイト列のまま取得（パーサーに直接渡す用）
+
+        Args:
+            class_url: クラスページのURL
+        """
+        return self.fetch_raw_page(class_url)
@@ -3,139 +3,387 @@
 
 C++/C#のメソッドシグネチャを解析して、型と変数名の間にスペースを入れるなど、
 読みやすい形式に整形する責務を持つ。
+
+同じシグネチャやパラメータ（intindex, boolloop など）はコーパス全体で何度も現れるため、
+シグネチャ全体とパラメータ単位の整形結果をそれぞれ上限付きのLRUキャッシュで再利用する。
+
+型と変数名の境界は、既知の型名（クラス一覧とC#の組み込み型）の辞書があれば最長一致で決め、
+辞書にない型の場合のみ大文字・小文字などのヒューリスティクスで推定する。
+
+整形したパラメータは、型・変数名・修飾子（ref/out/paramsなど）・既定値に分解した
+Parameterのリストとしても提供し、出力形式ごとにシグネチャを解析し直さずに済むようにする。
 """
 import re
-from typing import List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# 整形結果をキャッシュする最大件数
+SIGNATURE_CACHE_SIZE = 8192
+PARAMETER_CACHE_SIZE = 4096
+
+# 型と変数名の区切りとみなす修飾子（優先度順）
+_SPLIT_SYMBOLS = ('^', '*', '&')
+
+# 型名の後に続く修飾（配列、null許容、ポインタなど）
+_TYPE_SUFFIX_CHARS = '[],?*&^'
+
+# パラメータの前に付く修飾子
+PARAMETER_MODIFIERS = frozenset({'ref', 'out', 'in', 'params', 'this', 'scoped', 'const'})
+
+# パラメータ末尾の変数名
+_PARAMETER_NAME = re.compile(r'@?[A-Za-z_]\w*$')
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """メソッドのパラメータ"""
+    type: str
+    name: str = ""
+    modifiers: Tuple[str, ...] = ()
+    default: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """メソッド情報（JSON出力・パース結果キャッシュ）に格納する辞書に変換"""
+        return {
+            'type': self.type,
+            'name': self.name,
+            'modifiers': list(self.modifiers),
+            'default': self.default,
+        }
+
+
+class TypeDictionary:
+    """
+    既知の型名の辞書（トライ木）
+
+    パラメータ文字列の先頭から1回たどるだけで、既知の型名として読める最長の接頭辞を求める。
+    """
+
+    # C#の組み込み型と、リファレンスによく現れる標準ライブラリの型
+    BUILTIN_TYPES = (
+        'bool', 'byte', 'sbyte', 'char', 'decimal', 'double', 'float', 'int', 'uint', 'nint', 'nuint',
+        'long', 'ulong', 'short', 'ushort', 'object', 'string', 'void', 'dynamic', 'var',
+        'Boolean', 'Byte', 'SByte', 'Char', 'Decimal', 'Double', 'Single', 'Int16', 'Int32', 'Int64',
+        'UInt16', 'UInt32', 'UInt64', 'IntPtr', 'UIntPtr', 'Object', 'String', 'Type', 'Guid',
+        'DateTime', 'TimeSpan', 'Exception', 'Action', 'Func', 'Predicate', 'Nullable', 'Task',
+        'Array', 'List', 'Dictionary', 'HashSet', 'Queue', 'Stack', 'KeyValuePair', 'Tuple',
+        'IEnumerable', 'IEnumerator', 'IList', 'ICollection', 'IDictionary', 'IReadOnlyList',
+        'IReadOnlyCollection', 'IReadOnlyDictionary', 'Stream', 'StringBuilder',
+    )
+
+    _TERMINAL = ''
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Args:
+            names: 組み込み型に加えて登録する型名（完全修飾名も可）
+        """
+        self._trie = {}
+        self._names = set()
+        for name in self.BUILTIN_TYPES:
+            self.add(name)
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_classes(cls, classes) -> 'TypeDictionary':
+        """
+        クラス一覧（parse_annotated_pageの結果）から辞書を作成
+
+        Args:
+            classes: ClassInfoのリスト（名前と完全修飾名を登録する）
+
+        Returns:
+            TypeDictionary
+        """
+        names = []
+        for class_info in classes:
+            names.append(class_info.name)
+            names.append(class_info.full_name)
+        return cls(names)
+
+    def add(self, name: str):
+        """
+        型名を登録（ジェネリック型の型引数部分は除く）
+
+        Args:
+            name: 型名（例: "Cast", "Yukar.Common.Rom.Cast", "List< T >"）
+        """
+        name = name.split('<')[0].strip()
+        if not name or name in self._names:
+            return
+        self._names.add(name)
+        node = self._trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[self._TERMINAL] = True
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def split_index(self, param: str) -> Optional[int]:
+        """
+        既知の型名（と型引数・配列などの修飾）の直後の位置を求める
+
+        Args:
+            param: スペースを含まないパラメータ（例: "SurroundModesurroundMode", "List<Vector3>points"）
+
+        Returns:
+            変数名の開始位置。パラメータ全体が既知の型の場合は len(param)、
+            既知の型で始まらない場合はNone
+        """
+        # 型名として読める接頭辞の終了位置を、トライ木を1回たどって集める
+        ends = []
+        node = self._trie
+        for i, char in enumerate(param):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._TERMINAL in node:
+                ends.append(i + 1)
+
+        # 長い型名から順に、続きが変数名として読めるものを採用する。続きに型の記号（<>[]^*&）が
+        # 残る場合や大文字で始まる場合は、より長い未知の型名の途中とみなして採用しない
+        # （例: TaskCompletionSource<bool>tcs を Task で分割しない）
+        for end in reversed(ends):
+            end = self._skip_type_suffix(param, end)
+            if end is None:
+                continue
+            if end == len(param):
+                return end
+            if not param[end].isupper() and _PARAMETER_NAME.match(param, end):
+                return end
+        return None
+
+    @staticmethod
+    def _skip_type_suffix(param: str, pos: int) -> Optional[int]:
+        """型名の後の型引数（<...>）と配列・ポインタなどの修飾を読み飛ばした位置（括弧が閉じなければNone）"""
+        if pos < len(param) and param[pos] == '<':
+            depth = 0
+            for i in range(pos, len(param)):
+                if param[i] == '<':
+                    depth += 1
+                elif param[i] == '>':
+                    depth -= 1
+                    if depth == 0:
+                        pos = i + 1
+                        break
+            else:
+                return None
+        while pos < len(param) and param[pos] in _TYPE_SUFFIX_CHARS:
+            pos += 1
+        return pos
 
 
 class SignatureParser:
     """シグネチャのパース・整形クラス"""
 
     @staticmethod
-    def format_signature(signature: str) -> str:
+    @lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+    def format_signature(signature: str, known_types: Optional[TypeDictionary] = None) -> str:
         """
         メソッドシグネチャ全体を整形
 
         Args:
             signature: 整形前のシグネチャ（例：play(bool loop, int typeIndex)）
+            known_types: 既知の型名の辞書（Noneの場合はヒューリスティクスのみで分割）
 
         Returns:
             整形後のシグネチャ
         """
-        # メソッド名と括弧部分を分離
-        match = re.match(r'^([^(]+)\((.*)\)(.*)$', signature)
-        if not match:
+        # メソッド名・最初の'('から最後の')'までのパラメータ・その後の修飾子（const など）に分離
+        open_idx = signature.find('(')
+        close_idx = signature.rfind(')')
+        if open_idx <= 0 or close_idx < open_idx or '\n' in signature:
             return signature
 
-        method_name = match.group(1)
-        params_str = match.group(2)
-        suffix = match.group(3)  # const などの修飾子
+        params_str = signature[open_idx + 1:close_idx]
 
         # パラメータがない場合
         if not params_str.strip():
             return signature
 
-        # パラメータをカンマで分割
-        params = SignatureParser._split_parameters(params_str)
-
-        # 各パラメータを整形
-        formatted_params = [SignatureParser.format_parameter(p) for p in params]
+        # パラメータをカンマで分割して各パラメータを整形
+        formatted_params = [
+            SignatureParser.format_parameter(p, known_types) for p in SignatureParser._split_parameters(params_str)
+        ]
 
         # 再構築
-        return f"{method_name}({', '.join(formatted_params)}){suffix}"
+        return f"{signature[:open_idx]}({', '.join(formatted_params)}){signature[close_idx + 1:]}"
 
     @staticmethod
-    def _split_parameters(params_str: str) -> List[str]:
+    @lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+    def parse_parameters(signature: str, known_types: Optional[TypeDictionary] = None) -> Tuple[Parameter, ...]:
         """
-        パラメータ文字列をカンマで分割（ネストした<>内のカンマは無視）
+        メソッドシグネチャのパラメータを整形し、Parameterに分解
 
         Args:
-            params_str: パラメータ文字列
+            signature: 整形前のシグネチャ（例：play(boolloop, ref int count = 0)）
+            known_types: 既知の型名の辞書（Noneの場合はヒューリスティクスのみで分割）
 
         Returns:
-            分割されたパラメータのリスト
+            Parameterのタプル（パラメータがない場合は空）
+        """
+        open_idx = signature.find('(')
+        close_idx = signature.rfind(')')
+        if open_idx <= 0 or close_idx < open_idx or '\n' in signature:
+            return ()
+
+        params_str = signature[open_idx + 1:close_idx]
+        if not params_str.strip():
+            return ()
+
+        return tuple(
+            SignatureParser.parse_parameter(SignatureParser.format_parameter(p, known_types))
+            for p in SignatureParser._split_parameters(params_str) if p
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=PARAMETER_CACHE_SIZE)
+    def parse_parameter(param: str) -> Parameter:
         """
-        params = []
-        current = []
-        depth = 0  # <> のネストレベル
+        整形済みのパラメータを修飾子・型・変数名・既定値に分解
 
-        for char in params_str:
+        Args:
+            param: 整形済みのパラメータ（例：ref int count = 0）
+
+        Returns:
+            Parameter（変数名がない場合はnameが空文字）
+        """
+        # 既定値（<>の外にある最初の'='より後）
+        default = None
+        depth = 0
+        for i, char in enumerate(param):
             if char == '<':
                 depth += 1
-                current.append(char)
             elif char == '>':
                 depth -= 1
-                current.append(char)
-            elif char == ',' and depth == 0:
-                # トップレベルのカンマで分割
-                params.append(''.join(current).strip())
-                current = []
-            else:
-                current.append(char)
+            elif char == '=' and depth == 0:
+                default = param[i + 1:].strip()
+                param = param[:i]
+                break
+        param = param.strip()
+
+        # 先頭の修飾子
+        words = param.split(' ')
+        modifiers = []
+        while len(words) > 1 and words[0] in PARAMETER_MODIFIERS:
+            modifiers.append(words.pop(0))
+        param = ' '.join(words)
+
+        # 末尾の識別子を変数名とする（型だけの場合は変数名なし）
+        match = _PARAMETER_NAME.search(param)
+        if match is None or match.start() == 0:
+            return Parameter(param, "", tuple(modifiers), default)
+        return Parameter(param[:match.start()].strip(), match.group(), tuple(modifiers), default)
+
+    @staticmethod
+    def _split_parameters(params_str: str) -> List[str]:
+        """
+        パラメータ文字列をカンマで分割（ネストした<>内のカンマは無視）
+
+        文字列を1回走査し、トップレベルのカンマの位置でスライスする。
+
+        Args:
+            params_str: パラメータ文字列
 
-        # 最後のパラメータ
-        if current:
-            params.append(''.join(current).strip())
+        Returns:
+            分割されたパラメータのリスト
+        """
+        if '<' not in params_str and '>' not in params_str:
+            params = params_str.split(',')
+        else:
+            params = []
+            depth = 0  # <> のネストレベル
+            start = 0
+            for i, char in enumerate(params_str):
+                if char == '<':
+                    depth += 1
+                elif char == '>':
+                    depth -= 1
+                elif char == ',' and depth == 0:
+                    # トップレベルのカンマで分割
+                    params.append(params_str[start:i])
+                    start = i + 1
+            params.append(params_str[start:])
 
-        return params
+        # 末尾のカンマの後が空の場合は最後のパラメータとしない
+        if not params[-1]:
+            params.pop()
+        return [p.strip() for p in params]
 
     @staticmethod
-    def format_parameter(param: str) -> str:
+    @lru_cache(maxsize=PARAMETER_CACHE_SIZE)
+    def format_parameter(param: str, known_types: Optional[TypeDictionary] = None) -> str:
         """
         パラメータを整形（型と変数名の間にスペースを入れる）
 
+        既知の型で始まる場合はその直後で分割する。それ以外の場合は末尾から1回走査して
+        分割候補を集め、優先度の高いものから採用する。
+
         Args:
             param: 整形前のパラメータ（例：SurroundModesurroundMode）
+            known_types: 既知の型名の辞書（Noneの場合はヒューリスティクスのみで分割）
 
         Returns:
             整形後のパラメータ（例：SurroundMode surroundMode）
         """
         param = param.strip()
 
-        # 既にスペースがある場合はそのまま
-        if ' ' in param:
+        # 既にスペースがある場合と空の場合はそのまま
+        if not param or ' ' in param:
             return param
 
-        # 空の場合
-        if not param:
-            return param
+        # 既知の型で始まる場合はその直後で分割（全体が型名なら分割しない）
+        if known_types is not None:
+            idx = known_types.split_index(param)
+            if idx is not None:
+                return param if idx == len(param) else f"{param[:idx]} {param[idx:]}"
+
+        last = len(param) - 1
+        symbol_idx = {}      # 各修飾子の最後の位置
+        template_idx = -1    # 最後の'>'の位置
+        digit_idx = -1       # 数字の直後に小文字が来る最後の位置
+        camel_idx = -1       # 小文字→大文字→小文字となる最後の大文字の位置
+        camel_confirmed = False  # camel_idxより前に大文字があるか（先頭の大文字では分割しない）
+
+        for i in range(last, -1, -1):
+            char = param[i]
+            if char in _SPLIT_SYMBOLS:
+                symbol_idx.setdefault(char, i)
+            elif char == '>':
+                if template_idx < 0:
+                    template_idx = i
+            elif char.isupper():
+                if camel_idx >= 0:
+                    camel_confirmed = True
+                elif 0 < i < last and param[i - 1].islower() and param[i + 1].islower():
+                    camel_idx = i
+            elif char.islower() and digit_idx < 0 and i > 0 and param[i - 1].isdigit():
+                digit_idx = i
 
-        # 優先度1: 修飾子（*, ^, &）の直後で分割
-        for symbol in ['^', '*', '&']:
-            idx = param.rfind(symbol)
-            if idx >= 0 and idx < len(param) - 1:
-                return f"{param[:idx+1]} {param[idx+1:]}"
+        # 優先度1: 修飾子（^, *, &）の直後で分割
+        for symbol in _SPLIT_SYMBOLS:
+            idx = symbol_idx.get(symbol, -1)
+            if 0 <= idx < last:
+                return f"{param[:idx + 1]} {param[idx + 1:]}"
 
         # 優先度2: テンプレート終了（>）の後に小文字が来る位置
-        idx = param.rfind('>')
-        if idx >= 0 and idx < len(param) - 1 and param[idx + 1].islower():
-            return f"{param[:idx+1]} {param[idx+1:]}"
+        if 0 <= template_idx < last and param[template_idx + 1].islower():
+            return f"{param[:template_idx + 1]} {param[template_idx + 1:]}"
 
         # 優先度3: 数字の後に小文字が来る位置
-        for i in range(len(param) - 1, 0, -1):
-            if param[i - 1].isdigit() and param[i].islower():
-                return f"{param[:i]} {param[i:]}"
+        if digit_idx > 0:
+            return f"{param[:digit_idx]} {param[digit_idx:]}"
 
-        # 優先度4: 型名とキャメルケース変数名の境界を探す
+        # 優先度4: 型名とキャメルケース変数名の境界
         # 例：SurroundModesurroundMode → SurroundMode surroundMode
-        # 大文字→小文字が連続する部分を探し、その後に大文字→小文字が再び現れる位置で分割
-        # つまり、"Mode" の後の "surroundMode" を見つける
-
-        # まず、大文字で始まる単語の境界を全て見つける
-        upper_positions = [i for i in range(len(param)) if param[i].isupper()]
-
-        if len(upper_positions) >= 2:
-            # 最後の大文字位置から逆順に探す
-            for i in range(len(upper_positions) - 1, 0, -1):
-                pos = upper_positions[i]
-                # この位置の次が小文字で、かつ前の文字が小文字の場合
-                # （例：...e→s→u... の s の位置）
-                if (pos > 0 and
-                    pos < len(param) - 1 and
-                    param[pos - 1].islower() and
-                    param[pos].isupper() and
-                    param[pos + 1].islower()):
-                    return f"{param[:pos]} {param[pos:]}"
+        if camel_idx > 0 and camel_confirmed:
+            return f"{param[:camel_idx]} {param[camel_idx:]}"
 
         # 分割できない場合はそのまま
         return param
@@ -0,0 +1,58 @@
+"""
+テスト共通のフィクスチャ
+"""
+import pytest
+import yaml
+
+from src.cli import BakinDocumentationScraper
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    出力先をtmp_pathにしたテスト用のconfig.yamlを作成する関数
+
+    キーワード引数でセクションごとに既定値を上書きできる（辞書のセクションは既定値にマージする）。
+    例: make_config(scraping={'workers': 2}, progress={'claim_batch': 2})
+    """
+    def make(**overrides) -> str:
+        base = str(tmp_path).replace('\\', '/')
+        config = {
+            'base_url': "https://example.com",
+            'scraping': {
+                'delay': 0,
+                'timeout': 5,
+                'user_agent': "test-agent",
+            },
+            'output': {
+                'base_dir': base,
+                'classes_dir': f"{base}/classes",
+                'namespaces_dir': f"{base}/namespaces",
+                'json_dir': f"{base}/json",
+                'class_list_cache': f"{base}/class_list.json",
+                'progress_file': f"{base}/progress.csv",
+            },
+            'pages': {
+                'annotated': "annotated.html",
+            },
+        }
+        for section, values in overrides.items():
+            if isinstance(values, dict) and isinstance(config.get(section), dict):
+                config[section].update(values)
+            else:
+                config[section] = values
+
+        config_path = tmp_path / 'config.yaml'
+        config_path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding='utf-8')
+        return str(config_path)
+
+    return make
+
+
+@pytest.fixture
+def make_scraper(make_config):
+    """make_configの設定でBakinDocumentationScraperを作成する関数（引数はmake_configと同じ）"""
+    def make(**overrides) -> BakinDocumentationScraper:
+        return BakinDocumentationScraper(make_config(**overrides))
+
+    return make
@@ -0,0 +1,59 @@
+"""
+最終更新に基づく再検証（scrape --older-than）のテストコード
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.cli import parse_duration
+from src.parser import ClassInfo
+
+
+CLASSES = [ClassInfo(name=f"C{i}", full_name=f"N.C{i}", url=f"c{i}.html", type="class", namespace="N")
+           for i in range(4)]
+
+
+@pytest.fixture
+def scraper(make_scraper):
+    return make_scraper()
+
+
+def test_parse_duration():
+    """期間の文字列がtimedeltaに変換されることを確認"""
+    assert parse_duration("30d") == timedelta(days=30)
+    assert parse_duration("1w 2d") == timedelta(days=9)
+    assert parse_duration("1.5h") == timedelta(minutes=90)
+
+    for text in ("", "30", "d", "30x", "30dd"):
+        with pytest.raises(ValueError):
+            parse_duration(text)
+
+
+def test_scrape_older_than_revalidates_oldest_first(scraper):
+    """未完了分の後に、古い完了済みクラスが古い順に残りの件数だけ再検証されることを確認"""
+    pm = scraper.progress_manager
+    pm.initialize_from_class_list(CLASSES)
+    entries = pm.load_progress()
+    for entry, updated in zip(entries, ['2024-03-01T00:00:00', '2024-01-01T00:00:00', '2024-02-01T00:00:00']):
+        entry.completed = True
+        entry.last_updated = updated
+    pm._write_snapshot(entries)
+
+    def revalidate_pages(urls, workers=None):
+        return iter([False] * len(urls))
+
+    with patch.object(scraper, 'scrape_class', side_effect=Exception("offline")) as scrape_class, \
+            patch.object(scraper.scraper, 'revalidate_pages', side_effect=revalidate_pages) as revalidate, \
+            patch.object(scraper, '_generate_index'):
+        scraper.scrape_with_progress(limit=3, older_than=timedelta(days=1))
+
+    # 未完了の1件を先に処理し、残りの2件で古い順に再検証する
+    assert scrape_class.call_count == 1
+    assert revalidate.call_args[0][0] == ['c1.html', 'c2.html']
+
+    # 変更がなくても確認した日時が記録され、次回は対象外になる
+    updated = {e.full_name: e.last_updated for e in pm.load_progress()}
+    assert updated['N.C1'] > '2025'
+    assert updated['N.C0'] == '2024-03-01T00:00:00'
+    assert [e.full_name for e in pm.get_stale_entries(datetime(2025, 1, 1))] == ['N.C0']
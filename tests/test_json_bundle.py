@@ -0,0 +1,83 @@
+"""
+JSONLバンドル（JsonGenerator.export_bundle / JsonBundle）のテスト
+"""
+import json
+
+import pytest
+
+from src.json_bundle import JsonBundle
+from src.json_generator import JsonGenerator, bundle_index_path
+from src.parser import ClassDetail, ClassInfo
+
+
+CLASSES = [ClassInfo(name=f"C{i}", full_name=f"N.C{i}", url=f"c{i}.html", type="class", namespace="N",
+                     description=f"クラス{i}")
+           for i in range(3)]
+
+
+def make_records():
+    generator = JsonGenerator()
+    return [generator.generate_class_json(ClassDetail(info=info, description_full=f"説明{i}"))
+            for i, info in enumerate(CLASSES)]
+
+
+def test_export_bundle_writes_one_compact_line_per_class(tmp_path):
+    """1行1クラスのコンパクトなJSONと、バイト位置の索引が保存されることを確認"""
+    bundle_path = tmp_path / 'reference.jsonl'
+    records = make_records()
+
+    assert JsonGenerator().export_bundle(records, bundle_path) == 3
+
+    content = bundle_path.read_bytes()
+    lines = content.splitlines()
+    assert [json.loads(line) for line in lines] == records
+    assert b'\n  ' not in content and b'": ' not in content
+
+    index = json.loads(bundle_index_path(bundle_path).read_text(encoding='utf-8'))
+    assert list(index) == ['N.C0', 'N.C1', 'N.C2']
+    for full_name, (offset, length) in index.items():
+        assert json.loads(content[offset:offset + length])['class_info']['full_name'] == full_name
+
+
+def test_bundle_reader(tmp_path):
+    """索引で引いたクラスだけを読み込めることを確認"""
+    bundle_path = tmp_path / 'reference.jsonl'
+    records = make_records()
+    JsonGenerator().export_bundle(records, bundle_path)
+
+    with JsonBundle(bundle_path) as bundle:
+        assert len(bundle) == 3
+        assert 'N.C1' in bundle
+        assert list(bundle.names()) == ['N.C0', 'N.C1', 'N.C2']
+        assert bundle.get('N.C1') == records[1]
+        assert bundle.get('N.Missing') is None
+
+
+def test_empty_bundle(tmp_path):
+    """クラスがない場合も読み込めることを確認"""
+    bundle_path = tmp_path / 'reference.jsonl'
+    assert JsonGenerator().export_bundle([], bundle_path) == 0
+
+    with JsonBundle(bundle_path) as bundle:
+        assert len(bundle) == 0
+        assert bundle.get('N.C0') is None
+
+
+@pytest.fixture
+def scraper(make_scraper, tmp_path):
+    return make_scraper(output={'bundle_file': str(tmp_path / 'reference.jsonl')})
+
+
+def test_export_bundle_from_saved_json(scraper, tmp_path):
+    """完了済みで保存済みのクラスのJSONだけが進捗ファイルの順にまとめられることを確認"""
+    scraper.progress_manager.initialize_from_class_list(CLASSES)
+    for info in (CLASSES[2], CLASSES[0], CLASSES[1]):
+        scraper.progress_manager.mark_completed(info.full_name)
+    for info in CLASSES[:2]:
+        scraper.save_class_markdown(ClassDetail(info=info))
+
+    assert scraper.export_bundle() == 2
+
+    with JsonBundle(tmp_path / 'reference.jsonl') as bundle:
+        assert list(bundle.names()) == ['N.C0', 'N.C1']
+        assert bundle.get('N.C0') == json.loads((tmp_path / 'json' / 'N.C0.json').read_text(encoding='utf-8'))
@@ -2,13 +2,14 @@
 JsonGeneratorのテスト
 """
 import json
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
 from src.parser import ClassInfo, ClassDetail
-from src.json_generator import JsonGenerator
+from src.json_generator import JsonEncoder, JsonGenerator
 
 
 @pytest.fixture
@@ -35,12 +36,14 @@ def sample_class_detail(sample_class_info):
             {
                 "name": "doSomething",
                 "signature": "doSomething(int value)",
+                "parameters": [{"type": "int", "name": "value", "modifiers": [], "default": None}],
                 "return_type": "void",
                 "is_static": False
             },
             {
                 "name": "create",
                 "signature": "create()",
+                "parameters": [],
                 "return_type": "TestClass",
                 "is_static": True
             }
@@ -111,6 +114,17 @@ class TestJsonGenerator:
         assert methods["static_methods"][0]["name"] == "create"
         assert methods["static_methods"][0]["is_static"] is True
 
+    def test_generate_class_json_method_parameters(self, sample_class_detail):
+        """パース時に分解したパラメータがそのまま出力されることを確認"""
+        generator = JsonGenerator()
+        result = generator.generate_class_json(sample_class_detail)
+
+        methods = result["methods"]
+        assert methods["instance_methods"][0]["parameters"] == [
+            {"type": "int", "name": "value", "modifiers": [], "default": None}
+        ]
+        assert methods["static_methods"][0]["parameters"] == []
+
     def test_generate_class_json_inherits(self, sample_class_detail):
         """継承情報の確認"""
         generator = JsonGenerator()
@@ -215,3 +229,48 @@ class TestJsonGenerator:
             # ensure_ascii=Falseなので日本語がそのまま含まれる
             assert "テスト用クラス" in content
             assert "これはテスト用のクラスです" in content
+
+
+class TestJsonEncoder:
+    """JsonEncoder（コンパクト形式・バックエンド）のテスト"""
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_backends_produce_identical_bytes(self, sample_class_detail, compact):
+        """orjsonと標準ライブラリで同じバイト列になることを確認"""
+        pytest.importorskip("orjson")
+        data = JsonGenerator().generate_class_json(sample_class_detail)
+
+        assert JsonEncoder('orjson', compact).encode(data) == JsonEncoder('json', compact).encode(data)
+
+    def test_compact_format(self, sample_class_detail):
+        """コンパクト形式は空白なしで、インデント2の形式より小さいことを確認"""
+        data = JsonGenerator().generate_class_json(sample_class_detail)
+        encoder = JsonEncoder('json')
+
+        compact = encoder.encode(data, compact=True)
+        indented = encoder.encode(data)
+
+        assert compact == json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        assert indented == json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        assert len(compact) < len(indented)
+
+    def test_save_json_compact(self, sample_class_detail, tmp_path):
+        """compact=Trueの場合はクラスごとのJSONがコンパクト形式で保存されることを確認"""
+        generator = JsonGenerator(compact=True)
+        generator.save_class_json(sample_class_detail, tmp_path / "test.json")
+
+        content = (tmp_path / "test.json").read_text(encoding='utf-8')
+        assert "\n" not in content
+        assert json.loads(content)["class_info"]["name"] == "TestClass"
+
+    def test_auto_falls_back_to_stdlib(self, monkeypatch):
+        """orjsonがない場合、autoは標準ライブラリを使い、orjsonの指定はエラーになることを確認"""
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+
+        assert JsonEncoder('auto').backend == 'json'
+        with pytest.raises(ModuleNotFoundError):
+            JsonEncoder('orjson')
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            JsonEncoder('simplejson')
@@ -0,0 +1,213 @@
+"""
+lxmlバックエンドの等価性テスト
+
+LxmlBakinParserの抽出結果がBakinParser（html.parser）と完全に一致することを確認する。
+基準にはセクションごとにページを検索する従来方式（single_pass=False）を使い、
+memberdeclsテーブルを1回だけ走査する方式も同じ結果になることを合わせて確認する。
+"""
+from pathlib import Path
+
+import pytest
+
+from src.parser import BakinParser, ClassInfo, create_parser
+from src.lxml_parser import LxmlBakinParser
+
+
+SAMPLE_CLASS_HTML = Path(__file__).parent / "data" / "sample_class.html"
+
+CLASS_INFO = ClassInfo(
+    name="Sound",
+    full_name="FakeEngine.Audio.Sound",
+    url="class_fake_engine_1_1_audio_1_1_sound.html",
+    type="class",
+    namespace="FakeEngine.Audio"
+)
+
+ANNOTATED_HTML = """
+<html><head><meta charset="utf-8"/><title>クラス一覧</title></head><body>
+<div class="contents">
+<div class="directory">
+<table class="directory">
+<tr id="row_0_"><td class="entry"><span class="icona"><span class="icon">N</span></span><a class="el" href="namespace_fake_engine.html">FakeEngine</a></td><td class="desc"></td></tr>
+<tr id="row_0_0_"><td class="entry"><a class="el" href="class_fake_engine_1_1_audio_1_1_sound.html" target="_self">Sound</a></td><td class="desc">サウンド&#160;再生</td></tr>
+<tr id="row_0_1_"><td class="entry"><a class="el" href="struct_fake_engine_1_1_math_1_1_vector3.html" target="_self">Vector3</a></td><td class="desc"><b>3次元</b> ベクトル</td></tr>
+<tr id="row_0_2_"><td class="entry"><a class="el" href="interface_fake_engine_1_1_i_disposable.html" target="_self">IDisposable</a></td><td class="desc"></td></tr>
+<tr id="row_0_3_"><td class="entry"><span><a class="el" href="class_global_helper.html">GlobalHelper</a></span></td><td class="desc">親がtdでない</td></tr>
+</table>
+</div>
+</div>
+</body></html>
+"""
+
+# 通常のページ構造から外れるケース
+EDGE_CASE_PAGES = {
+    'empty': "",
+    'whitespace_only': "  \n ",
+    'comment_only': "<!-- 途中で切れたキャッシュ -->",
+    'truncated': "\n<html",
+    'no_sections': "<html><body><div class='contents'><p>空のページ</p></div></body></html>",
+    'no_link_members': """
+        <html><body>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="properties" name="properties"></a>
+        プロパティ</h2></td></tr>
+        <tr class="memitem:p1"><td class="memItemLeft">int&#160;</td><td class="memItemRight">Count<code> [get]</code></td></tr>
+        <tr class="memitem:p2"><td class="memItemRight">Name</td></tr>
+        <tr class="memitem:p3"><td class="memItemLeft">int</td></tr>
+        </table>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-attribs" name="pub-attribs"></a>
+        公開変数類</h2></td></tr>
+        <tr class="memitem:f1"><td class="memItemLeft">float&#160;</td><td class="memItemRight">scale&#160;= 1.0f</td></tr>
+        <tr class="memitem:f2 extra"><td class="memItemLeft"><a class="el" href="x.html">Vector3</a>&#160;</td><td class="memItemRight">offset</td></tr>
+        </table>
+        </body></html>
+    """,
+    'comments_and_nested_markup': """
+        <html><head><title>Nested</title></head><body>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-static-methods" name="pub-static-methods"></a>
+        静的公開メンバ関数</h2></td></tr>
+        <tr class="memitem:m1"><td class="memItemLeft">static<!-- comment -->void&#160;</td><td class="memItemRight"><a class="el" href="#m1"><b>run</b></a> (<em>int</em>count, <span>params object[]</span> args)</td></tr>
+        <tr class="memitem:m2"><td class="memItemLeft">static&#160;List&lt; <a class="el" href="v.html">Vector3</a> &gt;&#160;</td><td class="memItemRight"><a class="el" href="other.html">points</a> ()</td></tr>
+        </table>
+        <h2>継承図</h2>
+        <div><a class="el" href="a.html">Base</a><a class="el" href="b.html">Nested</a></div>
+        <a id="m1"></a><div class="memitem"><div class="memdoc"><div><p>入れ子の <b>説明</b></p><p>2段落目</p></div></div></div>
+        </body></html>
+    """,
+    'reordered_sections': """
+        <html><body>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-attribs" name="pub-attribs"></a>
+        公開変数類</h2></td></tr>
+        <tr class="memitem:f1"><td class="memItemLeft">int&#160;</td><td class="memItemRight"><a class="el" href="#f1">size</a></td></tr>
+        </table>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-static-methods" name="pub-static-methods"></a>
+        静的公開メンバ関数</h2></td></tr>
+        <tr class="memitem:m2"><td class="memItemLeft">static void&#160;</td><td class="memItemRight"><a class="el" href="#m2">reset</a> ()</td></tr>
+        </table>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-types" name="pub-types"></a>
+        公開型</h2></td></tr>
+        <tr class="memitem:t1"><td class="memItemLeft">enum&#160;</td><td class="memItemRight">Mode</td></tr>
+        </table>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-methods" name="pub-methods"></a>
+        公開メンバ関数</h2></td></tr>
+        <tr class="memitem:m1"><td class="memItemLeft">void&#160;</td><td class="memItemRight"><a class="el" href="#m1">run</a> ()</td></tr>
+        </table>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-methods" name="pub-methods"></a>
+        重複したセクション</h2></td></tr>
+        <tr class="memitem:m3"><td class="memItemLeft">void&#160;</td><td class="memItemRight"><a class="el" href="#m3">ignored</a> ()</td></tr>
+        </table>
+        <a id="m1"></a><div class="memdoc"><p>実行する</p></div>
+        <a id="f1"></a><div class="memdoc"><p>サイズ</p></div>
+        </body></html>
+    """,
+    'inline_script': """
+        <html><head><title>Scripted</title><style>.memdoc { color: red; }</style></head><body>
+        <div class="textblock">説明<script type="text/javascript">var x = "<b>no</b>";</script>の続き
+        <style>p { margin: 0; }</style><!-- コメント -->終わり</div>
+        <table class="memberdecls">
+        <tr class="heading"><td colspan="2"><h2 class="groupheader"><a id="pub-methods"></a>公開メンバ関数</h2></td></tr>
+        <tr class="memitem:m1"><td class="memItemLeft">void&#160;</td><td class="memItemRight"><a class="el" href="#m1">run</a> (intcount)<script>init();</script></td></tr>
+        </table>
+        <a id="m1"></a><div class="memdoc"><p>実行<script>track("m1");</script>する</p></div>
+        </body></html>
+    """,
+    'inherit_header': """
+        <html><head><title>Child</title></head><body>
+        <div class="inherit_header pub_methods_a">継承メンバ <a href="base.html">Base</a> 由来</div>
+        <div class="textblock">  説明の<br/>テキスト  </div>
+        <div class="textblock">2つ目は無視</div>
+        </body></html>
+    """,
+}
+
+
+@pytest.fixture(params=['html.parser', 'lxml', 'lxml-per-section'])
+def parsers(request):
+    """基準のパーサー（従来方式）と比較対象のパーサー"""
+    candidates = {
+        'html.parser': lambda: BakinParser(),
+        'lxml': lambda: LxmlBakinParser(),
+        'lxml-per-section': lambda: LxmlBakinParser(single_pass=False),
+    }
+    return BakinParser(single_pass=False), candidates[request.param]()
+
+
+def test_create_parser():
+    """バックエンド名からパーサーが生成されることを確認"""
+    assert type(create_parser('html.parser')) is BakinParser
+    assert isinstance(create_parser('lxml'), LxmlBakinParser)
+    with pytest.raises(ValueError):
+        create_parser('unknown')
+
+
+def test_class_page_equivalence(parsers):
+    """サンプルのクラスページで抽出結果が一致することを確認"""
+    reference, fast = parsers
+    content = SAMPLE_CLASS_HTML.read_bytes()
+
+    expected = reference.parse_class_content(content, CLASS_INFO)
+    actual = fast.parse_class_content(content, CLASS_INFO)
+
+    assert actual == expected
+    assert len(actual.methods) == 5
+    # 辞書のキー順（JSON出力の順序）も一致すること
+    assert [list(m) for m in actual.methods] == [list(m) for m in expected.methods]
+
+
+@pytest.mark.parametrize('name', sorted(EDGE_CASE_PAGES))
+def test_edge_case_equivalence(parsers, name):
+    """構造が崩れたページでも抽出結果が一致することを確認"""
+    reference, fast = parsers
+    content = EDGE_CASE_PAGES[name].encode('utf-8')
+
+    assert fast.parse_class_content(content, CLASS_INFO, 'utf-8') == \
+        reference.parse_class_content(content, CLASS_INFO, 'utf-8')
+
+
+def test_class_page_equivalence_with_declared_encoding(parsers):
+    """HTTPヘッダー由来のエンコーディング指定でも一致することを確認"""
+    reference, fast = parsers
+    content = SAMPLE_CLASS_HTML.read_text(encoding='utf-8').replace('charset=UTF-8', '').encode('shift_jis', 'replace')
+
+    assert fast.parse_class_content(content, CLASS_INFO, 'shift_jis') == \
+        reference.parse_class_content(content, CLASS_INFO, 'shift_jis')
+
+
+@pytest.mark.parametrize('content', [b"", b"<!-- -->", b"\n<html"])
+def test_empty_annotated_page_equivalence(parsers, content):
+    """空・途中で切れたannotated.htmlでも、どちらのバックエンドも空のクラスリストを返すことを確認"""
+    reference, fast = parsers
+
+    assert fast.parse_annotated_content(content) == reference.parse_annotated_content(content) == []
+
+
+def test_annotated_page_equivalence(parsers):
+    """annotated.htmlの抽出結果が一致することを確認"""
+    reference, fast = parsers
+    content = ANNOTATED_HTML.encode('utf-8')
+
+    expected = reference.parse_annotated_content(content)
+    actual = fast.parse_annotated_content(content)
+
+    assert actual == expected
+    assert [c.full_name for c in actual] == [
+        'FakeEngine.Audio.Sound', 'FakeEngine.Math.Vector3', 'FakeEngine.IDisposable', 'GlobalHelper'
+    ]
+
+
+def test_parallel_parse_with_lxml_backend():
+    """複数プロセスのパースでもlxmlバックエンドが使われ、結果が一致することを確認"""
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    pages = [(content, CLASS_INFO, None)] * 3
+
+    expected = BakinParser().parse_class_content(content, CLASS_INFO)
+    results = list(LxmlBakinParser().parse_class_contents(pages, processes=2))
+
+    assert results == [expected] * 3
@@ -31,6 +31,44 @@ def test_generate_class_markdown():
     assert "Test.Namespace" in md
 
 
+def test_member_descriptions_in_markdown():
+    """プロパティ・フィールドの詳細説明がMarkdownに出力されるテスト"""
+    info = ClassInfo(name="TestClass", full_name="Test.TestClass", url="test.html",
+                     type="class", namespace="Test")
+    detail = ClassDetail(info=info)
+    detail.properties = [
+        {'type': 'static int', 'declaration': 'Count [get]', 'name': 'Count',
+         'is_static': True, 'accessors': '[get]', 'description': '生成数'}
+    ]
+    detail.fields = [{'type': 'int', 'declaration': 'channel = 0', 'name': 'channel', 'description': 'チャンネル番号'}]
+
+    md = MarkdownGenerator().generate_class_markdown(detail)
+
+    assert "- **説明**: 生成数" in md
+    assert "- `int channel = 0`: チャンネル番号" in md
+
+
+def test_method_parameters_in_markdown():
+    """パース時に分解したパラメータの一覧がMarkdownに出力されるテスト"""
+    info = ClassInfo(name="TestClass", full_name="Test.TestClass", url="test.html",
+                     type="class", namespace="Test")
+    detail = ClassDetail(info=info)
+    detail.methods = [
+        {'name': 'play', 'signature': 'play(ref int count = 0, params object[] args)', 'return_type': 'void',
+         'is_static': False, 'parameters': [
+             {'type': 'int', 'name': 'count', 'modifiers': ['ref'], 'default': '0'},
+             {'type': 'object[]', 'name': 'args', 'modifiers': ['params'], 'default': None},
+         ]},
+        {'name': 'stop', 'signature': 'stop()', 'return_type': 'void', 'is_static': True, 'parameters': []},
+    ]
+
+    md = MarkdownGenerator().generate_class_markdown(detail)
+
+    assert "- `count`: `ref int`（既定値: `0`）" in md
+    assert "- `args`: `params object[]`" in md
+    assert md.count("**パラメータ**") == 1
+
+
 def test_generate_index_markdown():
     """索引Markdown生成のテスト"""
     classes = [
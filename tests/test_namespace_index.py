@@ -0,0 +1,201 @@
+"""
+NamespaceIndexのテスト
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.markdown_generator import MarkdownGenerator
+from src.namespace_index import NamespaceIndex
+from src.parser import ClassDetail, ClassInfo
+
+CLASSES = [
+    ClassInfo("Sound", "Audio.Sound", "c1.html", "class", "Audio", "音声"),
+    ClassInfo("IPlayable", "Audio.IPlayable", "c2.html", "interface", "Audio"),
+    ClassInfo("Vector3", "Math.Vector3", "c3.html", "struct", "Math"),
+    ClassInfo("Angle", "Math.Angle", "c4.html", "class", "Math"),
+    ClassInfo("Global", "Global", "c5.html", "class", ""),
+]
+
+# CLASSESの索引（名前空間ごとに全体を並べ替えて生成していた従来の出力と同じ）
+EXPECTED_INDEX = """# RPG Developer Bakin C# リファレンス索引
+
+このドキュメントは自動生成されたものです。
+
+## Audio
+
+### クラス
+
+- [Audio.Sound](classes/Audio.Sound.md) - 音声
+
+### インターフェース
+
+- [Audio.IPlayable](classes/Audio.IPlayable.md)
+
+## Math
+
+### クラス
+
+- [Math.Angle](classes/Math.Angle.md)
+
+### 構造体
+
+- [Math.Vector3](classes/Math.Vector3.md)
+
+## グローバル
+
+### クラス
+
+- [Global](classes/Global.md)
+"""
+
+
+@pytest.mark.parametrize("order", [CLASSES, CLASSES[::-1], CLASSES[2:] + CLASSES[:2]])
+def test_incremental_index_matches_expected_output(order):
+    """どの順序で追加しても、従来の全体生成と同じ索引になることを確認"""
+    index = NamespaceIndex()
+    for info in order:
+        index.add(info)
+
+    assert index.render() == EXPECTED_INDEX
+    assert MarkdownGenerator().generate_index_markdown(order) == EXPECTED_INDEX
+
+
+def test_only_changed_namespace_is_rerendered():
+    """変更のあった名前空間のセクションだけが描画し直されることを確認"""
+    index = NamespaceIndex.from_classes(CLASSES[:3])
+    index.render()
+    math_section = index._sections["Math"]
+
+    assert index.add(CLASSES[3]) is True
+    assert index.add(CLASSES[3]) is False
+    assert "Math" not in index._sections
+    assert "Audio" in index._sections
+
+    md = index.render()
+    assert index._sections["Math"] is not math_section
+    assert "Math.Angle" in md
+
+    index.remove("Math.Angle")
+    index.remove("Math.Vector3")
+    assert "## Math" not in index.render()
+
+
+def test_progress_line_while_incomplete():
+    """全クラス数に満たない間は取得済みの件数が表示されることを確認"""
+    index = NamespaceIndex.from_classes(CLASSES[:2])
+
+    assert "取得済み: 2 / 5 クラス" in index.render(total=5)
+    assert "取得済み" not in index.render(total=2)
+
+
+def test_save_merges_with_other_processes(tmp_path):
+    """保存時に他のインスタンスが保存したクラスを取り込み、上書きしないことを確認"""
+    tree_file = tmp_path / 'index_tree.json'
+    first = NamespaceIndex(tree_file)
+    second = NamespaceIndex(tree_file)
+    first.add(CLASSES[0])
+    first.save()
+    first.render()
+
+    second.add(CLASSES[2])
+    second.remove("Audio.Sound")
+    second.save()
+    first.add(CLASSES[3])
+    first.save()
+
+    assert "Audio.Sound" in first
+    assert "Math.Vector3" in first
+    assert "Math.Angle" in first
+    # 他のインスタンスの変更があった名前空間の描画結果は破棄される
+    assert "Math.Vector3" in first.render()
+
+    reloaded = NamespaceIndex(tree_file)
+    assert reloaded.render() == first.render()
+    reloaded.clear()
+    assert not tree_file.exists()
+
+
+@pytest.fixture
+def scraper(make_scraper):
+    return make_scraper(output={'index_update_every': 2})
+
+
+def test_index_is_updated_as_classes_complete(scraper, tmp_path):
+    """スクレイピングの途中でも、一定件数ごとに取得済みのクラスで索引が書き直されることを確認"""
+    scraper.initialize_progress(CLASSES)
+    index_path = tmp_path / 'index.md'
+
+    scraper.save_class_markdown(ClassDetail(info=CLASSES[0]))
+    assert not index_path.exists()
+    scraper.save_class_markdown(ClassDetail(info=CLASSES[2]))
+
+    md = index_path.read_text(encoding='utf-8')
+    assert "取得済み: 2 / 5 クラス" in md
+    assert "Audio.Sound" in md and "Math.Vector3" in md
+    assert "Math.Angle" not in md
+    # 木のファイルはセッションの終了時にだけ保存する
+    assert not (tmp_path / 'index_tree.json').exists()
+
+    scraper._generate_index()
+    assert len(NamespaceIndex(tmp_path / 'index_tree.json')) == 2
+
+
+def test_periodic_index_updates_do_not_reread_progress_or_tree(make_scraper):
+    """一定件数ごとの索引の書き直しでは、進捗の統計も木のファイルも読み書きしないことを確認"""
+    scraper = make_scraper(output={'index_update_every': 1})
+    scraper.progress_manager.initialize_from_class_list(CLASSES)
+
+    with patch.object(scraper.progress_manager, 'get_statistics',
+                      wraps=scraper.progress_manager.get_statistics) as get_statistics, \
+            patch.object(scraper.namespace_index, 'save', wraps=scraper.namespace_index.save) as save:
+        for info in CLASSES:
+            scraper.save_class_markdown(ClassDetail(info=info))
+        scraper._generate_index()
+
+    assert get_statistics.call_count == 1
+    assert save.call_count == 1
+
+
+def test_classes_missing_from_tree_are_recovered_from_progress(scraper, make_scraper, tmp_path):
+    """木を保存する前に終了したセッションで完了したクラスが、次のセッションの索引に載ることを確認"""
+    scraper.initialize_progress(CLASSES)
+    scraper._generate_index()
+    for info in CLASSES[:3]:
+        scraper.save_class_markdown(ClassDetail(info=info))
+        scraper.progress_manager.mark_completed(info.full_name)
+    scraper.progress_manager.compact()
+
+    restarted = make_scraper(output={'index_update_every': 2})
+    restarted._generate_index()
+
+    md = (tmp_path / 'index.md').read_text(encoding='utf-8')
+    assert all(info.full_name in md for info in CLASSES[:3])
+    assert len(NamespaceIndex(tmp_path / 'index_tree.json')) == 3
+
+
+def test_index_tree_is_bootstrapped_from_completed_entries(scraper, tmp_path):
+    """木が保存されていない場合、完了済みのエントリーから索引が作られることを確認"""
+    scraper.progress_manager.initialize_from_class_list(CLASSES)
+    for info in CLASSES:
+        scraper.progress_manager.mark_completed(info.full_name)
+
+    scraper._generate_index()
+
+    assert (tmp_path / 'index.md').read_text(encoding='utf-8') == EXPECTED_INDEX
+
+
+def test_concurrent_writes_keep_index_consistent(make_scraper, tmp_path):
+    """複数のスレッドからクラスを保存しても、木と索引に全クラスが載ることを確認"""
+    scraper = make_scraper(output={'index_update_every': 1})
+    classes = [ClassInfo(f"C{i:03}", f"NS{i % 7}.C{i:03}", f"c{i}.html", "class", f"NS{i % 7}") for i in range(200)]
+    scraper.initialize_progress(classes)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda info: scraper.save_class_markdown(ClassDetail(info=info)), classes))
+    scraper._generate_index()
+
+    md = (tmp_path / 'index.md').read_text(encoding='utf-8')
+    assert md == MarkdownGenerator().generate_index_markdown(classes)
+    assert len(NamespaceIndex(tmp_path / 'index_tree.json')) == 200
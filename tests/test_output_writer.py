@@ -0,0 +1,127 @@
+"""
+OutputWriterのテスト
+"""
+import json
+import os
+
+import pytest
+
+from src.json_generator import JsonGenerator
+from src.markdown_generator import MarkdownGenerator
+from src.output_writer import OutputWriter, create_output_writer
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return tmp_path / '.manifest.json'
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path, manifest):
+    """同じ内容の2回目以降の書き込みはファイルに触れないことを確認"""
+    path = tmp_path / 'classes' / 'A.md'
+    writer = OutputWriter(manifest)
+    assert writer.write_text(path, "# A") is True
+    writer.flush()
+
+    os.utime(path, (0, 0))
+    writer = OutputWriter(manifest)
+    assert writer.write_text(path, "# A") is False
+    assert path.stat().st_mtime == 0
+    assert writer.write_text(path, "# A v2") is True
+    writer.flush()
+
+    assert path.read_text(encoding='utf-8') == "# A v2"
+    assert (writer.written, writer.unchanged) == (1, 1)
+
+
+def test_file_changed_outside_is_rewritten(tmp_path, manifest):
+    """マニフェストの記録後に削除・変更されたファイルは書き直すことを確認"""
+    deleted = tmp_path / 'deleted.md'
+    truncated = tmp_path / 'truncated.md'
+    writer = OutputWriter(manifest)
+    writer.write_text(deleted, "content")
+    writer.write_text(truncated, "content")
+    writer.flush()
+
+    deleted.unlink()
+    truncated.write_text("", encoding='utf-8')
+    writer = OutputWriter(manifest)
+
+    assert writer.write_text(deleted, "content") is True
+    assert writer.write_text(truncated, "content") is True
+    assert truncated.read_text(encoding='utf-8') == "content"
+
+
+def test_manifest_is_saved_only_on_flush(tmp_path, manifest):
+    """マニフェストはflushで保存され、flush前に中断した書き込みは次回やり直されることを確認"""
+    path = tmp_path / 'A.md'
+    OutputWriter(manifest).write_text(path, "# A")
+
+    assert not manifest.exists()
+    assert OutputWriter(manifest).write_text(path, "# A") is True
+
+
+def test_no_temporary_files_left(tmp_path, manifest):
+    """書き込み後に一時ファイルが残らないことを確認"""
+    writer = OutputWriter(manifest)
+    for i in range(3):
+        writer.write_text(tmp_path / 'out' / f'{i}.md', f"# {i}")
+    writer.flush()
+
+    assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == ['0.md', '1.md', '2.md']
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_flush_merges_with_manifest_on_disk(tmp_path, manifest):
+    """他のライターが記録したエントリーを上書きせず、変更したエントリーだけを反映することを確認"""
+    first = OutputWriter(manifest)
+    second = OutputWriter(manifest)
+    first.write_text(tmp_path / 'A.md', "# A")
+    second.write_text(tmp_path / 'B.md', "# B")
+    first.flush()
+    second.flush()
+
+    assert sorted(json.loads(manifest.read_text(encoding='utf-8'))) == ['A.md', 'B.md']
+
+
+def test_remove(tmp_path, manifest):
+    """削除したファイルはマニフェストからも除かれることを確認"""
+    path = tmp_path / 'A.md'
+    writer = OutputWriter(manifest)
+    writer.write_text(path, "# A")
+    writer.flush()
+
+    writer = OutputWriter(manifest)
+    assert writer.remove(path) is True
+    assert writer.remove(path) is False
+    writer.flush()
+
+    assert not path.exists()
+    assert json.loads(manifest.read_text(encoding='utf-8')) == {}
+
+
+def test_without_manifest_always_writes(tmp_path):
+    """マニフェストがない場合は比較せず常に書き込むことを確認"""
+    writer = OutputWriter(None, fsync=False)
+    assert writer.write_text(tmp_path / 'A.md', "# A") is True
+    assert writer.write_text(tmp_path / 'A.md', "# A") is True
+    writer.flush()
+
+
+def test_generators_write_through_writer(tmp_path, manifest):
+    """MarkdownGenerator/JsonGeneratorの保存がライター経由になることを確認"""
+    writer = OutputWriter(manifest)
+    MarkdownGenerator(writer).save_markdown("# A", tmp_path / 'A.md')
+    JsonGenerator(writer).save_json({'name': 'A'}, tmp_path / 'A.json')
+    MarkdownGenerator(writer).save_markdown("# A", tmp_path / 'A.md')
+
+    assert (writer.written, writer.unchanged) == (2, 1)
+    assert json.loads((tmp_path / 'A.json').read_text(encoding='utf-8')) == {'name': 'A'}
+
+
+def test_create_output_writer(tmp_path):
+    """設定からライターを生成"""
+    writer = create_output_writer({'output': {'manifest': str(tmp_path / 'm.json'), 'fsync': False}})
+    assert writer.manifest_file == tmp_path / 'm.json'
+    assert writer.fsync is False
+    assert create_output_writer({}).manifest_file is None
@@ -0,0 +1,125 @@
+"""
+ページキャッシュのテスト
+"""
+import pytest
+
+from src.page_cache import FilePageCache, PackPageCache, RawPage, copy_page_cache
+
+
+URL = "https://example.com/doc/class_a.html"
+
+
+@pytest.fixture
+def pack(tmp_path):
+    """テスト用のパックファイルキャッシュ"""
+    cache = PackPageCache(tmp_path / "html.pack")
+    yield cache
+    cache.close()
+
+
+def test_pack_put_and_get(pack):
+    """保存したページがバイト列とエンコーディングのまま読み込めることを確認"""
+    page = RawPage("<html>日本語</html>".encode('shift_jis'), 'shift_jis')
+    pack.put(URL, page, {'etag': '"v1"', 'fetched_at': '2025-01-01T00:00:00'})
+
+    assert pack.exists(URL)
+    assert pack.get(URL) == page
+    assert pack.get_validators(URL)['etag'] == '"v1"'
+    assert not pack.exists("https://example.com/other/class_a.html")
+    assert pack.get("https://example.com/other/class_a.html") is None
+
+
+def test_pack_keys_by_full_url(pack):
+    """同じファイル名でもパスが異なるページは衝突しないことを確認"""
+    other_url = "https://example.com/en/class_a.html"
+    pack.put(URL, RawPage(b"ja"), {})
+    pack.put(other_url, RawPage(b"en"), {})
+
+    assert pack.get(URL).content == b"ja"
+    assert pack.get(other_url).content == b"en"
+
+
+def test_pack_deduplicates_content(pack):
+    """同一内容の本文は一度だけ保存されることを確認"""
+    content = b"<html>" + b"x" * 10000 + b"</html>"
+    pack.put(URL, RawPage(content), {})
+    size_after_first = pack.pack_path.stat().st_size
+    pack.put("https://example.com/doc/class_b.html", RawPage(content), {})
+
+    # 2件目はメタデータレコードのみ追加される
+    assert pack.pack_path.stat().st_size - size_after_first < 500
+    assert pack.get("https://example.com/doc/class_b.html").content == content
+
+
+def test_pack_update_validators_keeps_content(pack):
+    """バリデータのみの更新で本文とエンコーディングが維持されることを確認"""
+    pack.put(URL, RawPage(b"body", 'utf-8'), {'etag': '"v1"'})
+    pack.update_validators(URL, {'etag': '"v1"', 'fetched_at': 'later'})
+
+    assert pack.get(URL) == RawPage(b"body", 'utf-8')
+    assert pack.get_validators(URL)['fetched_at'] == 'later'
+
+
+def test_pack_persists_and_rebuilds_index(tmp_path):
+    """再オープン時に索引が使われ、索引がなくてもパックから再構築されることを確認"""
+    pack_path = tmp_path / "html.pack"
+    cache = PackPageCache(pack_path)
+    cache.put(URL, RawPage(b"v1"), {})
+    cache.put(URL, RawPage(b"v2"), {})
+    cache.close()
+
+    reopened = PackPageCache(pack_path)
+    assert reopened.get(URL).content == b"v2"
+    reopened.close()
+
+    cache.index_path.unlink()
+    rebuilt = PackPageCache(pack_path)
+    assert rebuilt.get(URL).content == b"v2"
+    assert list(rebuilt.iter_urls()) == [URL]
+    rebuilt.close()
+
+
+def test_pack_replays_records_missing_from_index(tmp_path):
+    """索引に反映される前に追記されたレコードが再オープン時に取り込まれることを確認"""
+    pack_path = tmp_path / "html.pack"
+    cache = PackPageCache(pack_path)
+    cache.put(URL, RawPage(b"v1"), {})
+    cache.close()
+    index_before = cache.index_path.read_bytes()
+
+    cache = PackPageCache(pack_path)
+    cache.put(URL, RawPage(b"v2"), {})
+    cache.close()
+    # 異常終了で索引の更新が失われた状態を再現
+    cache.index_path.write_bytes(index_before)
+
+    reopened = PackPageCache(pack_path)
+    assert reopened.get(URL).content == b"v2"
+    reopened.close()
+
+
+def test_pack_grows_index(tmp_path, monkeypatch):
+    """登録数が増えると索引が拡張され、全エントリーが引けることを確認"""
+    monkeypatch.setattr(PackPageCache, 'INITIAL_CAPACITY', 8)
+    cache = PackPageCache(tmp_path / "html.pack")
+    urls = [f"https://example.com/doc/page{i}.html" for i in range(50)]
+    for i, url in enumerate(urls):
+        cache.put(url, RawPage(f"page{i}".encode()), {})
+
+    assert all(cache.get(url).content == f"page{i}".encode() for i, url in enumerate(urls))
+    cache.close()
+
+
+def test_copy_file_cache_to_pack(tmp_path, pack):
+    """html/ のキャッシュをパックファイルに移行できることを確認"""
+    files = FilePageCache(tmp_path / "html")
+    files.put("https://example.com/doc/class_a.html", RawPage(b"a", 'utf-8'), {'etag': '"a"'})
+    # サイドカーのない旧形式のキャッシュ
+    (tmp_path / "html" / "class_b.html").write_bytes(b"b")
+
+    count = copy_page_cache(files, pack, "https://example.com/doc")
+
+    assert count == 2
+    assert pack.get("https://example.com/doc/class_a.html") == RawPage(b"a", 'utf-8')
+    assert pack.get_validators("https://example.com/doc/class_a.html")['etag'] == '"a"'
+    assert pack.get("https://example.com/doc/class_b.html").content == b"b"
@@ -0,0 +1,198 @@
+"""
+parse_cache.pyのテストコード
+"""
+from pathlib import Path
+
+import pytest
+
+import src.parser
+from src.parser import BakinParser, ClassInfo
+from src.lxml_parser import LxmlBakinParser
+from src.parse_cache import ParseResultCache, create_parse_cache, normalize_page
+from src.scraper import RawPage
+from src.signature_parser import TypeDictionary
+
+
+SAMPLE_CLASS_HTML = Path(__file__).parent / "data" / "sample_class.html"
+
+CLASS_INFO = ClassInfo(
+    name="Sound",
+    full_name="FakeEngine.Audio.Sound",
+    url="class_fake_engine_1_1_audio_1_1_sound.html",
+    type="class",
+    namespace="FakeEngine.Audio"
+)
+
+FOOTER = ('<!-- Generated by Doxygen 1.9.{v} -->\n'
+          '<hr class="footer"/><address class="footer"><small>生成日時: 2024/0{v}/01 作成者 doxygen 1.9.{v}'
+          '</small></address>\n</body>')
+
+
+def _with_footer(content: bytes, version: int) -> bytes:
+    return content.replace(b'</body>', FOOTER.format(v=version).encode('utf-8'))
+
+
+def _fail_parse(*args, **kwargs):
+    raise AssertionError("page should have been served from the parse cache")
+
+
+def test_normalize_ignores_generated_footer():
+    """生成日時などのフッターだけが異なるページは同じキーになることを確認"""
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    page_a = _with_footer(content, 4)
+    page_b = _with_footer(content, 8)
+
+    assert page_a != page_b
+    assert normalize_page(page_a) == normalize_page(page_b)
+    assert ParseResultCache.make_key(page_a, None, 'p/1') == ParseResultCache.make_key(page_b, None, 'p/1')
+
+
+def test_key_depends_on_parser_and_encoding():
+    """パーサーの識別子やエンコーディングが異なればキーも異なることを確認"""
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    key = ParseResultCache.make_key(content, None, 'html.parser/1')
+
+    assert key != ParseResultCache.make_key(content, None, 'html.parser/2')
+    assert key != ParseResultCache.make_key(content, None, 'lxml/1')
+    assert key != ParseResultCache.make_key(content, 'shift_jis', 'html.parser/1')
+    assert key != ParseResultCache.make_key(content + b' ', None, 'html.parser/1')
+
+
+def test_cached_parse_skips_html_parsing(tmp_path, monkeypatch):
+    """2回目のパースはキャッシュから復元され、結果が一致することを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    parser = BakinParser(result_cache=cache)
+    content = SAMPLE_CLASS_HTML.read_bytes()
+
+    expected = parser.parse_class_content(_with_footer(content, 4), CLASS_INFO)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    monkeypatch.setattr(BakinParser, '_parse_class_content', _fail_parse)
+    other_info = ClassInfo(name="Sound", full_name="Other.Sound", url="x.html", type="class", namespace="Other")
+    actual = parser.parse_class_content(_with_footer(content, 9), other_info)
+
+    assert cache.hits == 1
+    assert actual.info is other_info
+    assert actual.methods == expected.methods
+    assert [list(m) for m in actual.methods] == [list(m) for m in expected.methods]
+    assert (actual.description_full, actual.inherits_from, actual.properties, actual.fields) == \
+        (expected.description_full, expected.inherits_from, expected.properties, expected.fields)
+
+
+def test_parser_version_change_invalidates_cache(tmp_path, monkeypatch):
+    """PARSER_VERSIONを上げるとキャッシュが使われないことを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    parser = BakinParser(result_cache=cache)
+    content = SAMPLE_CLASS_HTML.read_bytes()
+
+    parser.parse_class_content(content, CLASS_INFO)
+    monkeypatch.setattr(src.parser, 'PARSER_VERSION', src.parser.PARSER_VERSION + 1)
+    parser.parse_class_content(content, CLASS_INFO)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_known_types_change_invalidates_only_affected_pages(tmp_path):
+    """型名の辞書の変更では、追加・削除された型名で始まるパラメータを含むページだけが再パースされることを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    content = SAMPLE_CLASS_HTML.read_bytes().replace(b"(bool loop, int typeIndex)", b"(boolloop, FakeSoundtypeIndex)")
+
+    BakinParser(result_cache=cache, known_types=TypeDictionary(['Sound'])).parse_class_content(content, CLASS_INFO)
+    # ページのパラメータに関係しない型名の追加・削除ではキャッシュを使う
+    BakinParser(result_cache=cache, known_types=TypeDictionary(['Cast'])).parse_class_content(content, CLASS_INFO)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    parser = BakinParser(result_cache=cache, known_types=TypeDictionary(['Cast', 'FakeSound']))
+    detail = parser.parse_class_content(content, CLASS_INFO)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert detail.methods[0]['signature'] == "play (bool loop, FakeSound typeIndex)"
+
+    parser.parse_class_content(content, CLASS_INFO)
+    BakinParser(result_cache=cache, known_types=TypeDictionary(['Cast'])).parse_class_content(content, CLASS_INFO)
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+@pytest.mark.parametrize("parser_class", [BakinParser, LxmlBakinParser])
+def test_raw_signatures_are_kept_out_of_methods(tmp_path, parser_class):
+    """整形前のシグネチャはメソッド情報ではなくClassDetail.raw_signaturesに入り、キャッシュにも保存されることを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    content = SAMPLE_CLASS_HTML.read_bytes()
+
+    detail = parser_class(result_cache=cache).parse_class_content(content, CLASS_INFO)
+    assert all('raw_signature' not in method for method in detail.methods)
+    assert len(detail.raw_signatures) == len(detail.methods)
+    assert "bool loop, int typeIndex" in detail.raw_signatures[0]
+
+    cached = parser_class(result_cache=cache).parse_class_content(content, CLASS_INFO)
+    assert cache.hits == 1
+    assert cached.raw_signatures == detail.raw_signatures
+
+
+def test_backends_do_not_share_entries(tmp_path):
+    """バックエンドごとに別のキャッシュエントリーになることを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    content = SAMPLE_CLASS_HTML.read_bytes()
+
+    BakinParser(result_cache=cache).parse_class_content(content, CLASS_INFO)
+    LxmlBakinParser(result_cache=cache).parse_class_content(content, CLASS_INFO)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_unreadable_entry_is_reparsed(tmp_path):
+    """壊れたキャッシュファイルは無視して再パースされることを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    parser = BakinParser(result_cache=cache)
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    expected = parser.parse_class_content(content, CLASS_INFO)
+
+    key = cache.make_key(content, None, parser.parser_id)
+    cache._get_path(key).write_text('{broken', encoding='utf-8')
+
+    assert parser.parse_class_content(content, CLASS_INFO) == expected
+    assert cache.get(key, CLASS_INFO) == expected
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_parse_class_contents_uses_cache(tmp_path, processes):
+    """複数ページのパースでキャッシュ済みのページだけ省略され、順序が保たれることを確認"""
+    cache = ParseResultCache(tmp_path / 'parsed')
+    parser = BakinParser(result_cache=cache)
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    infos = [ClassInfo(name=f"C{i}", full_name=f"N.C{i}", url=f"c{i}.html", type="class", namespace="N")
+             for i in range(5)]
+    pages = [(content.replace(b'FakeEngine.Audio.Sound', f'N.C{i}'.encode()), info, None)
+             for i, info in enumerate(infos)]
+
+    # 一部だけ先にキャッシュしておく
+    list(parser.parse_class_contents(pages[1:3], processes=1))
+    cache.hits = cache.misses = 0
+
+    results = list(parser.parse_class_contents(pages, processes=processes, batch_size=2))
+
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert [r.info for r in results] == infos
+    assert results == [BakinParser().parse_class_content(*page) for page in pages]
+
+
+def test_create_parse_cache():
+    """設定からキャッシュが生成される（未設定の場合は無効）ことを確認"""
+    assert create_parse_cache({}) is None
+    assert create_parse_cache({'parsing': {'result_cache_dir': None}}) is None
+    assert create_parse_cache({'parsing': {'result_cache_dir': 'parsed'}}).cache_dir == Path('parsed')
+
+
+def test_known_types_are_loaded_only_for_parsing(make_scraper, tmp_path):
+    """型名の辞書はクラス一覧を読み込むだけのコマンドでは作られず、最初のパースの前に作られることを確認"""
+    (tmp_path / 'class_list.json').write_text(
+        '[{"name": "FakeSound", "full_name": "N.FakeSound", "url": "s.html", "type": "class", "namespace": "N"}]',
+        encoding='utf-8')
+    scraper = make_scraper()
+    scraper.fetch_class_list()
+    assert scraper.parser.known_types is None
+
+    content = SAMPLE_CLASS_HTML.read_bytes().replace(b"(bool loop, int typeIndex)", b"(FakeSoundsound)")
+    detail = scraper._parse_fetched_page(RawPage(content, None), CLASS_INFO)
+
+    assert "N.FakeSound" in scraper.parser.known_types
+    assert detail.methods[0]['signature'] == "play (FakeSound sound)"
@@ -43,3 +43,51 @@ def test_parse_annotated_page():
     # Yukar.Common.Rom名前空間のクラスが存在することを確認
     yukar_common_rom_classes = [c for c in classes if c.namespace == "Yukar.Common.Rom"]
     assert len(yukar_common_rom_classes) > 0, "No classes found in Yukar.Common.Rom namespace"
+
+
+SAMPLE_CLASS_HTML = Path(__file__).parent / "data" / "sample_class.html"
+
+
+def _parse_sample_class():
+    info = ClassInfo(
+        name="Sound",
+        full_name="FakeEngine.Audio.Sound",
+        url="class_fake_engine_1_1_audio_1_1_sound.html",
+        type="class",
+        namespace="FakeEngine.Audio"
+    )
+    return BakinParser().parse_class_content(SAMPLE_CLASS_HTML.read_bytes(), info)
+
+
+def test_memdoc_index_matches_find_next():
+    """アンカー索引がアンカーごとのfind_next検索と同じmemdocを指すこと"""
+    soup = BeautifulSoup(SAMPLE_CLASS_HTML.read_bytes(), 'html.parser')
+    index = BakinParser._build_memdoc_index(soup)
+
+    for anchor in soup.find_all('a', id=True):
+        expected = soup.find('a', {'id': anchor['id']}).find_next('div', class_='memdoc')
+        assert index.get(anchor['id']) is expected
+
+
+def test_member_descriptions():
+    """メソッド・プロパティ・フィールドの詳細説明が抽出されること"""
+    detail = _parse_sample_class()
+
+    methods = {m['name']: m for m in detail.methods}
+    assert methods['play']['description'] == "サウンドを再生する ループ指定時は停止するまで繰り返す。"
+    assert methods['create']['description'] == "ファイルからサウンドを生成する"
+    # 詳細説明のないメンバー（空のmemdoc、詳細セクションなし）
+    assert 'description' not in methods['stop']
+    assert 'description' not in methods['setSurround']
+
+    props = {p['name']: p for p in detail.properties}
+    assert props['Volume']['description'] == "音量（0.0〜1.0）"
+    assert props['InstanceCount']['description'] == "生成済みインスタンス数"
+    assert 'description' not in props['IsPlaying']
+
+    fields = {f['name']: f for f in detail.fields}
+    assert fields['handle']['description'] == "ネイティブハンドル"
+    assert 'description' not in fields['channel']
+
+    # メンバー情報には内部用のキー（anchor_idなど）を持たせない
+    assert all('anchor_id' not in m for m in detail.methods + detail.properties + detail.fields)
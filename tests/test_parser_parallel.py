@@ -0,0 +1,70 @@
+"""
+複数プロセスによるクラスページパースのテスト
+"""
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.parser import BakinParser, ClassInfo
+from src.signature_parser import TypeDictionary
+
+
+SAMPLE_CLASS_HTML = Path(__file__).parent / "data" / "sample_class.html"
+
+
+@pytest.fixture
+def pages():
+    """同一内容で名前の異なるクラスページ群"""
+    content = SAMPLE_CLASS_HTML.read_bytes()
+    return [
+        (content, ClassInfo(f"Sound{i}", f"FakeEngine.Audio.Sound{i}", f"sound{i}.html", "class", "FakeEngine.Audio"), None)
+        for i in range(10)
+    ]
+
+
+def test_parse_class_content_matches_soup_path(pages):
+    """バイト列からのパース結果がBeautifulSoup経由のパース結果と一致することを確認"""
+    content, class_info, _ = pages[0]
+    parser = BakinParser()
+    soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
+
+    assert parser.parse_class_content(content, class_info) == parser.parse_class_page(soup, class_info)
+
+
+def test_parse_class_contents_is_ordered_and_identical(pages):
+    """複数プロセスの結果が入力順で、逐次パースと同一であることを確認"""
+    parser = BakinParser()
+
+    serial = list(parser.parse_class_contents(pages, processes=1))
+    parallel = list(parser.parse_class_contents(pages, processes=2, batch_size=3))
+
+    assert parallel == serial
+    assert [d.info.full_name for d in parallel] == [info.full_name for _, info, _ in pages]
+    assert len(parallel[0].methods) == 5
+
+
+def test_parse_class_contents_skips_broken_pages(pages, caplog):
+    """パースに失敗したページはNoneになり、後続のページは処理されることを確認"""
+    broken = [pages[0], (None, pages[1][1], None), pages[2]]
+
+    results = list(BakinParser().parse_class_contents(broken, processes=2))
+
+    assert results[0] is not None
+    assert results[1] is None
+    assert results[2] is not None
+    assert any("Failed to parse FakeEngine.Audio.Sound1" in r.message for r in caplog.records)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_parse_class_contents_uses_known_types(pages, processes):
+    """ワーカープロセスでも型名の辞書でパラメータが分割されることを確認"""
+    content = pages[0][0].replace(b"(bool loop, int typeIndex)", b"(boolloop, FakeSoundtypeIndex)")
+    pages = [(content, info, encoding) for _, info, encoding in pages[:3]]
+
+    without = list(BakinParser().parse_class_contents(pages, processes=processes))
+    parser = BakinParser(known_types=TypeDictionary(['FakeSound']))
+    results = list(parser.parse_class_contents(pages, processes=processes, batch_size=2))
+
+    assert without[0].methods[0]['signature'] == "play (boolloop, FakeSoundtype Index)"
+    assert [d.methods[0]['signature'] for d in results] == ["play (bool loop, FakeSound typeIndex)"] * 3
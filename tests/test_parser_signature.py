@@ -80,6 +80,10 @@ class TestParserSignatureFormatting:
         # 型と変数名の間にスペースがあることを確認
         assert 'SurroundMode surroundMode' in method['signature']
         assert 'VolumeRollOffType volumeRollOff' in method['signature']
+        assert method['parameters'] == [
+            {'type': 'SurroundMode', 'name': 'surroundMode', 'modifiers': [], 'default': None},
+            {'type': 'VolumeRollOffType', 'name': 'volumeRollOff', 'modifiers': [], 'default': None},
+        ]
 
     def test_parse_static_method_removes_static_keyword(self, parser, sample_class_info):
         """静的メソッドの戻り値型からstaticキーワードが削除されるか確認"""
@@ -0,0 +1,147 @@
+"""
+ステージ型パイプラインのテスト
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.parser import ClassInfo
+from src.pipeline import Stage, StagedPipeline, log_stage_stats
+from src.scraper import RawPage
+
+
+def test_pipeline_processes_all_items():
+    """全アイテムが全ステージを通過することを確認"""
+    results = []
+    lock = threading.Lock()
+
+    def sink(value):
+        with lock:
+            results.append(value)
+
+    stages = [
+        Stage('double', lambda x: x * 2, workers=3),
+        Stage('inc', lambda x: x + 1, workers=2),
+        Stage('sink', sink),
+    ]
+    stats = StagedPipeline(stages, queue_size=2).run(range(20))
+
+    assert sorted(results) == [i * 2 + 1 for i in range(20)]
+    assert [s.processed for s in stats] == [20, 20, 20]
+    assert all(s.failed == 0 for s in stats)
+
+
+def test_pipeline_reports_errors_with_original_item():
+    """失敗したアイテムが元の入力とステージ名で通知され、他は処理されることを確認"""
+    errors = []
+    results = []
+
+    def parse(value):
+        if value == 3:
+            raise ValueError("bad item")
+        return value
+
+    stages = [
+        Stage('fetch', lambda x: x),
+        Stage('parse', parse),
+        Stage('write', results.append),
+    ]
+    pipeline = StagedPipeline(stages, on_error=lambda item, stage, e: errors.append((item, stage, str(e))))
+    stats = pipeline.run(range(5))
+
+    assert errors == [(3, 'parse', 'bad item')]
+    assert sorted(results) == [0, 1, 2, 4]
+    assert stats[1].failed == 1
+
+
+def test_starved_stage_reports_achieved_throughput(caplog):
+    """入力待ちのステージは、処理能力ではなく実際に達成した件数/秒が報告されることを確認"""
+    stages = [
+        Stage('fetch', lambda x: time.sleep(0.02) or x),
+        Stage('parse', lambda x: x, workers=2),
+    ]
+    fetch, parse = StagedPipeline(stages).run(range(10))
+
+    # parseは処理時間がほぼ0でも、fetchの速度でしか処理できない
+    assert parse.capacity > fetch.capacity * 10
+    assert parse.throughput < fetch.capacity * 1.5
+    assert 0.9 < fetch.utilization <= 1.0
+    assert parse.utilization < 0.1
+
+    with caplog.at_level('INFO', logger='src.pipeline'):
+        log_stage_stats([fetch, parse])
+    assert "Bottleneck stage: fetch" in caplog.text
+
+
+def test_pipeline_applies_backpressure():
+    """下流が遅い場合に上流の先行処理がキュー長で制限されることを確認"""
+    fetched = []
+    written = []
+
+    def fetch(value):
+        fetched.append(value)
+        return value
+
+    def slow_write(value):
+        # 書き込み時点で先行している取得件数を記録
+        written.append(len(fetched) - len(written))
+        time.sleep(0.01)
+
+    stages = [Stage('fetch', fetch, workers=2), Stage('write', slow_write)]
+    StagedPipeline(stages, queue_size=2).run(range(15))
+
+    # キュー長 + 処理中のワーカー数 + 書き込み中の1件を超えて先行しない
+    assert max(written) <= 2 + 2 + 1
+
+
+def test_interrupt_waits_for_in_flight_items():
+    """Ctrl-Cで中断した場合も、処理中のアイテムを終えてワーカーが終了してから例外を送出することを確認"""
+    active = []
+    finished = []
+    started = threading.Event()
+
+    def slow_write(value):
+        active.append(value)
+        started.set()
+        time.sleep(0.05)
+        finished.append(value)
+        active.remove(value)
+
+    def items():
+        yield from range(3)
+        # 書き込みが始まってから中断する
+        started.wait(timeout=5)
+        raise KeyboardInterrupt
+
+    pipeline = StagedPipeline([Stage('fetch', lambda x: x, workers=2), Stage('write', slow_write)], queue_size=4)
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run(items())
+
+    assert active == []
+    assert not any(t.name.startswith(('fetch-', 'write-')) for t in threading.enumerate())
+    # 中断時に処理中だったアイテムは最後まで書き込まれる
+    assert finished
+
+
+def test_scrape_with_progress_pipelined(make_scraper, tmp_path):
+    """パイプラインモードで全クラスが保存され完了マークされることを確認"""
+    scraper = make_scraper(scraping={'workers': 2}, pipeline={'queue_size': 2})
+    classes = [
+        ClassInfo(f"C{i}", f"NS.C{i}", f"c{i}.html", "class", "NS") for i in range(4)
+    ]
+    scraper.progress_manager.initialize_from_class_list(classes)
+
+    page = RawPage("<html><body><div class='textblock'>説明</div></body></html>".encode('utf-8'), 'utf-8')
+    with patch.object(scraper.scraper, 'fetch_raw_class_page',
+                      side_effect=lambda url: None if url == "c2.html" else page), \
+            patch.object(scraper, '_generate_index'):
+        scraper.scrape_with_progress(pipeline=True)
+
+    stats = scraper.progress_manager.get_statistics()
+    assert stats['completed'] == 3
+    assert stats['pending'] == 1
+    assert (tmp_path / 'classes' / 'NS.C0.md').exists()
+    assert (tmp_path / 'json' / 'NS.C3.json').exists()
+    assert not (tmp_path / 'classes' / 'NS.C2.md').exists()
@@ -0,0 +1,155 @@
+"""
+進捗のリース（複数ワーカーでの分担）のテストコード
+"""
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.parser import ClassInfo
+from src.progress_manager import ProgressManager, SqliteProgressManager
+from src.scraper import RawPage
+
+
+CLASSES = [ClassInfo(name=f"C{i}", full_name=f"N.C{i}", url=f"c{i}.html", type="class", namespace="N")
+           for i in range(20)]
+
+
+def _open(backend: str, path: Path):
+    if backend == 'sqlite':
+        return SqliteProgressManager(path / "progress.db")
+    return ProgressManager(path / "progress.csv", fsync=False)
+
+
+@pytest.fixture(params=['csv', 'sqlite'])
+def backend(request):
+    return request.param
+
+
+def _work_in_process(backend: str, path: str, worker_id: str) -> list:
+    """別プロセスのワーカーとして、借り受けられなくなるまで借り受けて完了とする"""
+    pm = _open(backend, Path(path))
+    processed = []
+    while True:
+        entries = pm.claim_entries(worker_id, 3)
+        if not entries:
+            break
+        for entry in entries:
+            processed.append(entry.full_name)
+            pm.mark_completed(entry.full_name)
+    pm.release_entries(worker_id)
+    pm.compact()
+    return processed
+
+
+def test_claims_do_not_overlap(backend, tmp_path):
+    """別々のワーカーには重複しないエントリーが先頭から順に貸し出されることを確認"""
+    pm = _open(backend, tmp_path)
+    pm.initialize_from_class_list(CLASSES)
+
+    first = pm.claim_entries('a', 5)
+    second = pm.claim_entries('b', 5)
+    assert [e.full_name for e in first] == [c.full_name for c in CLASSES[:5]]
+    assert [e.full_name for e in second] == [c.full_name for c in CLASSES[5:10]]
+
+    # 完了したエントリーは返却後も貸し出されない
+    pm.mark_completed(first[0].full_name)
+    pm.release_entries('a')
+    again = pm.claim_entries('c', 5)
+    assert [e.full_name for e in again] == [c.full_name for c in CLASSES[1:5]] + [CLASSES[10].full_name]
+
+
+def test_release_specific_entries(backend, tmp_path):
+    """指定したエントリーのみを返却でき、他のワーカーのリースは返却されないことを確認"""
+    pm = _open(backend, tmp_path)
+    pm.initialize_from_class_list(CLASSES[:4])
+
+    pm.claim_entries('a', 2)
+    pm.claim_entries('b', 2)
+    pm.release_entries('a', [CLASSES[1].full_name])
+    pm.release_entries('c')
+
+    assert [e.full_name for e in pm.claim_entries('c', 4)] == [CLASSES[1].full_name]
+
+
+def test_expired_leases_return_to_pool(backend, tmp_path):
+    """期限の切れたリースは他のワーカーが借り受けられることを確認"""
+    pm = _open(backend, tmp_path)
+    pm.initialize_from_class_list(CLASSES[:3])
+
+    pm.claim_entries('dead', 2, lease_seconds=0.05)
+    assert [e.full_name for e in pm.claim_entries('b', 3)] == [CLASSES[2].full_name]
+
+    time.sleep(0.1)
+    assert [e.full_name for e in pm.claim_entries('c', 3)] == [c.full_name for c in CLASSES[:2]]
+
+
+def test_reset_releases_leases(backend, tmp_path):
+    """進捗のリセットでリースも解除されることを確認"""
+    pm = _open(backend, tmp_path)
+    pm.initialize_from_class_list(CLASSES[:3])
+    pm.claim_entries('a', 3)
+
+    pm.reset_progress()
+    assert len(pm.claim_entries('b', 3)) == 3
+
+
+def test_concurrent_workers_split_crawl(backend, tmp_path):
+    """複数プロセスのワーカーが重複なく全エントリーを分担することを確認"""
+    pm = _open(backend, tmp_path)
+    pm.initialize_from_class_list(CLASSES)
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_work_in_process, [backend] * 4, [str(tmp_path)] * 4,
+                                    [f"w{i}" for i in range(4)]))
+
+    processed = [name for names in results for name in names]
+    assert sorted(processed) == sorted(c.full_name for c in CLASSES)
+    assert pm.get_statistics()['completed'] == len(CLASSES)
+    assert not (tmp_path / "progress.csv.lock").exists()
+
+
+def test_sqlite_adds_lease_columns_to_existing_database(tmp_path):
+    """リースの列がない既存のデータベースでも借り受けられることを確認"""
+    db_file = tmp_path / "progress.db"
+    conn = sqlite3.connect(str(db_file))
+    conn.execute("""
+        CREATE TABLE progress (
+            position INTEGER PRIMARY KEY, full_name TEXT NOT NULL UNIQUE, name TEXT NOT NULL DEFAULT '',
+            url TEXT NOT NULL DEFAULT '', type TEXT NOT NULL DEFAULT '', namespace TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '', completed INTEGER NOT NULL DEFAULT 0,
+            last_updated TEXT NOT NULL DEFAULT ''
+        )
+    """)
+    conn.execute("INSERT INTO progress (full_name, name) VALUES ('N.C0', 'C0')")
+    conn.commit()
+    conn.close()
+
+    pm = SqliteProgressManager(db_file)
+    assert [e.full_name for e in pm.claim_entries('a', 5)] == ['N.C0']
+    pm.close()
+
+
+def test_scrape_with_progress_shared(make_scraper, tmp_path):
+    """分担モードで少しずつ借り受けて処理し、失敗したエントリーは終了時に返却されることを確認"""
+    scraper = make_scraper(progress={'claim_batch': 2})
+    scraper.progress_manager.initialize_from_class_list(CLASSES[:5])
+
+    page = RawPage("<html><body><div class='textblock'>説明</div></body></html>".encode('utf-8'), 'utf-8')
+    with patch.object(scraper.scraper, 'fetch_raw_class_page',
+                      side_effect=lambda url: None if url == "c2.html" else page) as fetch, \
+            patch.object(scraper.progress_manager, 'claim_entries',
+                         wraps=scraper.progress_manager.claim_entries) as claim, \
+            patch.object(scraper, '_generate_index'):
+        scraper.scrape_with_progress(shared=True)
+
+    assert fetch.call_count == 5
+    # 2件ずつ3回借り受け、4回目で借り受けられるものがなくなる
+    assert claim.call_count == 4
+    stats = scraper.progress_manager.get_statistics()
+    assert stats['completed'] == 4
+    # 失敗したエントリーのリースは返却され、次のセッションで再び借り受けられる
+    assert [e.full_name for e in scraper.progress_manager.claim_entries('next', 5)] == [CLASSES[2].full_name]
@@ -10,6 +10,7 @@ import tempfile
 import shutil
 import json
 import csv
+import threading
 
 from src.parser import ClassInfo
 from src.progress_manager import ProgressManager
@@ -133,3 +134,127 @@ def test_entry_to_class_info(test_classes, temp_dir):
     assert class_info.type == 'class'
     assert class_info.namespace == 'FakeEngine.Core'
     assert class_info.description == 'ゲームエンジンのコアクラス'
+
+
+def test_mark_completed_appends_to_journal(test_classes, temp_dir):
+    """完了の記録はCSVを書き直さずジャーナルに追記され、新しいインスタンスでも再生されることを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+    snapshot = progress_file.read_bytes()
+
+    pm.mark_completed('FakeEngine.Core.GameEngine')
+    pm.mark_completed('Unknown.Class')  # 存在しないクラスは記録しない
+
+    assert progress_file.read_bytes() == snapshot
+    assert len(pm.journal_file.read_text(encoding='utf-8').splitlines()) == 1
+
+    reloaded = ProgressManager(progress_file)
+    assert reloaded.get_statistics()['completed'] == 1
+    assert reloaded.get_pending_entries()[0].full_name != 'FakeEngine.Core.GameEngine'
+
+
+def test_compact_writes_journal_into_csv(test_classes, temp_dir):
+    """コンパクションでジャーナルがCSVに反映され、ジャーナルが削除されることを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+    pm.mark_completed('FakeEngine.Core.GameEngine')
+    expected = pm.load_progress()
+
+    pm.compact()
+
+    assert not pm.journal_file.exists()
+    assert pm.load_progress() == expected
+    with open(progress_file, 'r', encoding='utf-8', newline='') as f:
+        rows = {row['full_name']: row for row in csv.DictReader(f)}
+    assert rows['FakeEngine.Core.GameEngine']['completed'] == 'True'
+
+
+def test_journal_compacts_automatically(test_classes, temp_dir):
+    """記録数がエントリー数に達すると自動でコンパクションされることを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, compact_every=1, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+
+    for cls in test_classes[:-1]:
+        pm.mark_completed(cls.full_name)
+    assert pm.journal_file.exists()
+
+    pm.mark_completed(test_classes[-1].full_name)
+    assert not pm.journal_file.exists()
+    assert pm.get_statistics()['completed'] == len(test_classes)
+
+
+def test_journal_count_includes_other_processes(test_classes, temp_dir):
+    """他のプロセスの追記も数えてコンパクションを判断し、コンパクション後は数え直すことを確認"""
+    progress_file = temp_dir / "progress.csv"
+    first = ProgressManager(progress_file, compact_every=1, fsync=False)
+    first.initialize_from_class_list(test_classes)
+    second = ProgressManager(progress_file, compact_every=1, fsync=False)
+
+    for i, cls in enumerate(test_classes[:-1]):
+        (first if i % 2 else second).mark_completed(cls.full_name)
+    assert first.journal_file.exists()
+
+    # 残りの1件でジャーナルの記録数（両方のプロセスの合計）がエントリー数に達する
+    first.mark_completed(test_classes[-1].full_name)
+    assert not first.journal_file.exists()
+
+    second.mark_completed(test_classes[0].full_name)
+    assert second._journal_records == 1
+    assert second.get_statistics()['completed'] == len(test_classes)
+
+
+def test_load_progress_waits_for_file_lock(test_classes, temp_dir):
+    """他のプロセスがロックを保持している間（コンパクション中など）は読み込みを待つことを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+    pm.lock_file.touch()
+
+    loaded = []
+    thread = threading.Thread(target=lambda: loaded.append(pm.load_progress()))
+    thread.start()
+    thread.join(timeout=0.2)
+    assert thread.is_alive() and not loaded
+
+    pm.lock_file.unlink()
+    thread.join(timeout=5)
+    assert len(loaded[0]) == len(test_classes)
+
+
+def test_journal_tolerates_interrupted_writes(test_classes, temp_dir):
+    """追記中に中断した行や、コンパクション途中の中断があっても状態が壊れないことを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+    pm.mark_completed(test_classes[0].full_name)
+
+    # 途中で切れた行
+    with open(pm.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "completed", "full_na')
+
+    resumed = ProgressManager(progress_file, fsync=False)
+    resumed.mark_completed(test_classes[1].full_name)
+    completed = {e.full_name for e in resumed.load_progress() if e.completed}
+    assert completed == {test_classes[0].full_name, test_classes[1].full_name}
+
+    # CSVの置き換え後、ジャーナル削除前に中断した場合（再生しても結果は同じ）
+    journal = resumed.journal_file.read_bytes()
+    resumed.compact()
+    resumed.journal_file.write_bytes(journal)
+    assert {e.full_name for e in ProgressManager(progress_file).load_progress() if e.completed} == completed
+
+
+def test_reset_progress_clears_journal(test_classes, temp_dir):
+    """リセットでジャーナルの記録も破棄されることを確認"""
+    progress_file = temp_dir / "progress.csv"
+    pm = ProgressManager(progress_file, fsync=False)
+    pm.initialize_from_class_list(test_classes)
+    pm.mark_completed(test_classes[0].full_name)
+
+    pm.reset_progress()
+
+    assert not pm.journal_file.exists()
+    assert pm.get_statistics()['completed'] == 0
@@ -0,0 +1,131 @@
+"""
+レートリミッターのテスト
+"""
+import threading
+import time
+
+from src.rate_limiter import AdaptiveRateLimiter, TokenBucket
+
+
+def test_unlimited_bucket_does_not_block():
+    """レート未指定の場合はブロックしない"""
+    bucket = TokenBucket.from_delay(0)
+    start = time.monotonic()
+    for _ in range(100):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_bucket_limits_rate():
+    """秒間リクエスト数が制限されることを確認"""
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 最初の1件はバースト分、残り5件で約0.1秒
+    assert time.monotonic() - start >= 0.09
+
+
+def test_bucket_is_shared_between_threads():
+    """複数スレッドで共有しても合計レートが維持されることを確認"""
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 20件 - バースト1件 = 19件 / 100rps ≒ 0.19秒
+    assert time.monotonic() - start >= 0.17
+
+
+def _adaptive(**kwargs):
+    options = dict(rate=200.0, min_rate=50.0, max_rate=400.0, max_concurrency=3, window=2, cooldown=0)
+    options.update(kwargs)
+    return AdaptiveRateLimiter(**options)
+
+
+def _respond(limiter, latency, status_code=200):
+    limiter.acquire()
+    limiter.release(latency, status_code)
+
+
+def test_adaptive_increases_while_fast():
+    """応答が速い間はwindow件ごとにレートと同時リクエスト数が上限まで増えることを確認"""
+    limiter = _adaptive(rate=1000.0, max_rate=1000.3, rate_step=0.1)
+    for _ in range(20):
+        _respond(limiter, 0.01)
+
+    assert limiter.rate == 1000.3
+    assert limiter.concurrency == 3
+
+
+def test_adaptive_backs_off_on_429_and_503():
+    """429/503応答でレートと同時リクエスト数が乗算的に減り、下限で止まることを確認"""
+    limiter = _adaptive()
+    limiter.concurrency = 3
+
+    _respond(limiter, 0.01, 429)
+    assert limiter.rate == 100.0
+    assert limiter.concurrency == 1
+
+    _respond(limiter, 0.01, 503)
+    _respond(limiter, 0.01, 503)
+    assert limiter.rate == 50.0
+
+
+def test_adaptive_backs_off_on_rising_latency():
+    """応答時間が基準の閾値倍を超えたら減少し、その後は新しい基準で判断することを確認"""
+    limiter = _adaptive(latency_smoothing=1.0, latency_threshold=2.0)
+    _respond(limiter, 0.1)
+    _respond(limiter, 0.15)
+    assert limiter.rate > 200.0
+
+    rate = limiter.rate
+    _respond(limiter, 0.5)
+    assert limiter.rate == rate * 0.5
+    # 悪化した応答時間が新しい基準になるため、同じ応答時間では続けて減らさない
+    _respond(limiter, 0.5)
+    assert limiter.rate == rate * 0.5
+
+
+def test_adaptive_cooldown_limits_backoff():
+    """減少の最小間隔内に失敗が続いても、減少は1回だけであることを確認"""
+    limiter = _adaptive(cooldown=60)
+    for _ in range(3):
+        _respond(limiter, 0.01, 503)
+    assert limiter.rate == 100.0
+
+
+def test_adaptive_limits_concurrency():
+    """同時リクエスト数が現在の上限を超えないことを確認"""
+    limiter = _adaptive(rate=1000.0, max_rate=1000.0, max_concurrency=4)
+    limiter.concurrency = 2
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            limiter.acquire()
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            limiter.release(None, None)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 2
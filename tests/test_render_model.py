@@ -0,0 +1,64 @@
+"""
+ClassRenderModelのテスト
+"""
+from pathlib import Path
+
+from src.json_generator import JsonGenerator
+from src.markdown_generator import MarkdownGenerator
+from src.parser import BakinParser, ClassDetail, ClassInfo
+from src.render_model import ClassRenderModel
+
+SAMPLE_CLASS_HTML = Path(__file__).parent / "data" / "sample_class.html"
+
+
+def make_detail() -> ClassDetail:
+    info = ClassInfo("Sound", "Audio.Sound", "class_sound.html", "class", "Audio")
+    return ClassDetail(
+        info=info,
+        methods=[
+            {'name': 'play', 'signature': 'play()', 'is_static': False},
+            {'name': 'create', 'signature': 'create()', 'is_static': True},
+            {'name': 'stop', 'signature': 'stop()', 'is_static': False},
+        ],
+        properties=[
+            {'name': 'Count', 'type': 'int', 'is_static': True},
+            {'name': 'Volume', 'type': 'float', 'is_static': False},
+        ],
+        fields=[{'name': 'handle', 'type': 'IntPtr'}],
+    )
+
+
+def test_members_are_partitioned_in_order():
+    """メンバーが元の順序のまま静的/インスタンスに振り分けられることを確認"""
+    model = ClassRenderModel.from_detail(make_detail())
+
+    assert [m['name'] for m in model.instance_methods] == ['play', 'stop']
+    assert [m['name'] for m in model.static_methods] == ['create']
+    assert [p['name'] for p in model.instance_properties] == ['Volume']
+    assert [p['name'] for p in model.static_properties] == ['Count']
+    assert [p['name'] for p in model.properties] == ['Count', 'Volume']
+    assert model.document_url == "https://rpgbakin.com/csreference/doc/ja/class_sound.html"
+
+
+def test_parsed_members_are_shared_without_copying():
+    """パーサーが作ったClassDetailのメンバーがコピーされずにそのまま振り分けられることを確認"""
+    info = ClassInfo("Sound", "FakeEngine.Audio.Sound", "class_sound.html", "class", "FakeEngine.Audio")
+    detail = BakinParser().parse_class_content(SAMPLE_CLASS_HTML.read_bytes(), info)
+    model = ClassRenderModel.from_detail(detail)
+
+    members = model.instance_methods + model.static_methods
+    assert len(members) == len(detail.methods)
+    assert all(any(m is method for method in detail.methods) for m in members)
+    assert all(any(p is prop for prop in detail.properties)
+               for p in model.instance_properties + model.static_properties)
+
+
+def test_renderers_consume_the_same_model():
+    """両方の出力形式が同じモデルから描画でき、ClassDetailからの生成と一致することを確認"""
+    detail = make_detail()
+    model = ClassRenderModel.from_detail(detail)
+
+    json_data = JsonGenerator().render_class_json(model)
+    assert json_data == JsonGenerator().generate_class_json(detail)
+    assert json_data['methods']['static_methods'] == [{'name': 'create', 'signature': 'create()', 'is_static': True}]
+    assert MarkdownGenerator().render_class_markdown(model) == MarkdownGenerator().generate_class_markdown(detail)
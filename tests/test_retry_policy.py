@@ -0,0 +1,136 @@
+"""
+リトライポリシーと保留キューのテストコード
+"""
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.cli import BakinDocumentationScraper
+from src.parser import ClassInfo
+from src.retry_policy import DeferredRetryQueue, RetryPolicy
+from src.scraper import BakinScraper
+
+
+@pytest.fixture
+def config_path(make_config, tmp_path):
+    """リトライの待ち時間を0にしたテスト用のconfig.yaml"""
+    return make_config(
+        scraping={'max_retries': 2, 'retry': {'backoff_min': 0, 'backoff_max': 0, 'deferred_delay': 0}},
+        cache={'dir': str(tmp_path / 'html')},
+    )
+
+
+def _response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = "https://example.com/page.html"
+    return response
+
+
+def _http_error(status_code, headers=None):
+    return requests.HTTPError(response=_response(status_code, headers=headers))
+
+
+def test_classifies_errors():
+    """恒久的な失敗と一時的な失敗が区別されることを確認"""
+    for status in (400, 403, 404, 410):
+        assert not RetryPolicy.is_transient(_http_error(status))
+    for status in (408, 429, 500, 502, 503, 504, 599):
+        assert RetryPolicy.is_transient(_http_error(status))
+    assert RetryPolicy.is_transient(requests.ConnectionError())
+    assert RetryPolicy.is_transient(requests.Timeout())
+    assert not RetryPolicy.is_transient(ValueError())
+
+
+def test_retry_after():
+    """Retry-Afterが秒数・HTTP日付のどちらでも読み取れることを確認"""
+    assert RetryPolicy.retry_after(_http_error(429, {'Retry-After': '7'})) == 7.0
+    assert RetryPolicy.retry_after(_http_error(503, {'Retry-After': 'Wed, 01 Jan 2020 00:00:00 GMT'})) == 0.0
+    assert RetryPolicy.retry_after(_http_error(503)) is None
+    assert RetryPolicy.retry_after(_http_error(503, {'Retry-After': 'soon'})) is None
+
+    policy = RetryPolicy(deferred_delay=1, deferred_jitter=0.5, retry_after_max=60)
+    assert 1 <= policy.deferred_wait() <= 1.5
+    assert policy.deferred_wait(30) == 30
+    assert policy.deferred_wait(3600) == 60
+
+
+def test_permanent_error_fails_fast(config_path):
+    """404は再試行されず、保留もされないことを確認"""
+    scraper = BakinScraper(config_path)
+
+    with patch.object(requests.Session, 'get', return_value=_response(404)) as get:
+        with pytest.raises(requests.HTTPError):
+            scraper.fetch_raw_page("missing.html")
+
+    assert get.call_count == 1
+    assert len(scraper.deferred) == 0
+
+
+def test_transient_error_is_retried_then_deferred(config_path, caplog):
+    """一時的な失敗は max_retries 回再試行され、失敗が続けば保留されることを確認（ERRORは1回だけ）"""
+    scraper = BakinScraper(config_path)
+
+    with patch.object(requests.Session, 'get', return_value=_response(503, headers={'Retry-After': '0'})) as get:
+        with pytest.raises(requests.HTTPError):
+            scraper.fetch_raw_page("busy.html")
+
+    assert get.call_count == 3
+    assert len([r for r in caplog.records if r.levelname == 'ERROR']) == 1
+    assert scraper.take_deferred(["busy.html", "other.html"]) == {"busy.html": 0.0}
+    assert len(scraper.deferred) == 0
+
+
+def test_transient_error_recovers(config_path, caplog):
+    """再試行中に成功すればそのページが返され、ERRORは記録されないことを確認"""
+    scraper = BakinScraper(config_path)
+    responses = [_response(502), _response(200, b"<html>ok</html>")]
+
+    with patch.object(requests.Session, 'get', side_effect=responses):
+        page = scraper.fetch_raw_page("flaky.html")
+
+    assert page.content == b"<html>ok</html>"
+    assert len(scraper.deferred) == 0
+    assert not [r for r in caplog.records if r.levelname in ('ERROR', 'WARNING')]
+
+
+def test_deferred_queue():
+    """保留キューから指定したURLのみが取り出されることを確認"""
+    queue = DeferredRetryQueue()
+    queue.add("a", 5.0)
+    queue.add("b")
+
+    assert queue.take(["b", "c"]) == {"b": None}
+    assert len(queue) == 1
+
+
+def test_scrape_retries_deferred_at_end_of_session(config_path):
+    """保留されたクラスがセッションの最後に再試行され、恒久的な失敗は再試行されないことを確認"""
+    scraper = BakinDocumentationScraper(config_path)
+    classes = [ClassInfo(f"C{i}", f"NS.C{i}", f"c{i}.html", "class", "NS") for i in range(3)]
+    scraper.progress_manager.initialize_from_class_list(classes)
+
+    page = "<html><body><div class='textblock'>説明</div></body></html>".encode('utf-8')
+    calls = []
+
+    def fake_get(url, timeout=None, headers=None):
+        calls.append(url)
+        if url.endswith("c1.html"):
+            return _response(404)
+        # c2は最初のセッション内のリトライをすべて失敗し、最後の再試行で成功する
+        if url.endswith("c2.html") and calls.count(url) <= 3:
+            return _response(503)
+        return _response(200, page)
+
+    with patch.object(requests.Session, 'get', side_effect=fake_get), \
+            patch.object(scraper, '_generate_index'):
+        scraper.scrape_with_progress()
+
+    assert calls.count("https://example.com/c1.html") == 1
+    assert calls.count("https://example.com/c2.html") == 4
+    stats = scraper.progress_manager.get_statistics()
+    assert stats['completed'] == 2
+    assert [e.full_name for e in scraper.progress_manager.get_pending_entries()] == ["NS.C1"]
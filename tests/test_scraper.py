@@ -0,0 +1,238 @@
+"""
+BakinScraperのテスト
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.scraper import BakinScraper
+
+
+@pytest.fixture
+def config_path(make_config):
+    """テスト用のconfig.yaml"""
+    return make_config(scraping={'workers': 4})
+
+
+def test_fetch_pages_preserves_order(config_path):
+    """並列取得でも入力順に結果が返ることを確認"""
+    scraper = BakinScraper(config_path)
+
+    def fake_fetch(url):
+        # 後のURLほど早く完了させる
+        time.sleep(0.01 * (5 - int(url)))
+        return f"page-{url}"
+
+    scraper.fetch_raw_page = fake_fetch
+    results = list(scraper.fetch_pages([str(i) for i in range(5)]))
+
+    assert results == [f"page-{i}" for i in range(5)]
+
+
+def test_fetch_pages_runs_concurrently(config_path):
+    """ワーカー数分のリクエストが同時に処理されることを確認"""
+    scraper = BakinScraper(config_path)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_fetch(url):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(url)
+        return url
+
+    scraper.fetch_raw_page = fake_fetch
+    list(scraper.fetch_pages([str(i) for i in range(8)]))
+
+    assert max(peak) > 1
+    assert max(peak) <= 4
+
+
+def test_fetch_pages_bounds_unconsumed_results(config_path):
+    """消費が遅くても、取得済みで未消費の結果がワーカー数の2倍を超えないことを確認"""
+    scraper = BakinScraper(config_path)
+    started = []
+
+    def fake_fetch(url):
+        started.append(url)
+        return url
+
+    scraper.fetch_raw_page = fake_fetch
+    pages = scraper.fetch_pages([str(i) for i in range(100)])
+    for consumed in range(1, 21):
+        next(pages)
+        time.sleep(0.005)
+        assert len(started) <= consumed + 8
+    pages.close()
+
+    assert len(started) < 100
+
+
+def test_fetch_pages_returns_none_on_error(config_path):
+    """取得失敗したページはNoneになり、他のページは処理されることを確認"""
+    scraper = BakinScraper(config_path)
+
+    def fake_fetch(url):
+        if url == "bad":
+            raise RuntimeError("boom")
+        return url
+
+    scraper.fetch_raw_page = fake_fetch
+    results = list(scraper.fetch_pages(["a", "bad", "c"]))
+
+    assert results == ["a", None, "c"]
+
+
+def test_session_is_per_thread(config_path):
+    """HTTPセッションがスレッドごとに分離されていることを確認"""
+    scraper = BakinScraper(config_path)
+    sessions = []
+
+    thread = threading.Thread(target=lambda: sessions.append(scraper.session))
+    thread.start()
+    thread.join()
+
+    assert scraper.session is scraper.session
+    assert sessions[0] is not scraper.session
+    assert scraper.session.headers['User-Agent'] == "test-agent"
+
+
+def _make_response(status_code, content=b"", headers=None, url="https://example.com/page.html"):
+    """テスト用のレスポンスを作成"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = url
+    return response
+
+
+def test_fetch_page_stores_validators(config_path, tmp_path, monkeypatch):
+    """取得時にETag/Last-Modified/取得時刻がサイドカーに保存されることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(config_path)
+    response = _make_response(200, b"<html><body>v1</body></html>",
+                              {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+
+    with patch.object(requests.Session, 'get', return_value=response):
+        soup = scraper.fetch_page("page.html")
+
+    assert "v1" in soup.get_text()
+    validators = scraper.load_validators("page.html")
+    assert validators['etag'] == '"v1"'
+    assert validators['last_modified'] == 'Wed, 01 Jan 2025 00:00:00 GMT'
+    assert validators['fetched_at']
+
+
+def test_revalidate_page_not_modified(config_path, tmp_path, monkeypatch):
+    """304の場合はキャッシュを保持し、条件付きヘッダーが送信されることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(config_path)
+
+    with patch.object(requests.Session, 'get',
+                      return_value=_make_response(200, b"<html>v1</html>", {'ETag': '"v1"'})):
+        scraper.fetch_page("page.html")
+
+    with patch.object(requests.Session, 'get', return_value=_make_response(304)) as mock_get:
+        changed = scraper.revalidate_page("page.html")
+
+    assert changed is False
+    assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert scraper.cache.get_path("page.html").read_bytes() == b"<html>v1</html>"
+
+
+def test_revalidate_page_modified(config_path, tmp_path, monkeypatch):
+    """内容が更新された場合はキャッシュとバリデータが更新されることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(config_path)
+
+    with patch.object(requests.Session, 'get',
+                      return_value=_make_response(200, b"<html>v1</html>", {'ETag': '"v1"'})):
+        scraper.fetch_page("page.html")
+
+    with patch.object(requests.Session, 'get',
+                      return_value=_make_response(200, b"<html>v2</html>", {'ETag': '"v2"'})):
+        changed = scraper.revalidate_page("page.html")
+
+    assert changed is True
+    assert scraper.cache.get_path("page.html").read_bytes() == b"<html>v2</html>"
+    assert scraper.load_validators("page.html")['etag'] == '"v2"'
+
+
+def test_cache_keeps_raw_response_bytes(config_path, tmp_path, monkeypatch):
+    """キャッシュにレスポンスのバイト列がそのまま保存され、エンコーディングも復元されることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(config_path)
+    content = "<html><body><p>日本語</p><br></body></html>".encode('shift_jis')
+    response = _make_response(200, content, {'Content-Type': 'text/html; charset=Shift_JIS'})
+
+    with patch.object(requests.Session, 'get', return_value=response):
+        soup = scraper.fetch_page("page.html")
+
+    assert soup.p.get_text() == "日本語"
+    assert scraper.cache.get_path("page.html").read_bytes() == content
+
+    # キャッシュヒット時はWebへアクセスせず、バイト列とエンコーディングを返す
+    with patch.object(requests.Session, 'get') as mock_get:
+        page = scraper.fetch_raw_page("page.html")
+        cached_soup = scraper.fetch_page("page.html")
+
+    mock_get.assert_not_called()
+    assert page.content == content
+    assert page.encoding.lower() == 'shift_jis'
+    assert cached_soup.p.get_text() == "日本語"
+
+
+def test_read_legacy_cache_without_sidecar(config_path, tmp_path, monkeypatch):
+    """サイドカーのない旧形式キャッシュも読み込めることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(config_path)
+    cache_file = scraper.cache.get_path("legacy.html")
+    cache_file.parent.mkdir()
+    cache_file.write_text('<html><head><meta charset="utf-8"/></head><p>旧キャッシュ</p></html>', encoding='utf-8')
+
+    page = scraper.read_cached_page("legacy.html")
+    soup = scraper.fetch_page("legacy.html")
+
+    assert page.encoding is None
+    assert soup.p.get_text() == "旧キャッシュ"
+
+
+def test_pack_cache_backend(make_config, tmp_path, monkeypatch):
+    """パックファイルバックエンドでもキャッシュヒット時にWebへアクセスしないことを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(make_config(cache={'backend': 'pack', 'pack_file': "cache/html.pack"}))
+
+    with patch.object(requests.Session, 'get', return_value=_make_response(200, b"<html>v1</html>")):
+        scraper.fetch_raw_page("page.html")
+
+    with patch.object(requests.Session, 'get') as mock_get:
+        page = scraper.fetch_raw_page("page.html")
+
+    mock_get.assert_not_called()
+    assert page.content == b"<html>v1</html>"
+    assert (tmp_path / "cache" / "html.pack").exists()
+    assert not (tmp_path / "html").exists()
+    scraper.cache.close()
+
+
+def test_revalidation_failure_falls_back_to_cache(make_config, tmp_path, monkeypatch):
+    """再検証モードで再検証に失敗しても、キャッシュ済みのページが返されることを確認"""
+    monkeypatch.chdir(tmp_path)
+    scraper = BakinScraper(make_config(scraping={'revalidate': True, 'max_retries': 0}))
+
+    with patch.object(requests.Session, 'get', return_value=_make_response(200, b"<html>v1</html>")):
+        scraper.fetch_raw_page("page.html")
+
+    with patch.object(requests.Session, 'get', side_effect=requests.ConnectionError("offline")):
+        page = scraper.fetch_raw_page("page.html")
+
+    assert page.content == b"<html>v1</html>"
+    assert scraper.take_deferred(["page.html"]) == {}
@@ -2,7 +2,7 @@
 SignatureParserのテスト
 """
 import pytest
-from src.signature_parser import SignatureParser
+from src.signature_parser import Parameter, SignatureParser, TypeDictionary
 
 
 class TestSignatureParser:
@@ -104,3 +104,160 @@ class TestSignatureParser:
         params = SignatureParser._split_parameters("std::map<int, std::vector<int>> data, int count")
         assert len(params) == 2
         assert "std::map<int, std::vector<int>>" in params[0]
+
+    def test_split_parameters_empty_segments(self):
+        """空のパラメータは保持し、末尾のカンマの後の空文字のみ除く"""
+        assert SignatureParser._split_parameters("") == []
+        assert SignatureParser._split_parameters("int a,") == ["int a"]
+        assert SignatureParser._split_parameters(", int a, ") == ["", "int a", ""]
+
+    def test_format_parameter_camel_case_not_split_at_first_upper(self):
+        """先頭の大文字の位置では分割しない"""
+        assert SignatureParser.format_parameter("intIndex") == "intIndex"
+        assert SignatureParser.format_parameter("SurroundModesurroundMode") == "SurroundModesurround Mode"
+
+    def test_format_signature_is_memoized(self):
+        """同じシグネチャ・パラメータの整形結果がキャッシュから返されることを確認"""
+        SignatureParser.format_signature.cache_clear()
+        SignatureParser.format_parameter.cache_clear()
+
+        first = SignatureParser.format_signature("play(boolloop, intindex)")
+        second = SignatureParser.format_signature("play(boolloop, intindex)")
+        SignatureParser.format_signature("stop(boolloop)")
+
+        assert first == second
+        assert SignatureParser.format_signature.cache_info().hits == 1
+        assert SignatureParser.format_parameter.cache_info().hits == 1
+
+
+class TestTypeDictionary:
+    """既知の型名の辞書による分割のテスト"""
+
+    @pytest.fixture
+    def known_types(self):
+        return TypeDictionary(['SurroundMode', 'Yukar.Common.SurroundMode', 'Vector3', 'HTTPClient', 'Cast'])
+
+    @pytest.mark.parametrize("param, expected", [
+        ("SurroundModesurroundMode", "SurroundMode surroundMode"),
+        ("intindex", "int index"),
+        ("boolloop", "bool loop"),
+        ("HTTPClientclient", "HTTPClient client"),
+        ("Vector3[]positions", "Vector3[] positions"),
+        ("int?value", "int? value"),
+        ("List<Vector3>points", "List<Vector3> points"),
+        ("Dictionary<string,List<int>>map", "Dictionary<string,List<int>> map"),
+        ("Yukar.Common.SurroundModemode", "Yukar.Common.SurroundMode mode"),
+    ])
+    def test_split_known_type(self, known_types, param, expected):
+        """既知の型名（最長一致）と型引数・配列などの修飾の直後で分割する"""
+        assert SignatureParser.format_parameter(param, known_types) == expected
+
+    def test_known_type_alone_is_not_split(self, known_types):
+        """パラメータ全体が既知の型名の場合は分割しない"""
+        assert SignatureParser.format_parameter("SurroundMode") == "Surround Mode"
+        assert SignatureParser.format_parameter("SurroundMode", known_types) == "SurroundMode"
+
+    def test_longest_match_wins(self):
+        """短い型名が長い型名の接頭辞になっている場合は長い方を採用する"""
+        known_types = TypeDictionary(['Cast', 'CastData'])
+        assert SignatureParser.format_parameter("CastDatadata", known_types) == "CastData data"
+        assert SignatureParser.format_parameter("Castdata", known_types) == "Cast data"
+
+    def test_shorter_match_when_longer_does_not_end_at_name(self):
+        """長い型名の後が変数名として読めない場合は短い型名で分割する"""
+        known_types = TypeDictionary(['Cast', 'Cast.Role'])
+        assert known_types.split_index("Cast.Role.Xvalue") is None
+        assert SignatureParser.format_parameter("Cast.Rolevalue", known_types) == "Cast.Role value"
+
+    def test_unknown_type_falls_back_to_heuristics(self, known_types):
+        """既知の型で始まらない場合は従来のヒューリスティクスで分割する"""
+        assert SignatureParser.format_parameter("cli::array<int>^seCounts", known_types) == "cli::array<int>^ seCounts"
+        assert SignatureParser.format_parameter("Matrix4x4value", known_types) == "Matrix4x4 value"
+        assert known_types.split_index("List<int") is None
+
+    @pytest.mark.parametrize("param, expected", [
+        ("TaskCompletionSource<bool>tcs", "TaskCompletionSource<bool> tcs"),
+        ("ListViewItem^item", "ListViewItem^ item"),
+        ("Int32Rectrect", "Int32Rectrect"),
+    ])
+    def test_known_prefix_of_longer_unknown_type(self, param, expected):
+        """既知の型名の後が変数名として読めない場合は、ヒューリスティクスと同じ結果になることを確認"""
+        known_types = TypeDictionary()
+        assert known_types.split_index(param) is None
+        assert SignatureParser.format_parameter(param, known_types) == expected
+        assert SignatureParser.format_parameter(param) == expected
+
+    def test_parameters_of_longer_unknown_type(self):
+        """パラメータの分解でも既知の型名の途中で型と変数名を分けないことを確認"""
+        params = SignatureParser.parse_parameters("f(TaskCompletionSource<bool>tcs, ListViewItem^item)", TypeDictionary())
+        assert [(p.type, p.name) for p in params] == [
+            ("TaskCompletionSource<bool>", "tcs"),
+            ("ListViewItem^", "item"),
+        ]
+
+    def test_format_signature_with_known_types(self, known_types):
+        """シグネチャ全体の整形に辞書が使われることを確認"""
+        result = SignatureParser.format_signature("play(SurroundModesurroundMode, Dictionary<string,int>map)", known_types)
+        assert result == "play(SurroundMode surroundMode, Dictionary<string,int> map)"
+
+    def test_from_classes(self):
+        """クラス一覧の名前と完全修飾名（型引数を除く）が登録されることを確認"""
+        from src.parser import ClassInfo
+
+        known_types = TypeDictionary.from_classes([
+            ClassInfo("SurroundMode", "Yukar.SurroundMode", "a.html", "enum", "Yukar"),
+            ClassInfo("Pool< T >", "Yukar.Pool< T >", "b.html", "class", "Yukar"),
+        ])
+
+        assert "SurroundMode" in known_types
+        assert "Yukar.SurroundMode" in known_types
+        assert "Pool" in known_types
+        assert "Yukar.Pool" in known_types
+        assert "int" in known_types
+
+
+class TestParseParameters:
+    """パラメータの分解のテスト"""
+
+    def test_type_and_name(self):
+        """型と変数名に分解する（連結されたものは整形してから分解する）"""
+        assert SignatureParser.parse_parameters("play (bool loop, Vector3*pos)") == (
+            Parameter("bool", "loop"),
+            Parameter("Vector3*", "pos"),
+        )
+
+    def test_modifiers_and_default(self):
+        """先頭の修飾子と既定値を分離する"""
+        params = SignatureParser.parse_parameters(
+            "f(ref int count = 0, out Vector3 pos, params object[] args, Dictionary<string,int> map = null)"
+        )
+        assert params == (
+            Parameter("int", "count", ("ref",), "0"),
+            Parameter("Vector3", "pos", ("out",)),
+            Parameter("object[]", "args", ("params",)),
+            Parameter("Dictionary<string,int>", "map", (), "null"),
+        )
+
+    def test_type_only(self):
+        """変数名のないパラメータは型のみとする"""
+        assert SignatureParser.parse_parameters("f(void)") == (Parameter("void"),)
+        assert SignatureParser.parse_parameters("f(List<int>)") == (Parameter("List<int>"),)
+        assert SignatureParser.parse_parameters("f(ref)") == (Parameter("ref"),)
+
+    def test_no_parameters(self):
+        """パラメータがない・シグネチャでない場合は空"""
+        assert SignatureParser.parse_parameters("stop()") == ()
+        assert SignatureParser.parse_parameters("Count") == ()
+
+    def test_uses_known_types(self):
+        """型名の辞書で分割してから分解する"""
+        known_types = TypeDictionary(['SurroundMode'])
+        assert SignatureParser.parse_parameters("f(SurroundModesurroundMode)", known_types) == (
+            Parameter("SurroundMode", "surroundMode"),
+        )
+
+    def test_to_dict(self):
+        """メソッド情報に格納する辞書への変換"""
+        assert Parameter("int", "count", ("ref",), "0").to_dict() == {
+            'type': 'int', 'name': 'count', 'modifiers': ['ref'], 'default': '0'
+        }
@@ -0,0 +1,182 @@
+"""
+SqliteProgressManagerのテストコード
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.parser import ClassInfo
+from src.progress_manager import ProgressManager, SqliteProgressManager, create_progress_manager
+
+
+@pytest.fixture
+def test_classes():
+    """テスト用のクラスリストを読み込むフィクスチャ"""
+    test_data_path = Path(__file__).parent / "data" / "sample_classes.json"
+    with open(test_data_path, 'r', encoding='utf-8') as f:
+        return [ClassInfo(**data) for data in json.load(f)]
+
+
+def _mark_completed_in_process(db_file: str, names: list):
+    """別プロセスから完了を記録する"""
+    pm = SqliteProgressManager(Path(db_file))
+    for name in names:
+        pm.mark_completed(name)
+    pm.close()
+
+
+def test_same_behavior_as_csv(test_classes, tmp_path):
+    """CSV版と同じ操作で同じ結果になることを確認"""
+    csv_pm = ProgressManager(tmp_path / "progress.csv", fsync=False)
+    db_pm = SqliteProgressManager(tmp_path / "progress.db")
+
+    for pm in (csv_pm, db_pm):
+        assert not pm.exists()
+        pm.initialize_from_class_list(test_classes)
+        assert pm.exists()
+        pm.mark_completed(test_classes[1].full_name)
+        pm.mark_completed('Unknown.Class')
+
+    assert db_pm.get_statistics() == csv_pm.get_statistics()
+    assert db_pm.get_pending_entries(limit=2) == csv_pm.get_pending_entries(limit=2)
+    assert [e.full_name for e in db_pm.load_progress()] == [c.full_name for c in test_classes]
+    completed = [e for e in db_pm.load_progress() if e.completed]
+    assert [e.full_name for e in completed] == [test_classes[1].full_name]
+    assert completed[0].last_updated != ""
+    assert db_pm.entry_to_class_info(db_pm.load_progress()[0]) == test_classes[0]
+
+    db_pm.reset_progress()
+    assert db_pm.get_statistics()['completed'] == 0
+
+    # 再初期化で既存のエントリーは置き換えられる
+    db_pm.initialize_from_class_list(test_classes[:2])
+    assert db_pm.get_statistics()['total'] == 2
+    db_pm.close()
+
+
+def test_migrates_existing_csv(test_classes, tmp_path):
+    """既存の進捗CSV（ジャーナルを含む）がデータベースに自動で取り込まれることを確認"""
+    csv_file = tmp_path / "progress.csv"
+    csv_pm = ProgressManager(csv_file, fsync=False)
+    csv_pm.initialize_from_class_list(test_classes)
+    csv_pm.mark_completed(test_classes[0].full_name)
+    expected = csv_pm.load_progress()
+
+    db_pm = SqliteProgressManager(tmp_path / "progress.db", csv_file=csv_file)
+    assert db_pm.exists()
+    assert db_pm.load_progress() == expected
+
+    # 取り込み済みのデータベースはCSVで上書きされない
+    db_pm.mark_completed(test_classes[1].full_name)
+    db_pm.close()
+    reopened = SqliteProgressManager(tmp_path / "progress.db", csv_file=csv_file)
+    assert reopened.get_statistics()['completed'] == 2
+    reopened.close()
+
+
+def test_concurrent_processes(tmp_path):
+    """複数プロセスから同時に完了を記録しても、記録が失われないことを確認"""
+    classes = [ClassInfo(name=f"C{i}", full_name=f"N.C{i}", url=f"c{i}.html", type="class", namespace="N")
+               for i in range(40)]
+    db_file = tmp_path / "progress.db"
+    pm = SqliteProgressManager(db_file)
+    pm.initialize_from_class_list(classes)
+
+    names = [c.full_name for c in classes]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_mark_completed_in_process, [str(db_file)] * 4, [names[i::4] for i in range(4)]))
+
+    assert pm.get_statistics()['completed'] == len(classes)
+    pm.close()
+
+
+def test_queries_use_indexes(test_classes, tmp_path):
+    """未完了の取得や名前空間・更新日時の検索が索引を使うことを確認"""
+    pm = SqliteProgressManager(tmp_path / "progress.db")
+    pm.initialize_from_class_list(test_classes)
+    conn = pm._conn
+
+    def plan(sql):
+        return ' '.join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+
+    assert 'idx_progress_completed' in plan("SELECT * FROM progress WHERE completed = 0 ORDER BY position")
+    assert 'idx_progress_namespace' in plan("SELECT * FROM progress WHERE namespace = 'FakeEngine.Core'")
+    assert 'idx_progress_last_updated' in plan("SELECT * FROM progress WHERE last_updated < '2024'")
+    pm.close()
+
+
+def test_create_progress_manager(tmp_path):
+    """設定に応じた進捗管理クラスが生成されることを確認"""
+    output = {'progress_file': str(tmp_path / "progress.csv")}
+
+    assert type(create_progress_manager({'output': output})) is ProgressManager
+
+    pm = create_progress_manager({'output': output, 'progress': {'backend': 'sqlite'}})
+    assert isinstance(pm, SqliteProgressManager)
+    assert pm.progress_file == tmp_path / "progress.db"
+    assert pm.csv_file == tmp_path / "progress.csv"
+
+    with pytest.raises(ValueError):
+        create_progress_manager({'output': output, 'progress': {'backend': 'unknown'}})
+
+
+def test_refresh_from_class_list(test_classes, tmp_path):
+    """クラスリストの更新で差分のみが反映され、他の完了状態が保持されることを確認（CSV版と同じ結果）"""
+    csv_pm = ProgressManager(tmp_path / "progress.csv", fsync=False)
+    db_pm = SqliteProgressManager(tmp_path / "progress.db")
+
+    moved = ClassInfo(**{**vars(test_classes[1]), 'url': 'moved.html'})
+    updated = ClassInfo(**{**vars(test_classes[2]), 'description': '新しい説明'})
+    added = ClassInfo(name="Added", full_name="FakeEngine.Added", url="added.html", type="class",
+                      namespace="FakeEngine")
+    refreshed = [test_classes[0], moved, updated, added] + test_classes[4:]
+
+    for pm in (csv_pm, db_pm):
+        pm.initialize_from_class_list(test_classes)
+        for cls in test_classes[:4]:
+            pm.mark_completed(cls.full_name)
+
+        diff = pm.refresh_from_class_list(refreshed)
+        assert diff == {
+            'added': ['FakeEngine.Added'],
+            'removed': [test_classes[3].full_name],
+            'url_changed': [moved.full_name],
+            'unchanged': 3,
+        }
+
+    for pm in (csv_pm, db_pm):
+        entries = {e.full_name: e for e in pm.load_progress()}
+        assert set(entries) == {cls.full_name for cls in refreshed}
+        assert entries[test_classes[0].full_name].completed
+        assert entries[updated.full_name].completed
+        assert entries[updated.full_name].description == '新しい説明'
+        assert not entries[moved.full_name].completed
+        assert entries[moved.full_name].url == 'moved.html'
+        assert not entries['FakeEngine.Added'].completed
+
+    assert db_pm.get_statistics() == csv_pm.get_statistics()
+    db_pm.close()
+
+
+def test_get_stale_entries(test_classes, tmp_path):
+    """最終更新が古い完了済みエントリーが古い順に取得されることを確認（CSV版と同じ結果）"""
+    csv_file = tmp_path / "progress.csv"
+    csv_pm = ProgressManager(csv_file, fsync=False)
+    csv_pm.initialize_from_class_list(test_classes)
+    entries = csv_pm.load_progress()
+    for entry, updated in zip(entries, ['2024-03-01T00:00:00', '2024-01-01T00:00:00', '', '2025-01-01T00:00:00']):
+        entry.completed = True
+        entry.last_updated = updated
+    csv_pm._write_snapshot(entries)
+    db_pm = SqliteProgressManager(tmp_path / "progress.db", csv_file=csv_file)
+
+    for pm in (csv_pm, db_pm):
+        stale = pm.get_stale_entries(datetime(2024, 6, 1))
+        # 更新日時の記録がないものを先頭に、古い順（未完了のエントリーは含まない）
+        assert [e.full_name for e in stale] == [entries[i].full_name for i in (2, 1, 0)]
+        assert len(pm.get_stale_entries(datetime(2024, 6, 1), limit=2)) == 2
+        assert pm.get_stale_entries(datetime(2023, 1, 1)) == [stale[0]]
+    db_pm.close()